@@ -0,0 +1,106 @@
+"""Compare Basic Pitch inference backends on CPU latency and note agreement.
+
+Usage:
+    python benchmarks/bench_pitch_backends.py stems/vocals.wav stems/bass.wav --threads 4
+
+The first backend listed is the reference for note-level agreement.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import statistics
+import time
+
+from rich.console import Console
+from rich.table import Table
+import typer
+
+from stemscore.transcriber import pitch_session
+from stemscore.transcriber.pitch_transcriber import transcribe_pitch
+from stemscore.utils.audio_io import load_audio
+
+app = typer.Typer(add_completion=False)
+
+
+def note_agreement(
+    reference: list[dict],
+    estimate: list[dict],
+    onset_tolerance: float = 0.05,
+) -> float:
+    """Note-level F1: same pitch and onset within the tolerance."""
+    if not reference and not estimate:
+        return 1.0
+    if not reference or not estimate:
+        return 0.0
+    unmatched = sorted(reference, key=lambda note: note["start"])
+    matches = 0
+    for note in sorted(estimate, key=lambda item: item["start"]):
+        for idx, candidate in enumerate(unmatched):
+            if candidate["start"] > note["start"] + onset_tolerance:
+                break
+            if (
+                candidate["pitch"] == note["pitch"]
+                and abs(candidate["start"] - note["start"]) <= onset_tolerance
+            ):
+                matches += 1
+                del unmatched[idx]
+                break
+    precision = matches / len(estimate)
+    recall = matches / len(reference)
+    return 0.0 if matches == 0 else 2 * precision * recall / (precision + recall)
+
+
+@app.command()
+def main(
+    stems: list[Path] = typer.Argument(..., help="Stems to transcribe"),
+    backends: str = typer.Option("tensorflow,onnx", help="Comma-separated backends"),
+    threads: int = typer.Option(0, help="Intra-op threads (0 = runtime default)"),
+    repeats: int = typer.Option(3, help="Timed runs per stem"),
+) -> None:
+    """Benchmark pitch transcription backends."""
+    console = Console()
+    backend_list = [name.strip() for name in backends.split(",") if name.strip()]
+    durations: dict[Path, float] = {}
+    for stem in stems:
+        audio, sr = load_audio(stem)
+        durations[stem] = audio.shape[0] / sr
+
+    notes: dict[str, dict[Path, list[dict]]] = {}
+    table = Table(title=f"Basic Pitch backends (threads={threads or 'default'})")
+    for column in ("backend", "load s", "infer s", "x realtime", "notes", "F1 vs ref"):
+        table.add_column(column, justify="right")
+
+    for backend in backend_list:
+        pitch_session.reset_sessions()
+        load_seconds = pitch_session.get_session(backend, threads).load_seconds
+        latencies: list[float] = []
+        notes[backend] = {}
+        for stem in stems:
+            runs = []
+            for _ in range(max(repeats, 1)):
+                started = time.perf_counter()
+                result = transcribe_pitch(stem, backend=backend, threads=threads)
+                runs.append(time.perf_counter() - started)
+            latencies.append(statistics.median(runs))
+            notes[backend][stem] = result
+
+        infer_seconds = sum(latencies)
+        audio_seconds = sum(durations.values())
+        reference = notes[backend_list[0]]
+        agreement = statistics.mean(
+            note_agreement(reference[stem], notes[backend][stem]) for stem in stems
+        )
+        table.add_row(
+            backend,
+            f"{load_seconds:.2f}",
+            f"{infer_seconds:.2f}",
+            f"{audio_seconds / infer_seconds:.1f}" if infer_seconds > 0 else "-",
+            str(sum(len(items) for items in notes[backend].values())),
+            f"{agreement:.3f}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,180 @@
+"""Measure per-stage throughput and peak memory, and write a calibration file.
+
+Usage:
+    python benchmarks/bench_stages.py mixes/short.wav mixes/long.wav --models htdemucs_ft,htdemucs
+
+Each stage tier runs on each input in a fresh process, so its peak resident
+memory is measured on its own. The calibration file is read by
+``stemscore plan`` and by deadline-aware runs. Inputs of different lengths
+let the memory model separate the fixed cost from the per-second cost.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+import typer
+
+from stemscore.budget import DEFAULT_CALIBRATION_PATH
+from stemscore.utils.audio_io import audio_duration
+
+app = typer.Typer(add_completion=False)
+
+
+def _run_analysis(path: Path, fast: bool) -> None:
+    from stemscore.analyzer import analyze
+    from stemscore.config import AnalysisConfig
+
+    analyze(path, AnalysisConfig(fast_analysis=fast))
+
+
+def _run_separation(path: Path, model: str) -> None:
+    from stemscore.separator import separate
+
+    with tempfile.TemporaryDirectory(prefix="stemscore_bench_") as tmp_dir:
+        separate(path, Path(tmp_dir), model=model)
+
+
+def _run_pitch(path: Path) -> None:
+    from stemscore.transcriber import transcribe_pitch
+
+    transcribe_pitch(path)
+
+
+def _run_drums(path: Path) -> None:
+    from stemscore.transcriber import transcribe_drums
+
+    transcribe_drums(path)
+
+
+def _run_chords(path: Path, beat_synchronous: bool) -> None:
+    from stemscore.transcriber import recognize_chords
+
+    beat_times = None
+    if beat_synchronous:
+        duration = audio_duration(path)
+        beat_times = np.arange(0.0, duration, 0.5).tolist()
+    recognize_chords(path, beat_times=beat_times)
+
+
+def _run_assembly(path: Path) -> None:
+    from stemscore import assembler
+
+    # One note per beat at 120 BPM stands in for a transcribed part.
+    duration = audio_duration(path)
+    notes = [
+        {"start": float(start), "end": float(start) + 0.4, "pitch": 60 + int(start) % 12}
+        for start in np.arange(0.0, duration, 0.5)
+    ]
+    with tempfile.TemporaryDirectory(prefix="stemscore_bench_") as tmp_dir:
+        assembler.assemble(
+            {"lead_vocal": notes},
+            tempo=120.0,
+            key="C",
+            time_signature=4,
+            output_dir=Path(tmp_dir),
+            formats=["midi", "musicxml"],
+        )
+
+
+def _tier_runners(models: list[str]) -> dict[str, Callable[[Path], None]]:
+    runners: dict[str, Callable[[Path], None]] = {
+        "analysis.full": lambda path: _run_analysis(path, fast=False),
+        "analysis.excerpt": lambda path: _run_analysis(path, fast=True),
+    }
+    for model in models:
+        runners[f"separation.{model}"] = lambda path, model=model: _run_separation(path, model)
+    runners.update(
+        {
+            "transcription.pitch": _run_pitch,
+            "transcription.drums": _run_drums,
+            "transcription.chords.frame": lambda path: _run_chords(path, beat_synchronous=False),
+            "transcription.chords.beat": lambda path: _run_chords(path, beat_synchronous=True),
+            "assembly": _run_assembly,
+        }
+    )
+    return runners
+
+
+def _measure_child(
+    tier: str, path: Path, models: list[str], results: multiprocessing.Queue
+) -> None:
+    started = time.perf_counter()
+    try:
+        _tier_runners(models)[tier](path)
+    except Exception as exc:  # a missing optional model must not stop the benchmark
+        results.put(("error", f"{type(exc).__name__}: {exc}"))
+        return
+    seconds = time.perf_counter() - started
+    # ru_maxrss is reported in KiB on Linux.
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    results.put(("ok", (seconds, peak_mb)))
+
+
+def measure(tier: str, path: Path, models: list[str]) -> tuple[float, float]:
+    """Run one tier on one input in a fresh process; returns (seconds, peak MB)."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_measure_child, args=(tier, path, models, results))
+    process.start()
+    status, payload = results.get()
+    process.join()
+    if status != "ok":
+        raise RuntimeError(payload)
+    return payload
+
+
+def fit_memory(durations: list[float], peaks: list[float]) -> tuple[float, float]:
+    """Fit peak MB = base + per_second * duration; one length gives a flat cost."""
+    if len(set(durations)) < 2:
+        return max(peaks), 0.0
+    per_second, base = np.polyfit(durations, peaks, 1)
+    return max(float(base), 0.0), max(float(per_second), 0.0)
+
+
+@app.command()
+def main(
+    inputs: list[Path] = typer.Argument(..., help="Full mixes to run each stage on"),
+    models: str = typer.Option("htdemucs_ft,htdemucs", help="Demucs models to calibrate"),
+    output: Path = typer.Option(DEFAULT_CALIBRATION_PATH, help="Calibration file to write"),
+) -> None:
+    """Benchmark every stage tier and write a calibration file."""
+    console = Console()
+    model_list = [name.strip() for name in models.split(",") if name.strip()]
+    durations = [audio_duration(path) for path in inputs]
+    table = Table(title=f"Stage costs over {sum(durations):.0f}s of audio")
+    for column in ("tier", "s per audio s", "base MB", "MB/s"):
+        table.add_column(column, justify="right")
+
+    factors: dict[str, float] = {}
+    memory: dict[str, dict[str, float]] = {}
+    for tier in _tier_runners(model_list):
+        try:
+            runs = [measure(tier, path, model_list) for path in inputs]
+        except RuntimeError as exc:
+            console.print(f"Skipping {tier}: {exc}")
+            continue
+        factors[tier] = sum(seconds for seconds, _ in runs) / sum(durations)
+        base, per_second = fit_memory(durations, [peak for _, peak in runs])
+        memory[tier] = {"base": base, "per_second": per_second}
+        table.add_row(tier, f"{factors[tier]:.3f}", f"{base:.0f}", f"{per_second:.2f}")
+
+    console.print(table)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps({"realtime_factors": factors, "memory_mb": memory}, indent=2),
+        encoding="utf-8",
+    )
+    console.print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,110 @@
+"""Compare tempo estimators on synthetic click tracks.
+
+Usage:
+    python benchmarks/bench_tempo.py --seconds 60 --prior 120
+
+Reports BPM error, octave errors, and runtime of librosa beat tracking
+against the autocorrelation estimator.
+"""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+import typer
+
+from stemscore.analyzer.tempo import detect_tempo, estimate_tempo
+
+app = typer.Typer(add_completion=False)
+
+SR = 22050
+
+
+def click_track(
+    bpm: float,
+    seconds: float,
+    sr: int = SR,
+    accent_every: int = 4,
+    noise_db: float = -50.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """Render a click track with accented downbeats over low-level noise."""
+    rng = np.random.default_rng(seed)
+    audio = (10.0 ** (noise_db / 20.0)) * rng.standard_normal(int(sr * seconds))
+    length = int(0.01 * sr)
+    envelope = np.hanning(length)
+    for index, beat in enumerate(np.arange(0.0, seconds - 0.05, 60.0 / bpm)):
+        accent = index % accent_every == 0
+        freq = 1500.0 if accent else 1000.0
+        start = int(beat * sr)
+        tone = envelope * np.sin(2 * np.pi * freq * np.arange(length) / sr)
+        audio[start : start + length] += tone * (1.0 if accent else 0.6)
+    return audio.astype(np.float32)
+
+
+def classify_error(estimate: float, truth: float) -> str:
+    """Label an estimate as correct, an octave error, or wrong (4% tolerance)."""
+    for ratio, label in ((1.0, "ok"), (2.0, "double"), (0.5, "half"), (1.5, "3:2"), (2 / 3, "2:3")):
+        if abs(estimate - truth * ratio) <= 0.04 * truth * ratio:
+            return label
+    return "wrong"
+
+
+@app.command()
+def main(
+    tempi: str = typer.Option("70,90,100,120,128,140,160,174", help="Comma-separated BPMs"),
+    seconds: float = typer.Option(60.0, help="Click track length"),
+    prior: float = typer.Option(120.0, help="Genre tempo prior for the autocorrelation estimator"),
+    repeats: int = typer.Option(3, help="Timed runs per track"),
+) -> None:
+    """Benchmark tempo estimators."""
+    console = Console()
+    table = Table(title=f"Tempo estimators ({seconds:.0f}s click tracks, prior {prior:.0f} BPM)")
+    for column in ("BPM", "beat_track", "ms", "result", "autocorr", "conf", "ms", "result"):
+        table.add_column(column, justify="right")
+
+    # Warm up numba-compiled librosa code so JIT time is not charged to a track.
+    warmup = click_track(120.0, 5.0)
+    detect_tempo(warmup, SR)
+    estimate_tempo(warmup, SR)
+
+    totals = {"beat_track": 0.0, "autocorr": 0.0}
+    for bpm in (float(value) for value in tempi.split(",") if value.strip()):
+        audio = click_track(bpm, seconds)
+
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            librosa_bpm = detect_tempo(audio, SR)
+            timings.append(time.perf_counter() - started)
+        librosa_ms = 1000 * min(timings)
+
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            estimate = estimate_tempo(audio, SR, prior_bpm=prior)
+            timings.append(time.perf_counter() - started)
+        autocorr_ms = 1000 * min(timings)
+
+        totals["beat_track"] += librosa_ms
+        totals["autocorr"] += autocorr_ms
+        table.add_row(
+            f"{bpm:.0f}",
+            f"{librosa_bpm:.2f}",
+            f"{librosa_ms:.1f}",
+            classify_error(librosa_bpm, bpm),
+            f"{estimate.bpm:.2f}",
+            f"{estimate.confidence:.2f}",
+            f"{autocorr_ms:.1f}",
+            classify_error(estimate.bpm, bpm),
+        )
+
+    console.print(table)
+    if totals["autocorr"] > 0:
+        console.print(f"Speedup: {totals['beat_track'] / totals['autocorr']:.1f}x")
+
+
+if __name__ == "__main__":
+    app()
@@ -1,17 +1,46 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from pathlib import Path
+from dataclasses import dataclass, replace
 import logging
 
-from stemscore.analyzer.key_detect import detect_key
-from stemscore.analyzer.tempo import detect_tempo
+import numpy as np
+
+from stemscore.analyzer.excerpts import label_agreement, select_excerpts, tempo_agreement
+from stemscore.analyzer.key_detect import KeySegment, detect_key, track_key
+from stemscore.analyzer.structure import (
+    RepeatedSection,
+    SectionMap,
+    confirm_repeats,
+    detect_sections,
+)
+from stemscore.analyzer.tempo import beat_grid, estimate_tempo, track_beats
 from stemscore.analyzer.time_sig import detect_time_signature
-from stemscore.utils.audio_io import load_audio
+from stemscore.config import AnalysisConfig
+from stemscore.utils.audio_io import AudioSource, load_audio
 from stemscore.utils.exceptions import AnalysisError
 
 logger = logging.getLogger(__name__)
 
+TEMPO_ESTIMATORS = ("beat_track", "autocorrelation")
+
+# Excerpt estimates agreeing less than this trigger full-file analysis.
+MIN_CONFIDENCE = 0.6
+
+
+@dataclass(frozen=True)
+class AnalysisConfidence:
+    """Fraction of analyzed excerpts agreeing with each estimate."""
+
+    tempo: float
+    key: float
+    time_signature: float
+    excerpts: int
+    escalated: bool = False
+
+    @property
+    def minimum(self) -> float:
+        return min(self.tempo, self.key, self.time_signature)
+
 
 @dataclass(frozen=True)
 class AnalysisResult:
@@ -20,29 +49,163 @@ class AnalysisResult:
     tempo: float
     key: str
     time_signature: int
+    beat_times: tuple[float, ...] = ()
+    key_segments: tuple[KeySegment, ...] = ()
+    confidence: AnalysisConfidence | None = None
+    sections: SectionMap | None = None
 
 
-def analyze(audio_path: Path) -> AnalysisResult:
+def analyze(
+    audio_path: AudioSource,
+    config: AnalysisConfig | None = None,
+    *,
+    tempo: float | None = None,
+    key: str | None = None,
+    time_signature: int | None = None,
+    beats: bool = True,
+) -> AnalysisResult:
     """Analyze an audio file and return global musical attributes.
 
     Args:
         audio_path: Path to the audio file.
+        config: Analysis settings (tempo estimator and prior, local key
+            window, excerpt-based fast mode). Defaults to AnalysisConfig().
+        tempo: Known tempo (e.g. from export metadata); skips tempo
+            estimation. Beat times are then a uniform grid at this tempo
+            aligned to the onsets.
+        key: Known key; skips key detection.
+        time_signature: Known time signature numerator; skips meter detection.
+        beats: Whether the caller uses beat times. When False and the tempo
+            is known, no beat grid is computed.
 
     Returns:
-        AnalysisResult containing tempo, key, and time signature.
+        AnalysisResult containing tempo, key, time signature, beat times, and
+        local key segments when key tracking is enabled. Fast results carry
+        per-estimate confidence, and their beat times are a grid at the
+        agreed tempo unless they escalated.
+        Repeated sections are detected when ``config.detect_repeats`` is on.
+        When tempo, key and time signature are all known and ``beats`` is
+        False the audio is not decoded at all.
 
     Raises:
         AnalysisError: If analysis fails.
     """
+    config = config or AnalysisConfig()
+    if tempo is not None and key is not None and time_signature is not None and not beats:
+        logger.info("Tempo, key and meter known for %s; skipping analysis", audio_path)
+        return AnalysisResult(tempo=tempo, key=key, time_signature=time_signature)
     try:
         audio, sr = load_audio(audio_path)
-        tempo = detect_tempo(audio, sr)
-        key = detect_key(audio, sr)
-        time_signature = detect_time_signature(audio, sr, tempo)
-        return AnalysisResult(tempo=tempo, key=key, time_signature=time_signature)
+        sections = (
+            detect_sections(
+                audio,
+                sr,
+                threshold=config.repeat_similarity,
+                min_seconds=config.repeat_min_seconds,
+            )
+            if config.detect_repeats
+            else None
+        )
+        confidence: AnalysisConfidence | None = None
+        if config.fast_analysis:
+            excerpt_result = _analyze_excerpts(audio, sr, config, tempo, key, time_signature)
+            confidence = excerpt_result.confidence
+            if confidence is not None and confidence.minimum >= MIN_CONFIDENCE:
+                grid = beat_grid(audio, sr, excerpt_result.tempo) if beats else np.zeros(0)
+                return replace(
+                    excerpt_result, beat_times=tuple(grid.tolist()), sections=sections
+                )
+            logger.info("Excerpt estimates disagree for %s; analyzing full file", audio_path)
+        beat_times = np.zeros(0)
+        if tempo is None:
+            tempo, beat_times = _estimate_beats(audio, sr, config)
+        elif beats:
+            beat_times = beat_grid(audio, sr, tempo)
+        key_segments: list[KeySegment] = []
+        if key is None and config.key_window_seconds > 0:
+            key, key_segments = track_key(audio, sr, window_seconds=config.key_window_seconds)
+        elif key is None:
+            key = detect_key(audio, sr)
+        if time_signature is None:
+            time_signature = detect_time_signature(audio, sr, tempo)
+        return AnalysisResult(
+            tempo=tempo,
+            key=key,
+            time_signature=time_signature,
+            beat_times=tuple(beat_times.tolist()),
+            key_segments=tuple(key_segments),
+            confidence=replace(confidence, escalated=True) if confidence else None,
+            sections=sections,
+        )
     except Exception as exc:
         logger.exception("Analyzer failed for %s", audio_path)
         raise AnalysisError(f"Analyzer failed for {audio_path}") from exc
 
 
-__all__ = ["AnalysisResult", "analyze"]
+def _estimate_beats(
+    audio: np.ndarray, sr: int, config: AnalysisConfig
+) -> tuple[float, np.ndarray]:
+    if config.tempo_estimator == "autocorrelation":
+        estimate = estimate_tempo(
+            audio,
+            sr,
+            octave_correction=config.tempo_octave_correction,
+            prior_bpm=config.tempo_prior_bpm,
+        )
+        return estimate.bpm, estimate.beat_times
+    if config.tempo_estimator != "beat_track":
+        raise AnalysisError(f"Unknown tempo estimator: {config.tempo_estimator}")
+    return track_beats(audio, sr)
+
+
+def _analyze_excerpts(
+    audio: np.ndarray,
+    sr: int,
+    config: AnalysisConfig,
+    known_tempo: float | None = None,
+    known_key: str | None = None,
+    known_meter: int | None = None,
+) -> AnalysisResult:
+    """Estimate each unknown attribute per excerpt; known ones agree fully."""
+    ranges = select_excerpts(
+        audio, sr, count=config.excerpt_count, excerpt_seconds=config.excerpt_seconds
+    )
+    tempi: list[float] = []
+    keys: list[str] = []
+    meters: list[int] = []
+    for start, end in ranges:
+        excerpt = audio[start:end]
+        tempo = known_tempo if known_tempo is not None else _estimate_beats(excerpt, sr, config)[0]
+        tempi.append(tempo)
+        keys.append(known_key if known_key is not None else detect_key(excerpt, sr))
+        meters.append(
+            known_meter if known_meter is not None else detect_time_signature(excerpt, sr, tempo)
+        )
+
+    tempo, tempo_conf = tempo_agreement(tempi)
+    key, key_conf = label_agreement(keys)
+    meter, meter_conf = label_agreement(meters)
+    confidence = AnalysisConfidence(
+        tempo=tempo_conf, key=key_conf, time_signature=meter_conf, excerpts=len(ranges)
+    )
+    logger.info(
+        "Excerpt analysis: tempo=%.1f (%.2f) key=%s (%.2f) meter=%s (%.2f)",
+        tempo, tempo_conf, key, key_conf, meter, meter_conf,
+    )
+    return AnalysisResult(
+        tempo=tempo,
+        key=key,
+        time_signature=meter,
+        confidence=confidence,
+    )
+
+
+__all__ = [
+    "AnalysisConfidence",
+    "AnalysisResult",
+    "KeySegment",
+    "RepeatedSection",
+    "SectionMap",
+    "analyze",
+    "confirm_repeats",
+]
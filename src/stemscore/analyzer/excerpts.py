@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+import logging
+from typing import TypeVar
+
+import numpy as np
+
+from stemscore.utils.activity import frame_rms_db
+
+logger = logging.getLogger(__name__)
+
+# Relative tolerance for two excerpt tempi to count as agreeing.
+TEMPO_TOLERANCE = 0.04
+
+_ENERGY_HOP = 2048
+
+T = TypeVar("T")
+
+
+def select_excerpts(
+    audio: np.ndarray,
+    sr: int,
+    count: int = 3,
+    excerpt_seconds: float = 12.0,
+) -> list[tuple[int, int]]:
+    """Pick representative excerpts with the strongest onset energy.
+
+    The file is split into ``count`` equal spans and the excerpt with the
+    largest rise in block energy is taken from each, so excerpts cover the
+    start, middle, and end of a song rather than clustering in one chorus.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        count: Number of excerpts.
+        excerpt_seconds: Length of each excerpt.
+
+    Returns:
+        Sample ranges (start, end), in time order. A file shorter than
+        ``count`` excerpts yields a single range covering all of it.
+    """
+    excerpt_len = round(excerpt_seconds * sr)
+    if count <= 0 or audio.shape[0] <= excerpt_len * count:
+        return [(0, int(audio.shape[0]))]
+
+    levels = frame_rms_db(audio, _ENERGY_HOP)
+    energy = np.power(10.0, levels / 10.0)
+    flux = np.maximum(np.diff(energy, prepend=energy[0]), 0.0)
+
+    window = max(excerpt_len // _ENERGY_HOP, 1)
+    cumulative = np.concatenate(([0.0], np.cumsum(flux)))
+    # Onset energy of the excerpt starting at every block.
+    scores = cumulative[window:] - cumulative[:-window]
+
+    span = scores.size / count
+    ranges: list[tuple[int, int]] = []
+    for index in range(count):
+        lo, hi = round(index * span), max(round((index + 1) * span), round(index * span) + 1)
+        block = lo + int(np.argmax(scores[lo:hi]))
+        start = block * _ENERGY_HOP
+        ranges.append((start, min(start + excerpt_len, int(audio.shape[0]))))
+    return ranges
+
+
+def tempo_agreement(tempi: Sequence[float]) -> tuple[float, float]:
+    """Return the consensus tempo and the fraction of excerpts agreeing with it."""
+    values = np.asarray(tempi, dtype=float)
+    if values.size == 0:
+        return 0.0, 0.0
+    close = np.abs(values[:, None] - values[None, :]) <= TEMPO_TOLERANCE * values[None, :]
+    support = close.sum(axis=0)
+    best = int(np.argmax(support))
+    consensus = float(np.median(values[close[:, best]]))
+    return consensus, float(support[best]) / values.size
+
+
+def label_agreement(labels: Sequence[T]) -> tuple[T, float]:
+    """Return the most common label and the fraction of excerpts that chose it.
+
+    Raises:
+        ValueError: If no labels are given.
+    """
+    if not labels:
+        raise ValueError("No excerpt labels to compare")
+    label, votes = Counter(labels).most_common(1)[0]
+    return label, votes / len(labels)
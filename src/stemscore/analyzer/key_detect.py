@@ -18,22 +18,59 @@ _MINOR_PROFILE = np.array(
 _PITCH_CLASS_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 
 
+# librosa.feature.chroma_stft default hop.
+_CHROMA_HOP_LENGTH = 512
+_KEY_NAMES = [f"{name} major" for name in _PITCH_CLASS_NAMES] + [
+    f"{name} minor" for name in _PITCH_CLASS_NAMES
+]
+
+
 @dataclass(frozen=True)
-class _KeyScore:
-    name: str
+class KeySegment:
+    """A span of the song with a single local key."""
+
+    start: float
+    end: float
+    key: str
     score: float
 
 
-def _correlate_profile(chroma_mean: np.ndarray, profile: np.ndarray) -> np.ndarray:
+def _circulant_profiles(profile: np.ndarray) -> np.ndarray:
     prof_centered = profile - np.mean(profile)
     normed = prof_centered / (np.linalg.norm(prof_centered) + 1e-9)
-    scores = np.zeros(12, dtype=float)
-    for shift in range(12):
-        rotated = np.roll(normed, shift)
-        scores[shift] = float(np.dot(chroma_mean, rotated))
+    # Row ``shift`` equals np.roll(normed, shift).
+    indices = (np.arange(12)[None, :] - np.arange(12)[:, None]) % 12
+    rotated: np.ndarray = normed[indices]
+    return rotated
+
+
+# (24, 12): the 12 major rotations followed by the 12 minor rotations.
+_PROFILE_MATRIX = np.vstack(
+    [_circulant_profiles(_MAJOR_PROFILE), _circulant_profiles(_MINOR_PROFILE)]
+)
+
+
+def _key_scores(chroma_means: np.ndarray) -> np.ndarray:
+    """Correlate chroma means of shape (n, 12) with all 24 keys at once."""
+    centered = chroma_means - chroma_means.mean(axis=1, keepdims=True)
+    normed = centered / (np.linalg.norm(centered, axis=1, keepdims=True) + 1e-9)
+    scores: np.ndarray = normed @ _PROFILE_MATRIX.T
     return scores
 
 
+def _pick_keys(scores: np.ndarray, dominant: np.ndarray) -> np.ndarray:
+    """Choose a key index per row; major wins ties unless A is dominant."""
+    major_idx = np.argmax(scores[:, :12], axis=1)
+    minor_idx = np.argmax(scores[:, 12:], axis=1)
+    rows = np.arange(scores.shape[0])
+    major_score = scores[rows, major_idx]
+    minor_score = scores[rows, 12 + minor_idx]
+    tied = (major_idx == minor_idx) & (np.abs(major_score - minor_score) <= 1e-3)
+    use_minor = (minor_score > major_score) | (tied & (dominant == 9))
+    picked: np.ndarray = np.where(use_minor, 12 + minor_idx, major_idx)
+    return picked
+
+
 def detect_key(audio: np.ndarray, sr: int) -> str:
     """Detect musical key using chroma and Krumhansl-Schmuckler profiles.
 
@@ -57,19 +94,77 @@ def detect_key(audio: np.ndarray, sr: int) -> str:
         logger.warning("Zero chroma energy, defaulting to C major")
         return "C major"
 
-    dominant_pitch = int(np.argmax(chroma_mean))
-    chroma_centered = chroma_mean - np.mean(chroma_mean)
-    chroma_norm = np.linalg.norm(chroma_centered) + 1e-9
-    chroma_mean = chroma_centered / chroma_norm
-    major_scores = _correlate_profile(chroma_mean, _MAJOR_PROFILE)
-    minor_scores = _correlate_profile(chroma_mean, _MINOR_PROFILE)
-
-    major_idx = int(np.argmax(major_scores))
-    minor_idx = int(np.argmax(minor_scores))
-    best = _KeyScore(f"{_PITCH_CLASS_NAMES[major_idx]} major", float(major_scores[major_idx]))
-    minor = _KeyScore(f"{_PITCH_CLASS_NAMES[minor_idx]} minor", float(minor_scores[minor_idx]))
-
-    if major_idx == minor_idx and abs(best.score - minor.score) <= 1e-3:
-        if dominant_pitch == 9:
-            return minor.name
-    return best.name if best.score >= minor.score else minor.name
+    means = chroma_mean[None, :]
+    best = _pick_keys(_key_scores(means), np.argmax(means, axis=1))
+    return _KEY_NAMES[int(best[0])]
+
+
+def track_key(
+    audio: np.ndarray,
+    sr: int,
+    window_seconds: float = 8.0,
+    hop_seconds: float | None = None,
+) -> tuple[str, list[KeySegment]]:
+    """Estimate the global key and the local key over sliding windows.
+
+    Chroma is computed once; cumulative sums make every window mean O(1), and
+    all windows are scored against the 24 keys in a single matrix product.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        window_seconds: Length of each analysis window.
+        hop_seconds: Step between windows; defaults to half the window.
+
+    Returns:
+        Tuple of (global key, local key segments). Adjacent windows with the
+        same key are merged into one segment.
+    """
+    import librosa  # Lazy import for heavy dependency.
+
+    logger.info("Tracking key (sr=%s, samples=%s, window=%.1fs)", sr, audio.shape[0], window_seconds)
+    chroma = librosa.feature.chroma_stft(y=audio, sr=sr)
+    n_frames = chroma.shape[1] if chroma.ndim == 2 else 0
+    if n_frames == 0 or np.allclose(chroma, 0):
+        logger.warning("No chroma energy, defaulting to C major")
+        return "C major", []
+
+    cumulative = np.concatenate(
+        [np.zeros((12, 1)), np.cumsum(chroma, axis=1, dtype=np.float64)], axis=1
+    )
+    frame_seconds = _CHROMA_HOP_LENGTH / sr
+    window = max(round(window_seconds / frame_seconds), 1)
+    hop = max(round((hop_seconds or window_seconds / 2) / frame_seconds), 1)
+
+    starts = np.arange(0, max(n_frames - window, 0) + 1, hop)
+    ends = np.minimum(starts + window, n_frames)
+    if ends[-1] < n_frames:
+        starts = np.append(starts, max(n_frames - window, 0))
+        ends = np.append(ends, n_frames)
+    bounds = np.concatenate(([0], starts))
+    stops = np.concatenate(([n_frames], ends))
+    means = ((cumulative[:, stops] - cumulative[:, bounds]) / (stops - bounds)).T
+
+    scores = _key_scores(means)
+    keys = _pick_keys(scores, np.argmax(means, axis=1))
+    global_key = _KEY_NAMES[int(keys[0])]
+    window_keys, window_scores = keys[1:], scores[np.arange(1, keys.size), keys[1:]]
+
+    # Each window owns the span between the midpoints to its neighbours.
+    centers = (starts + ends) / 2.0
+    edges = np.concatenate(([0.0], (centers[1:] + centers[:-1]) / 2.0, [float(n_frames)]))
+    changes = np.flatnonzero(np.diff(window_keys)) + 1
+    run_starts = np.concatenate(([0], changes))
+    run_ends = np.concatenate((changes, [window_keys.size]))
+
+    segments = [
+        KeySegment(
+            start=float(edges[lo] * frame_seconds),
+            end=float(edges[hi] * frame_seconds),
+            key=_KEY_NAMES[int(window_keys[lo])],
+            score=float(window_scores[lo:hi].mean()),
+        )
+        for lo, hi in zip(run_starts, run_ends)
+    ]
+    logger.info("Tracked %s key segments (global %s)", len(segments), global_key)
+    return global_key, segments
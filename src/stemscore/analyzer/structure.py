@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Chroma hop for structure analysis (~186 ms at 22.05 kHz); sections are long.
+_CHROMA_HOP_LENGTH = 4096
+# Chroma frames are averaged into blocks of this length before comparison.
+_BLOCK_SECONDS = 0.5
+# Lags per band of the time-lag similarity matrix; bounds peak memory.
+_LAG_BAND = 64
+# Constant-Q bins (seven octaves) for per-stem repeat checks.
+_PITCH_BINS = 84
+# Moving-average length (blocks) applied along each diagonal before thresholding.
+_SMOOTHING_BLOCKS = 4
+
+
+@dataclass(frozen=True)
+class RepeatedSection:
+    """A span that repeats an earlier span of the same length."""
+
+    start: float
+    end: float
+    source_start: float
+    similarity: float
+
+    @property
+    def offset(self) -> float:
+        """Seconds to add to a source time to reach this occurrence."""
+        return self.start - self.source_start
+
+    @property
+    def source_end(self) -> float:
+        return self.source_start + (self.end - self.start)
+
+
+@dataclass(frozen=True)
+class SectionMap:
+    """Repeated sections of a song; everything else is unique material."""
+
+    duration: float
+    repeats: tuple[RepeatedSection, ...] = ()
+    threshold: float = 0.9
+
+    @property
+    def repeated_seconds(self) -> float:
+        return float(sum(section.end - section.start for section in self.repeats))
+
+    def replicate_notes(self, notes: list[dict]) -> list[dict]:
+        """Copy notes from each source span onto its repeats.
+
+        Args:
+            notes: Notes transcribed from everything except the repeats.
+
+        Returns:
+            The input notes plus shifted copies, sorted by onset. Copies are
+            clipped to the end of their occurrence.
+        """
+        if not self.repeats or not notes:
+            return list(notes)
+        starts = np.array([float(note["start"]) for note in notes])
+        copies: list[dict] = []
+        for section in self.repeats:
+            in_source = (starts >= section.source_start) & (starts < section.source_end)
+            for index in np.flatnonzero(in_source):
+                copy = dict(notes[index])
+                copy["start"] = float(copy["start"]) + section.offset
+                copy["end"] = min(float(copy["end"]) + section.offset, section.end)
+                copies.append(copy)
+        return sorted([*notes, *copies], key=lambda note: float(note["start"]))
+
+
+def detect_sections(
+    audio: np.ndarray,
+    sr: int,
+    threshold: float = 0.9,
+    min_seconds: float = 8.0,
+) -> SectionMap:
+    """Find repeated sections from a chroma self-similarity analysis.
+
+    Equal chords do not mean equal melodies, so before a stem's notes are
+    copied between sections, ``confirm_repeats`` re-checks each repeat on
+    that stem.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        threshold: Minimum mean cosine similarity between a section and its
+            source for the repeat to be reused.
+        min_seconds: Shortest section worth reusing.
+
+    Returns:
+        SectionMap of non-overlapping repeats whose sources are never
+        themselves repeats, so transcribing the rest covers every source.
+    """
+    import librosa  # lazy import for heavy deps
+
+    duration = float(audio.shape[0]) / sr if sr > 0 else 0.0
+    chroma = librosa.feature.chroma_stft(y=audio, sr=sr, hop_length=_CHROMA_HOP_LENGTH)
+    block_seconds, blocks = _block_chroma(chroma, _CHROMA_HOP_LENGTH / sr)
+    min_blocks = max(int(np.ceil(min_seconds / block_seconds)), _SMOOTHING_BLOCKS)
+    candidates = _diagonal_runs(blocks, min_blocks, threshold)
+
+    accepted: list[tuple[int, int, int, float]] = []
+    occupied = np.zeros(blocks.shape[1], dtype=bool)
+    sources = np.zeros(blocks.shape[1], dtype=bool)
+    # Longest, most similar repeats first.
+    for start, length, lag, similarity in sorted(candidates, key=lambda c: (-c[1], -c[3])):
+        target = slice(start + lag, start + lag + length)
+        source = slice(start, start + length)
+        if occupied[target].any() or sources[target].any() or occupied[source].any():
+            continue
+        occupied[target] = True
+        sources[source] = True
+        accepted.append((start, length, lag, similarity))
+
+    repeats = tuple(
+        sorted(
+            (
+                RepeatedSection(
+                    start=(start + lag) * block_seconds,
+                    end=min((start + lag + length) * block_seconds, duration),
+                    source_start=start * block_seconds,
+                    similarity=similarity,
+                )
+                for start, length, lag, similarity in accepted
+            ),
+            key=lambda section: section.start,
+        )
+    )
+    section_map = SectionMap(duration=duration, repeats=repeats, threshold=threshold)
+    logger.info(
+        "Found %s repeated sections covering %.1fs of %.1fs",
+        len(repeats),
+        section_map.repeated_seconds,
+        duration,
+    )
+    return section_map
+
+
+def confirm_repeats(audio: np.ndarray, sr: int, sections: SectionMap) -> SectionMap:
+    """Keep only the repeats a single stem actually plays again.
+
+    Each repeat is compared with its source on the stem's own pitch
+    features (a constant-Q spectrogram, so octave and melody both count),
+    and kept if the mean block similarity reaches ``sections.threshold``.
+
+    Args:
+        audio: Stem samples (mono).
+        sr: Sample rate.
+        sections: Candidate repeats, usually found on the mix.
+
+    Returns:
+        SectionMap with the repeats that hold for this stem.
+    """
+    if not sections.repeats:
+        return sections
+    import librosa  # lazy import for heavy deps
+
+    spectrum = np.abs(
+        librosa.cqt(y=audio, sr=sr, hop_length=_CHROMA_HOP_LENGTH, n_bins=_PITCH_BINS)
+    )
+    block_seconds, blocks = _block_chroma(np.log1p(spectrum), _CHROMA_HOP_LENGTH / sr)
+    confirmed = []
+    for section in sections.repeats:
+        length = int((section.end - section.start) / block_seconds)
+        source = round(section.source_start / block_seconds)
+        target = round(section.start / block_seconds)
+        length = min(length, blocks.shape[1] - target)
+        if length <= 0:
+            continue
+        similarity = float(
+            np.einsum(
+                "ci,ci->i",
+                blocks[:, source : source + length],
+                blocks[:, target : target + length],
+            ).mean()
+        )
+        if similarity >= sections.threshold:
+            confirmed.append(section)
+    logger.info("Stem confirms %s of %s repeated sections", len(confirmed), len(sections.repeats))
+    return SectionMap(
+        duration=sections.duration, repeats=tuple(confirmed), threshold=sections.threshold
+    )
+
+
+def _block_chroma(chroma: np.ndarray, frame_seconds: float) -> tuple[float, np.ndarray]:
+    """Average chroma (or any feature rows) into fixed blocks, unit-normalized."""
+    per_block = max(round(_BLOCK_SECONDS / frame_seconds), 1)
+    n_blocks = chroma.shape[1] // per_block
+    blocks = (
+        chroma[:, : n_blocks * per_block]
+        .reshape(chroma.shape[0], n_blocks, per_block)
+        .mean(axis=2)
+    )
+    blocks = blocks / (np.linalg.norm(blocks, axis=0, keepdims=True) + 1e-9)
+    return per_block * frame_seconds, blocks
+
+
+def _diagonal_runs(
+    blocks: np.ndarray, min_blocks: int, threshold: float
+) -> list[tuple[int, int, int, float]]:
+    """Find runs along time-lag diagonals whose smoothed similarity stays high.
+
+    The lag matrix is built one band of lags at a time, so memory stays at
+    O(band x blocks) rather than the full O(blocks^2) self-similarity matrix.
+
+    Returns:
+        Candidates as (source start block, length, lag, mean similarity).
+    """
+    n_blocks = blocks.shape[1]
+    candidates: list[tuple[int, int, int, float]] = []
+    for band_start in range(min_blocks, n_blocks - min_blocks + 1, _LAG_BAND):
+        lags = np.arange(band_start, min(band_start + _LAG_BAND, n_blocks - min_blocks + 1))
+        # similarity[l, i] = <block i, block i + lag_l>, zero past the end.
+        positions = np.arange(n_blocks)[None, :] + lags[:, None]
+        valid = positions < n_blocks
+        shifted = blocks[:, np.minimum(positions, n_blocks - 1)]
+        similarity = np.where(valid, np.einsum("ci,cli->li", blocks, shifted), 0.0)
+        smoothed = _moving_average(similarity, _SMOOTHING_BLOCKS)
+
+        above = np.pad(smoothed >= threshold, ((0, 0), (1, 1)))
+        edges = np.diff(above.astype(np.int8), axis=1)
+        rows, run_starts = np.nonzero(edges == 1)
+        _, run_ends = np.nonzero(edges == -1)
+        # A repeat may not overlap its own source.
+        lengths = np.minimum(run_ends - run_starts, lags[rows])
+        keep = lengths >= min_blocks
+        for row, start, length in zip(rows[keep], run_starts[keep], lengths[keep]):
+            mean = float(similarity[row, start : start + length].mean())
+            if mean >= threshold:
+                candidates.append((int(start), int(length), int(lags[row]), mean))
+    return candidates
+
+
+def _moving_average(values: np.ndarray, width: int) -> np.ndarray:
+    """Centered moving average along the last axis, zero-padded at the ends."""
+    pad_left = width // 2
+    padded = np.pad(values, ((0, 0), (pad_left + 1, width - 1 - pad_left)))
+    cumulative = np.cumsum(padded, axis=1)
+    averaged: np.ndarray = (cumulative[:, width:] - cumulative[:, :-width]) / width
+    return averaged
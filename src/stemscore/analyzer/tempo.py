@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 import logging
 
 import numpy as np
@@ -22,3 +23,207 @@ def detect_tempo(audio: np.ndarray, sr: int) -> float:
     logger.info("Detecting tempo (sr=%s, samples=%s)", sr, audio.shape[0])
     tempo, _ = librosa.beat.beat_track(y=audio, sr=sr)
     return float(np.asarray(tempo).flatten()[0])
+
+
+def track_beats(audio: np.ndarray, sr: int) -> tuple[float, np.ndarray]:
+    """Detect tempo and beat positions in one beat-tracking pass.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+
+    Returns:
+        Tuple of (tempo in BPM, beat times in seconds).
+    """
+    import librosa  # Lazy import for heavy dependency.
+
+    logger.info("Tracking beats (sr=%s, samples=%s)", sr, audio.shape[0])
+    tempo, beat_frames = librosa.beat.beat_track(y=audio, sr=sr)
+    beat_times = librosa.frames_to_time(np.asarray(beat_frames, dtype=int), sr=sr)
+    return float(np.asarray(tempo).flatten()[0]), np.asarray(beat_times, dtype=float)
+
+
+def beat_grid(audio: np.ndarray, sr: int, bpm: float) -> np.ndarray:
+    """Place a uniform beat grid at a known tempo, aligned to the onsets.
+
+    Much cheaper than beat tracking when the tempo is already known (e.g.
+    from export metadata).
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        bpm: Tempo in beats per minute.
+
+    Returns:
+        Beat times in seconds; empty for silent or very short audio.
+    """
+    envelope = onset_envelope(audio, sr)
+    usable = envelope.size // _DECIMATION * _DECIMATION
+    if bpm <= 0 or usable < 8:
+        return np.zeros(0)
+    decimated = envelope[:usable].reshape(-1, _DECIMATION).sum(axis=1)
+    frame_rate = sr / (_ENVELOPE_HOP * _DECIMATION)
+    return _beat_grid(decimated, 60.0 * frame_rate / bpm, frame_rate)
+
+
+# Onset envelope frame size for the autocorrelation estimator (~11.6 ms at 22.05 kHz).
+_ENVELOPE_HOP = 256
+# Envelope decimation before autocorrelation (~86 Hz -> ~43 Hz frame rate).
+_DECIMATION = 2
+_MIN_BPM = 40.0
+_MAX_BPM = 240.0
+# Width of the log-normal genre prior, in octaves.
+_PRIOR_OCTAVES = 1.0
+# Periods metrically related to the strongest one (beat, half/whole bar, triplets).
+_METRICAL_RATIOS = np.array([0.25, 1.0 / 3.0, 0.5, 2.0 / 3.0, 1.0, 1.5, 2.0, 3.0, 4.0])
+
+
+@dataclass(frozen=True)
+class TempoEstimate:
+    """Tempo from the autocorrelation estimator."""
+
+    bpm: float
+    confidence: float
+    beat_times: np.ndarray
+
+
+def onset_envelope(audio: np.ndarray, sr: int, hop_length: int = _ENVELOPE_HOP) -> np.ndarray:
+    """Compute a cheap onset envelope from log block energy.
+
+    Rises in log energy of the signal and of its first difference (a crude
+    high-pass that catches hats and consonants) are half-wave rectified and
+    summed. No STFT is needed.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        hop_length: Block size in samples.
+
+    Returns:
+        Onset strength per block.
+    """
+    if audio.shape[0] < 2 * hop_length:
+        return np.zeros(0, dtype=float)
+    n_blocks = audio.shape[0] // hop_length
+    signal = audio[: n_blocks * hop_length].astype(np.float32, copy=False)
+    high = np.diff(signal, prepend=signal[:1])
+    envelope = np.zeros(n_blocks, dtype=float)
+    for band in (signal, high):
+        energy = np.square(band.reshape(n_blocks, hop_length), dtype=np.float64).mean(axis=1)
+        log_energy = np.log1p(energy / (energy.max() + 1e-12) * 1000.0)
+        envelope += np.maximum(np.diff(log_energy, prepend=log_energy[0]), 0.0)
+    return envelope
+
+
+def estimate_tempo(
+    audio: np.ndarray,
+    sr: int,
+    octave_correction: bool = True,
+    prior_bpm: float = 120.0,
+) -> TempoEstimate:
+    """Estimate tempo from the autocorrelation of a decimated onset envelope.
+
+    Much cheaper than dynamic-programming beat tracking when only the BPM and
+    a uniform beat grid are needed.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        octave_correction: Weigh the peak and its metrically related
+            periods by a log-normal prior around ``prior_bpm`` to avoid
+            octave errors. When False the strongest periodicity wins.
+        prior_bpm: Centre of the genre tempo prior.
+
+    Returns:
+        TempoEstimate with BPM, a confidence in [0, 1] (normalized
+        autocorrelation at the chosen period), and beat times.
+    """
+    logger.info("Estimating tempo by autocorrelation (sr=%s, samples=%s)", sr, audio.shape[0])
+    envelope = onset_envelope(audio, sr)
+    usable = envelope.size // _DECIMATION * _DECIMATION
+    if usable < 8:
+        logger.warning("Audio too short for tempo estimation, defaulting to %.1f BPM", prior_bpm)
+        return TempoEstimate(bpm=prior_bpm, confidence=0.0, beat_times=np.zeros(0))
+
+    decimated = envelope[:usable].reshape(-1, _DECIMATION).sum(axis=1)
+    frame_rate = sr / (_ENVELOPE_HOP * _DECIMATION)
+    centered = decimated - decimated.mean()
+    n_fft = 1 << int(np.ceil(np.log2(2 * centered.size)))
+    spectrum = np.fft.rfft(centered, n=n_fft)
+    acf = np.fft.irfft(np.abs(spectrum) ** 2, n=n_fft)[: centered.size]
+    if acf[0] <= 0:
+        return TempoEstimate(bpm=prior_bpm, confidence=0.0, beat_times=np.zeros(0))
+    # Unbiased normalization so long lags are not penalized for overlap.
+    acf = acf / acf[0] * centered.size / (centered.size - np.arange(centered.size))
+
+    min_lag = max(int(np.floor(frame_rate * 60.0 / _MAX_BPM)), 1)
+    max_lag = min(int(np.ceil(frame_rate * 60.0 / _MIN_BPM)), centered.size - 1)
+    if max_lag <= min_lag:
+        return TempoEstimate(bpm=prior_bpm, confidence=0.0, beat_times=np.zeros(0))
+    lags = np.arange(min_lag, max_lag + 1)
+    # A period between two frames splits its peak; summing neighbours rejoins it.
+    support_curve = np.convolve(np.clip(acf, 0.0, None), np.ones(3), mode="same")
+    peak_lag = float(lags[np.argmax(support_curve[lags])])
+
+    if octave_correction:
+        candidates = _METRICAL_RATIOS * peak_lag
+        candidates = candidates[(candidates >= min_lag) & (candidates <= max_lag)]
+        bpms = 60.0 * frame_rate / candidates
+        support = _peak_near(support_curve, candidates)
+        prior = np.exp(-0.5 * (np.log2(bpms / prior_bpm) / _PRIOR_OCTAVES) ** 2)
+        peak_lag = float(candidates[np.argmax(support * prior)])
+
+    confidence = float(np.clip(_peak_near(support_curve, np.array([peak_lag]))[0], 0.0, 1.0))
+    peak_lag = _refine_period(acf, peak_lag)
+    bpm = 60.0 * frame_rate / peak_lag
+    beat_times = _beat_grid(decimated, peak_lag, frame_rate)
+    logger.info("Autocorrelation tempo %.2f BPM (confidence %.2f)", bpm, confidence)
+    return TempoEstimate(bpm=float(bpm), confidence=confidence, beat_times=beat_times)
+
+
+def _peak_near(acf: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    """Largest value within one frame of each (fractional) lag."""
+    offsets = np.arange(-1, 3)
+    idx = np.clip(np.floor(lags).astype(int)[:, None] + offsets[None, :], 0, acf.size - 1)
+    peaks: np.ndarray = acf[idx].max(axis=1)
+    return peaks
+
+
+def _refine_period(acf: np.ndarray, period: float) -> float:
+    """Refine a period from the peaks at its multiples.
+
+    Each multiple's peak is located to sub-frame precision by parabolic
+    interpolation and the period is the least-squares slope through them.
+    The number of multiples doubles each pass so the search windows keep up
+    with the improving estimate.
+    """
+    max_multiple = max(int((acf.size // 2) / period), 1)
+    window = np.arange(-2, 3)
+    count = 2
+    while True:
+        multiples = np.arange(1, min(count, max_multiple) + 1)
+        centers = np.rint(multiples * period).astype(int)
+        idx = np.clip(centers[:, None] + window[None, :], 1, acf.size - 2)
+        peaks = idx[np.arange(idx.shape[0]), np.argmax(acf[idx], axis=1)]
+        left, center, right = acf[peaks - 1], acf[peaks], acf[peaks + 1]
+        denom = left - 2.0 * center + right
+        safe = np.where(denom < 0, denom, -1.0)
+        shift = np.where(denom < 0, 0.5 * (left - right) / safe, 0.0)
+        positions = peaks + np.clip(shift, -0.5, 0.5)
+        period = float((multiples * positions).sum() / (multiples**2).sum())
+        if count >= max_multiple:
+            return period
+        count *= 2
+
+
+def _beat_grid(envelope: np.ndarray, period: float, frame_rate: float) -> np.ndarray:
+    """Place a uniform beat grid at the phase with the most onset energy."""
+    n_phases = max(round(period), 1)
+    n_beats = int(np.floor((envelope.size - 1) / period)) + 1
+    phases = np.arange(n_phases)[:, None]
+    positions = np.rint(phases + np.arange(n_beats)[None, :] * period).astype(int)
+    valid = positions < envelope.size
+    energy = np.where(valid, envelope[np.minimum(positions, envelope.size - 1)], 0.0).sum(axis=1)
+    best = positions[int(np.argmax(energy))]
+    grid: np.ndarray = best[best < envelope.size] / frame_rate
+    return grid
@@ -89,10 +89,10 @@ def render_app() -> None:
         try:
             progress_bar.progress(10, text=t("processing", lang))
             input_path = _resolve_input_path(uploaded_file, suno_path)
-            output_dir = Path("./output")
-            result = pipeline.run_pipeline(
+            # Each run gets its own job directory so concurrent sessions never collide.
+            result = pipeline.run_job(
                 input_path=input_path,
-                output_dir=output_dir,
+                output_root=Path("./output"),
                 parts=selected_parts,
                 genre=genre,
                 formats=formats,
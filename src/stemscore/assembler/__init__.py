@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 import logging
@@ -7,6 +8,8 @@ import logging
 from stemscore.assembler.exporter import export_score
 from stemscore.assembler.merger import merge_parts
 from stemscore.assembler.quantizer import quantize_notes
+from stemscore.assembler.snapshot import AssemblySnapshot
+from stemscore.assembler.tempo_map import TempoMap
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,7 @@ def assemble(
     formats: list[str],
     level: int = 16,
     swing: bool = False,
+    beat_times: Sequence[float] | None = None,
 ) -> AssemblyResult:
     """Quantize, merge, and export a score.
 
@@ -41,23 +45,42 @@ def assemble(
         formats: List of output formats (midi, musicxml, pdf).
         level: Quantization level (e.g., 16 for 16th notes).
         swing: Whether to apply swing quantization.
+        beat_times: Detected beat times; when given, notes are quantized to
+            the beat grid and tempo changes are written to the score.
 
     Returns:
         AssemblyResult with output file paths and summary stats.
     """
     quantized_parts: dict[str, list[dict]] = {}
     total_notes = 0
+    tempo_map = TempoMap.from_beat_times(beat_times) if beat_times else None
 
     for part_name, notes in parts.items():
-        quantized = quantize_notes(notes, tempo=tempo, level=level, swing=swing)
+        quantized = quantize_notes(
+            notes, tempo=tempo, level=level, swing=swing, tempo_map=tempo_map
+        )
         quantized_parts[part_name] = quantized
         total_notes += len(quantized)
 
-    score = merge_parts(quantized_parts, tempo=tempo, key=key, time_signature=time_signature)
+    score = merge_parts(
+        quantized_parts,
+        tempo=tempo,
+        key=key,
+        time_signature=time_signature,
+        tempo_changes=tempo_map.tempo_changes() if tempo_map is not None else (),
+    )
     output_files = export_score(score, output_dir=output_dir, formats=formats)
 
     logger.info("Assembled score with %s parts and %s notes", len(parts), total_notes)
     return AssemblyResult(output_files=output_files, num_parts=len(parts), total_notes=total_notes)
 
 
-__all__ = ["AssemblyResult", "assemble", "export_score", "merge_parts", "quantize_notes"]
+__all__ = [
+    "AssemblyResult",
+    "AssemblySnapshot",
+    "TempoMap",
+    "assemble",
+    "export_score",
+    "merge_parts",
+    "quantize_notes",
+]
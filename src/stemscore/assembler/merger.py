@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,7 @@ def merge_parts(
     tempo: float,
     key: str,
     time_signature: int,
+    tempo_changes: Sequence[tuple[float, float]] = (),
 ) -> object:
     """Merge part note dictionaries into a music21 Score.
 
@@ -29,6 +31,8 @@ def merge_parts(
         tempo: Tempo in BPM.
         key: Key signature string (e.g., "C", "Gm").
         time_signature: Time signature numerator (e.g., 4 for 4/4).
+        tempo_changes: (beat offset, BPM) metronome marks from a tempo map;
+            when given they replace the single ``tempo`` mark.
 
     Returns:
         A music21 Score object.
@@ -41,7 +45,8 @@ def merge_parts(
     from music21 import instrument, key as mkey, meter, note, stream, tempo as mtempo
 
     score = stream.Score()
-    score.insert(0, mtempo.MetronomeMark(number=tempo))
+    for offset, bpm in tempo_changes or [(0.0, tempo)]:
+        score.insert(offset, mtempo.MetronomeMark(number=bpm))
     score.insert(0, mkey.Key(key))
     score.insert(0, meter.TimeSignature(f"{time_signature}/4"))
 
@@ -103,6 +108,10 @@ def _insert_note(part: object, note_dict: dict, note_module: object, part_name:
             logger.warning("Skipping note without pitch: %s", note_dict)
             return
         event = note_module.Note(int(pitch))
+        if note_dict.get("grace"):
+            # Grace notes take no time; music21 gives them a zero-length duration.
+            part.insert(offset_quarter, event.getGrace())
+            return
 
     event.duration.quarterLength = duration_quarter
     part.insert(offset_quarter, event)
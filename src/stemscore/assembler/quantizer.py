@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
+from stemscore.assembler.tempo_map import TempoMap
+
 logger = logging.getLogger(__name__)
 
 TICKS_PER_BEAT = 480
@@ -28,14 +32,18 @@ def quantize_notes(
     tempo: float,
     level: int = 16,
     swing: bool = False,
+    tempo_map: TempoMap | None = None,
 ) -> list[dict]:
     """Snap note start/end times to the nearest rhythmic grid.
 
     Args:
         notes: List of note dictionaries with "start" and "end" in seconds.
-        tempo: Tempo in BPM.
+        tempo: Tempo in BPM, used when no tempo map is given.
         level: Subdivision level (e.g., 16 for 16th notes).
         swing: Whether to apply a simple swing offset to off-beat positions.
+        tempo_map: Beat map for variable-tempo material; when given, seconds
+            are converted to ticks through the detected beats instead of a
+            constant tempo.
 
     Returns:
         Quantized note dictionaries with "tick" and "duration_ticks" fields added.
@@ -44,43 +52,62 @@ def quantize_notes(
         raise ValueError("Tempo must be positive")
     if level <= 0:
         raise ValueError("Level must be positive")
+    if not notes:
+        return []
 
     settings = QuantizeSettings(tempo=tempo, level=level, swing=swing)
     grid_size = settings.grid_size
     ticks_per_second = settings.ticks_per_second
 
-    quantized: list[dict] = []
-    for note in notes:
-        if "start" not in note or "end" not in note:
-            raise ValueError("Note missing start/end times")
-
-        start_ticks = float(note["start"]) * ticks_per_second
-        end_ticks = float(note["end"]) * ticks_per_second
+    if any("start" not in note or "end" not in note for note in notes):
+        raise ValueError("Note missing start/end times")
+    starts = np.fromiter((float(note["start"]) for note in notes), dtype=float, count=len(notes))
+    ends = np.fromiter((float(note["end"]) for note in notes), dtype=float, count=len(notes))
+
+    if tempo_map is None:
+        start_ticks = starts * ticks_per_second
+        end_ticks = ends * ticks_per_second
+    else:
+        start_ticks = tempo_map.seconds_to_beats(starts) * TICKS_PER_BEAT
+        end_ticks = tempo_map.seconds_to_beats(ends) * TICKS_PER_BEAT
+
+    snapped_start = _snap_ticks(start_ticks, grid_size, settings.swing)
+    snapped_end = _snap_ticks(end_ticks, grid_size, settings.swing)
+    snapped_end = np.where(snapped_end <= snapped_start, snapped_start + grid_size, snapped_end)
+
+    ticks = np.rint(snapped_start).astype(int)
+    durations = np.rint(snapped_end - snapped_start).astype(int)
+    if tempo_map is None:
+        new_starts = ticks / ticks_per_second
+        new_ends = (ticks + durations) / ticks_per_second
+    else:
+        new_starts = tempo_map.beats_to_seconds(ticks / TICKS_PER_BEAT)
+        new_ends = tempo_map.beats_to_seconds((ticks + durations) / TICKS_PER_BEAT)
 
-        snapped_start = _snap_ticks(start_ticks, grid_size, settings.swing)
-        snapped_end = _snap_ticks(end_ticks, grid_size, settings.swing)
-
-        if snapped_end <= snapped_start:
-            snapped_end = snapped_start + grid_size
-
-        duration_ticks = int(round(snapped_end - snapped_start))
+    quantized: list[dict] = []
+    for index, note in enumerate(notes):
         note_copy = dict(note)
-        note_copy["tick"] = int(round(snapped_start))
-        note_copy["duration_ticks"] = duration_ticks
-        note_copy["start"] = note_copy["tick"] / ticks_per_second
-        note_copy["end"] = (note_copy["tick"] + duration_ticks) / ticks_per_second
-
+        note_copy["tick"] = int(ticks[index])
+        note_copy["duration_ticks"] = int(durations[index])
+        note_copy["start"] = float(new_starts[index])
+        note_copy["end"] = float(new_ends[index])
         quantized.append(note_copy)
 
-    logger.info("Quantized %s notes at %sbpm level=%s", len(quantized), tempo, level)
+    logger.info(
+        "Quantized %s notes at %sbpm level=%s%s",
+        len(quantized),
+        tempo,
+        level,
+        " (tempo map)" if tempo_map is not None else "",
+    )
     return quantized
 
 
-def _snap_ticks(ticks: float, grid_size: float, swing: bool) -> float:
+def _snap_ticks(ticks: np.ndarray, grid_size: float, swing: bool) -> np.ndarray:
     if grid_size <= 0:
         return ticks
-    grid_index = int(round(ticks / grid_size))
-    snapped = grid_index * grid_size
-    if swing and grid_index % 2 == 1:
-        snapped += grid_size * 0.5
+    grid_index = np.rint(ticks / grid_size)
+    snapped: np.ndarray = grid_index * grid_size
+    if swing:
+        snapped = snapped + np.where(grid_index % 2 == 1, grid_size * 0.5, 0.0)
     return snapped
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AssemblySnapshot:
+    """Everything assembly needs, saved next to the exported score.
+
+    Notes are the raw, unquantized transcription output, so the score can be
+    re-quantized and re-exported without transcribing again.
+    """
+
+    parts: dict[str, list[dict]]
+    tempo: float
+    key: str
+    time_signature: int
+    beat_times: tuple[float, ...] = ()
+    genre: str = "pop"
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Beats per window when smoothing the local tempo for tempo-change events.
+_SMOOTHING_BEATS = 4
+
+
+@dataclass(frozen=True)
+class TempoMap:
+    """Piecewise-linear mapping between seconds and beats from beat times.
+
+    Beat 0 is the last grid beat at or before 0 s, extrapolated backwards from
+    the first detected beat with the first beat period, so every note maps to
+    a non-negative beat position and detected beats fall on whole beats.
+    Times after the last detected beat are extrapolated with the last period.
+    """
+
+    beat_times: np.ndarray
+
+    @classmethod
+    def from_beat_times(cls, beat_times: Sequence[float]) -> TempoMap | None:
+        """Build a map from detected beats; None when fewer than two are usable."""
+        times = np.unique(np.asarray(beat_times, dtype=float))
+        if times.size < 2:
+            return None
+        first_period = times[1] - times[0]
+        lead_in = int(np.ceil(max(times[0], 0.0) / first_period))
+        prefix = times[0] - first_period * np.arange(lead_in, 0, -1)
+        return cls(beat_times=np.concatenate([prefix, times]))
+
+    def seconds_to_beats(self, seconds: np.ndarray) -> np.ndarray:
+        """Convert times in seconds to (fractional) beat positions."""
+        seconds = np.asarray(seconds, dtype=float)
+        times = self.beat_times
+        idx = np.clip(np.searchsorted(times, seconds, side="right") - 1, 0, times.size - 2)
+        frac = (seconds - times[idx]) / (times[idx + 1] - times[idx])
+        beats: np.ndarray = idx + frac
+        return beats
+
+    def beats_to_seconds(self, beats: np.ndarray) -> np.ndarray:
+        """Convert beat positions back to seconds."""
+        beats = np.asarray(beats, dtype=float)
+        times = self.beat_times
+        idx = np.clip(np.floor(beats).astype(int), 0, times.size - 2)
+        seconds: np.ndarray = times[idx] + (beats - idx) * (times[idx + 1] - times[idx])
+        return seconds
+
+    def tempo_changes(self, tolerance_bpm: float = 1.0) -> list[tuple[float, float]]:
+        """Tempo-change events as (beat offset, BPM) pairs.
+
+        The local tempo is median-smoothed over a bar's worth of beats and
+        rounded; an event is emitted wherever the rounded tempo moves by at
+        least ``tolerance_bpm`` from the previous event.
+
+        Args:
+            tolerance_bpm: Smallest tempo change that produces an event.
+
+        Returns:
+            Events in beat order; the first is always at beat 0.
+        """
+        local = 60.0 / np.diff(self.beat_times)
+        if local.size >= _SMOOTHING_BEATS:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                np.pad(local, (0, _SMOOTHING_BEATS - 1), mode="edge"), _SMOOTHING_BEATS
+            )
+            local = np.median(windows, axis=1)
+        rounded = np.round(local)
+
+        events = [(0.0, float(rounded[0]))]
+        for beat in np.flatnonzero(np.diff(rounded)) + 1:
+            if abs(rounded[beat] - events[-1][1]) >= tolerance_bpm:
+                events.append((float(beat), float(rounded[beat])))
+        logger.info("Tempo map has %s tempo changes", len(events) - 1)
+        return events
@@ -0,0 +1,432 @@
+"""Run cost estimates: execution plans and degrading presets to fit a deadline."""
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+import json
+import logging
+import os
+
+from stemscore.config import GenrePreset
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CALIBRATION_PATH = Path.home() / ".cache" / "stemscore" / "calibration.json"
+# Processing seconds per second of audio, per stage tier, on a single CPU core.
+# Measured throughput from a calibration file overrides these.
+DEFAULT_REALTIME_FACTORS: dict[str, float] = {
+    "analysis.full": 0.08,
+    "analysis.excerpt": 0.02,
+    "separation.htdemucs_ft": 1.6,
+    "separation.htdemucs": 0.4,
+    "transcription.pitch": 0.15,
+    "transcription.drums": 0.03,
+    "transcription.chords.frame": 0.05,
+    "transcription.chords.beat": 0.03,
+    "assembly": 0.01,
+}
+# Peak resident memory per stage tier as (base MB, MB per second of audio).
+DEFAULT_MEMORY_MB: dict[str, tuple[float, float]] = {
+    "analysis.full": (250.0, 0.5),
+    "analysis.excerpt": (200.0, 0.3),
+    "separation.htdemucs_ft": (1500.0, 4.0),
+    "separation.htdemucs": (1200.0, 4.0),
+    "transcription.pitch": (900.0, 0.5),
+    "transcription.drums": (150.0, 0.4),
+    "transcription.chords.frame": (200.0, 0.6),
+    "transcription.chords.beat": (200.0, 0.6),
+    "assembly": (150.0, 0.05),
+}
+# Separation model used when the preset's model is too slow for the deadline.
+LIGHT_SEPARATION_MODEL = "htdemucs"
+# Route B transcribes the four Demucs stems when no parts are requested.
+_DEFAULT_PART_COUNT = 4
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """Per-stage time and memory estimates from audio duration.
+
+    Time is audio duration times a real-time factor; peak memory is a base
+    plus a per-second term. Both are keyed by ``<stage>.<tier>``.
+    """
+
+    realtime_factors: dict[str, float]
+    memory_mb: dict[str, tuple[float, float]] = field(
+        default_factory=lambda: dict(DEFAULT_MEMORY_MB)
+    )
+
+    @classmethod
+    def default(cls) -> CostModel:
+        return cls(dict(DEFAULT_REALTIME_FACTORS), dict(DEFAULT_MEMORY_MB))
+
+    @classmethod
+    def load(cls, path: Path) -> CostModel:
+        """Read measured costs from a JSON calibration file.
+
+        The file holds ``{"realtime_factors": {"<stage>.<tier>": factor},
+        "memory_mb": {"<stage>.<tier>": {"base": mb, "per_second": mb}}}``
+        as written by ``benchmarks/bench_stages.py``; tiers it leaves out
+        keep their defaults.
+
+        Raises:
+            ValueError: If the file is not a valid calibration file.
+        """
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            factors = {
+                str(name): float(value)
+                for name, value in payload.get("realtime_factors", {}).items()
+            }
+            memory = {
+                str(name): (float(value["base"]), float(value.get("per_second", 0.0)))
+                for name, value in payload.get("memory_mb", {}).items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Invalid calibration file: {path}") from exc
+        return cls({**DEFAULT_REALTIME_FACTORS, **factors}, {**DEFAULT_MEMORY_MB, **memory})
+
+    @classmethod
+    def from_calibration(cls, path: Path = DEFAULT_CALIBRATION_PATH) -> CostModel:
+        """Load a calibration file if it exists, else use the built-in defaults."""
+        if path.exists():
+            return cls.load(path)
+        logger.debug("No calibration file at %s; using default costs", path)
+        return cls.default()
+
+    def stage_tiers(
+        self,
+        preset: GenrePreset,
+        route: str,
+        parts: Sequence[str],
+        analysis_known: bool = False,
+    ) -> dict[str, list[str]]:
+        """The cost tiers each stage runs, in pipeline order.
+
+        Args:
+            preset: Settings the pipeline will run with.
+            route: "route_a" (Suno stems) or "route_b" (separated mix).
+            parts: Parts to transcribe; empty means every available stem.
+            analysis_known: Whether tempo, key and meter are known, so
+                analysis is skipped unless beat times are needed.
+
+        Returns:
+            Tier names per stage; transcription lists one tier per part.
+        """
+        analysis_tier = "excerpt" if preset.analysis.fast_analysis else "full"
+        skip_analysis = analysis_known and not needs_beats(preset, parts)
+        stages = {"analysis": [] if skip_analysis else [f"analysis.{analysis_tier}"]}
+        if route == "route_b":
+            stages["separation"] = [f"separation.{preset.separation.stage1_model}"]
+        stages["transcription"] = [
+            _transcription_tier(part, preset)
+            for part in parts or ["lead_vocal"] * _DEFAULT_PART_COUNT
+        ]
+        stages["assembly"] = ["assembly"]
+        return stages
+
+    def estimate(
+        self,
+        preset: GenrePreset,
+        route: str,
+        duration: float,
+        parts: Sequence[str],
+        analysis_known: bool = False,
+    ) -> dict[str, float]:
+        """Estimate seconds spent in each stage.
+
+        Args:
+            preset: Settings the pipeline will run with.
+            route: "route_a" (Suno stems) or "route_b" (separated mix).
+            duration: Audio duration in seconds.
+            parts: Parts to transcribe; empty means every available stem.
+            analysis_known: Whether analysis is skipped.
+
+        Returns:
+            Estimated seconds per stage, in pipeline order.
+        """
+        return {
+            stage: sum(_lookup(self.realtime_factors, tier, 0.0) * duration for tier in tiers)
+            for stage, tiers in self.stage_tiers(preset, route, parts, analysis_known).items()
+        }
+
+    def peak_memory(
+        self,
+        preset: GenrePreset,
+        route: str,
+        duration: float,
+        parts: Sequence[str],
+        analysis_known: bool = False,
+    ) -> dict[str, float]:
+        """Estimate peak resident memory (MB) of each stage.
+
+        Parts are transcribed one after another, so a stage's peak is that of
+        its most expensive tier. Pitch workers each load their own model, so
+        the pitch tier's fixed cost is counted once per worker.
+        """
+        workers = _pitch_workers(preset)
+        peaks = {}
+        for stage, tiers in self.stage_tiers(preset, route, parts, analysis_known).items():
+            costs = [(tier, *_lookup(self.memory_mb, tier, (0.0, 0.0))) for tier in tiers]
+            peaks[stage] = max(
+                (
+                    base * (workers if tier == "transcription.pitch" else 1)
+                    + per_second * duration
+                    for tier, base, per_second in costs
+                ),
+                default=0.0,
+            )
+        return peaks
+
+
+@dataclass(frozen=True)
+class StageEstimate:
+    """Estimated cost of one pipeline stage."""
+
+    name: str
+    tiers: tuple[str, ...]
+    seconds: float
+    peak_memory_mb: float
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """What a run would do and what it would cost, computed without running it."""
+
+    input_path: str
+    route: str
+    duration: float
+    stages: tuple[StageEstimate, ...]
+    degradations: tuple[str, ...] = ()
+    deadline_seconds: float | None = None
+
+    @property
+    def estimated_seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages)
+
+    @property
+    def peak_memory_mb(self) -> float:
+        """Peak over all stages; stages run one after another."""
+        return max((stage.peak_memory_mb for stage in self.stages), default=0.0)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form for schedulers."""
+        return {
+            "input": self.input_path,
+            "route": self.route,
+            "duration": self.duration,
+            "stages": [{**asdict(stage), "tiers": list(stage.tiers)} for stage in self.stages],
+            "estimated_seconds": self.estimated_seconds,
+            "peak_memory_mb": self.peak_memory_mb,
+            "degradations": list(self.degradations),
+            "deadline_seconds": self.deadline_seconds,
+        }
+
+
+def plan_execution(
+    preset: GenrePreset,
+    route: str,
+    duration: float,
+    parts: Sequence[str],
+    cost_model: CostModel | None = None,
+    analysis_known: bool = False,
+    input_path: str = "",
+    degradations: Sequence[str] = (),
+    deadline_seconds: float | None = None,
+) -> ExecutionPlan:
+    """Estimate per-stage time and peak memory of a run.
+
+    Args:
+        preset: Settings the run will use (after any deadline degradations).
+        route: Route chosen by the router.
+        duration: Audio duration in seconds.
+        parts: Parts to transcribe.
+        cost_model: Stage costs; defaults to the calibration file if present.
+        analysis_known: Whether analysis is skipped.
+        input_path: Input shown in the plan.
+        degradations: Degradations already applied to ``preset``.
+        deadline_seconds: Deadline the preset was fitted to, if any.
+
+    Returns:
+        The ExecutionPlan.
+    """
+    cost_model = cost_model or CostModel.from_calibration()
+    tiers = cost_model.stage_tiers(preset, route, parts, analysis_known)
+    seconds = cost_model.estimate(preset, route, duration, parts, analysis_known)
+    memory = cost_model.peak_memory(preset, route, duration, parts, analysis_known)
+    return ExecutionPlan(
+        input_path=input_path,
+        route=route,
+        duration=duration,
+        stages=tuple(
+            StageEstimate(
+                name=stage,
+                tiers=tuple(tiers[stage]),
+                seconds=seconds[stage],
+                peak_memory_mb=memory[stage],
+            )
+            for stage in tiers
+        ),
+        degradations=tuple(degradations),
+        deadline_seconds=deadline_seconds,
+    )
+
+
+@dataclass(frozen=True)
+class DeadlinePlan:
+    """Settings chosen to meet a deadline and what was given up for it."""
+
+    preset: GenrePreset
+    degradations: tuple[str, ...]
+    stage_seconds: dict[str, float]
+    deadline_seconds: float
+
+    @property
+    def estimated_seconds(self) -> float:
+        return sum(self.stage_seconds.values())
+
+    @property
+    def meets_deadline(self) -> bool:
+        return self.estimated_seconds <= self.deadline_seconds
+
+
+def fit_to_deadline(
+    preset: GenrePreset,
+    route: str,
+    duration: float,
+    parts: Sequence[str],
+    deadline_seconds: float,
+    cost_model: CostModel | None = None,
+    analysis_known: bool = False,
+) -> DeadlinePlan:
+    """Degrade a preset step by step until its estimated run time fits.
+
+    Degradations are tried from the smallest quality loss to the largest:
+    excerpt analysis, beat-synchronous chords, then the lighter Demucs
+    model. Each is kept only once the previous ones were not enough.
+
+    Args:
+        preset: Preset the run would use without a deadline.
+        route: Route chosen by the router.
+        duration: Audio duration in seconds.
+        parts: Requested parts.
+        deadline_seconds: Time budget for the whole run.
+        cost_model: Stage costs; defaults to the calibration file if present.
+        analysis_known: Whether analysis is skipped.
+
+    Returns:
+        DeadlinePlan with the preset to run and the degradations applied. If
+        even the cheapest settings miss the deadline, every applicable
+        degradation is applied and ``meets_deadline`` is False.
+    """
+    cost_model = cost_model or CostModel.from_calibration()
+    applied: list[str] = []
+    stages = cost_model.estimate(preset, route, duration, parts, analysis_known)
+    for name, degrade in _DEGRADATIONS:
+        if sum(stages.values()) <= deadline_seconds:
+            break
+        degraded = degrade(preset, route, parts)
+        if degraded is None:
+            continue
+        preset = degraded
+        applied.append(name)
+        stages = cost_model.estimate(preset, route, duration, parts, analysis_known)
+    plan = DeadlinePlan(
+        preset=preset,
+        degradations=tuple(applied),
+        stage_seconds=stages,
+        deadline_seconds=deadline_seconds,
+    )
+    if not plan.meets_deadline:
+        logger.warning(
+            "Estimated %.1fs exceeds the %.1fs deadline even with %s",
+            plan.estimated_seconds,
+            deadline_seconds,
+            ", ".join(applied) or "no degradations",
+        )
+    elif applied:
+        logger.info("Applied %s to meet the %.1fs deadline", ", ".join(applied), deadline_seconds)
+    return plan
+
+
+def needs_beats(preset: GenrePreset, parts: Sequence[str]) -> bool:
+    """Whether a run with these settings uses beat times from analysis.
+
+    Args:
+        preset: Settings the pipeline will run with.
+        parts: Parts to transcribe.
+
+    Returns:
+        True for beat-synchronous chords or a tempo map.
+    """
+    beat_chords = preset.transcription.chord_sync != "frame" and any(
+        part.lower() in {"chords", "harmony"} for part in parts
+    )
+    return beat_chords or preset.assembly.tempo_map
+
+
+def _lookup(table: dict, tier: str, missing: object) -> Any:
+    if tier in table:
+        return table[tier]
+    # Unknown tiers (e.g. another Demucs model) cost as much as the most
+    # expensive known tier of the same stage, so estimates err on the safe side.
+    stage = tier.split(".", 1)[0]
+    known = [value for name, value in table.items() if name.split(".", 1)[0] == stage]
+    return max(known, default=missing)
+
+
+def _pitch_workers(preset: GenrePreset) -> int:
+    workers = preset.transcription.pitch_workers
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def _transcription_tier(part: str, preset: GenrePreset) -> str:
+    normalized = part.lower()
+    if normalized == "drums":
+        return "transcription.drums"
+    if normalized in {"chords", "harmony"}:
+        sync = "frame" if preset.transcription.chord_sync == "frame" else "beat"
+        return f"transcription.chords.{sync}"
+    return "transcription.pitch"
+
+
+# Each degradation returns a cheaper preset, or None when it does not apply.
+def _excerpt_analysis(preset: GenrePreset, route: str, parts: Sequence[str]) -> GenrePreset | None:
+    if preset.analysis.fast_analysis:
+        return None
+    return preset.model_copy(
+        update={"analysis": preset.analysis.model_copy(update={"fast_analysis": True})}
+    )
+
+
+def _beat_chords(preset: GenrePreset, route: str, parts: Sequence[str]) -> GenrePreset | None:
+    if preset.transcription.chord_sync != "frame" or not any(
+        part.lower() in {"chords", "harmony"} for part in parts
+    ):
+        return None
+    return preset.model_copy(
+        update={"transcription": preset.transcription.model_copy(update={"chord_sync": "beat"})}
+    )
+
+
+def _light_separation(preset: GenrePreset, route: str, parts: Sequence[str]) -> GenrePreset | None:
+    if route != "route_b" or preset.separation.stage1_model == LIGHT_SEPARATION_MODEL:
+        return None
+    return preset.model_copy(
+        update={
+            "separation": preset.separation.model_copy(
+                update={"stage1_model": LIGHT_SEPARATION_MODEL}
+            )
+        }
+    )
+
+
+_DEGRADATIONS: tuple[
+    tuple[str, Callable[[GenrePreset, str, Sequence[str]], GenrePreset | None]], ...
+] = (
+    ("excerpt_analysis", _excerpt_analysis),
+    ("beat_chords", _beat_chords),
+    ("light_separation", _light_separation),
+)
@@ -0,0 +1,255 @@
+"""On-disk project bundles holding a job's stems, analysis and notes."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+import json
+import logging
+import os
+
+import numpy as np
+
+from stemscore.assembler.snapshot import AssemblySnapshot
+from stemscore.utils.audio_io import AudioSource, open_audio_source
+from stemscore.utils.columns import columns_to_notes, notes_to_columns
+from stemscore.utils.exceptions import BundleError
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_SUFFIX = ".stemscore"
+DEFAULT_BUNDLE_NAME = f"project{BUNDLE_SUFFIX}"
+INDEX_FILENAME = "index.json"
+_BUNDLE_VERSION = 1
+# Frames copied per block when encoding stems, so long stems stream.
+_ENCODE_BLOCK_FRAMES = 1 << 16
+# Sources at or below 16 bits are stored as 16-bit FLAC, everything else as 24-bit.
+_SIXTEEN_BIT_SUBTYPES = frozenset({"PCM_16", "PCM_S8", "PCM_U8"})
+# Float sources peaking above full scale are kept as float WAV instead of clipped.
+_FLOAT_SUBTYPES = frozenset({"FLOAT", "DOUBLE"})
+
+
+class ProjectBundle:
+    """A ``.stemscore`` directory with FLAC stems, analysis and note columns.
+
+    Layout::
+
+        index.json                 analysis plus per-part stem and note entries
+        stems/<part>.flac          losslessly compressed stem audio
+                                   (float WAV for float stems above full scale)
+        notes/<part>/<field>.npy   one array per note field
+
+    The index is small and read on open; a part's stem or notes are only
+    read when requested, and note columns are memory-mapped.
+    """
+
+    def __init__(self, path: Path, index: dict) -> None:
+        self.path = Path(path)
+        self._index = index
+
+    @classmethod
+    def create(cls, path: Path) -> ProjectBundle:
+        """Create an empty bundle, replacing the index of an existing one."""
+        path.mkdir(parents=True, exist_ok=True)
+        bundle = cls(path, {"version": _BUNDLE_VERSION, "analysis": None, "parts": {}})
+        bundle._write_index()
+        return bundle
+
+    @classmethod
+    def open(cls, path: Path) -> ProjectBundle:
+        """Open a bundle by reading its index.
+
+        Raises:
+            BundleError: If the index is missing, malformed or too new.
+        """
+        index_path = path / INDEX_FILENAME
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise BundleError(f"Not a readable project bundle: {path}") from exc
+        if not isinstance(index, dict) or int(index.get("version", 0)) > _BUNDLE_VERSION:
+            raise BundleError(f"Unsupported project bundle: {path}")
+        index.setdefault("parts", {})
+        return cls(path, index)
+
+    @property
+    def parts(self) -> list[str]:
+        return list(self._index["parts"])
+
+    def write_analysis(self, snapshot: AssemblySnapshot) -> None:
+        """Store tempo, key, meter, beats and genre; notes are stored per part."""
+        self._index["analysis"] = {
+            "tempo": float(snapshot.tempo),
+            "key": snapshot.key,
+            "time_signature": int(snapshot.time_signature),
+            "beat_times": [float(time) for time in snapshot.beat_times],
+            "genre": snapshot.genre,
+        }
+        self._write_index()
+
+    def write_stem(self, part: str, audio_path: AudioSource) -> Path:
+        """Encode a stem into the bundle as FLAC.
+
+        FLAC stores fixed-point samples only, so float stems that peak above
+        full scale are copied as float WAV rather than clipped.
+
+        Args:
+            part: Part name.
+            audio_path: Source audio file or archive member in any format
+                soundfile reads.
+
+        Returns:
+            Path of the stem file inside the bundle.
+
+        Raises:
+            BundleError: If the stem cannot be read or encoded.
+        """
+        import soundfile as sf  # lazy import for heavy deps
+
+        stems_dir = self.path / "stems"
+        stems_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            with open_audio_source(audio_path) as stream, sf.SoundFile(stream) as source:
+                as_float = source.subtype in _FLOAT_SUBTYPES and _peak(source) > 1.0
+                if as_float:
+                    relative = Path("stems") / f"{part}.wav"
+                    audio_format, subtype = "WAV", "FLOAT"
+                else:
+                    relative = Path("stems") / f"{part}.flac"
+                    audio_format = "FLAC"
+                    subtype = "PCM_16" if source.subtype in _SIXTEEN_BIT_SUBTYPES else "PCM_24"
+                target = self.path / relative
+                for stale in (stems_dir / f"{part}.wav", stems_dir / f"{part}.flac"):
+                    if stale != target:
+                        stale.unlink(missing_ok=True)
+                with sf.SoundFile(
+                    str(target),
+                    "w",
+                    samplerate=source.samplerate,
+                    channels=source.channels,
+                    format=audio_format,
+                    subtype=subtype,
+                ) as encoded:
+                    for block in source.blocks(blocksize=_ENCODE_BLOCK_FRAMES, dtype="float32"):
+                        encoded.write(block if as_float else np.clip(block, -1.0, 1.0))
+        except (RuntimeError, OSError, sf.SoundFileError) as exc:
+            raise BundleError(f"Failed to encode stem {audio_path}") from exc
+        self._part_entry(part)["stem"] = relative.as_posix()
+        self._write_index()
+        return target
+
+    def write_notes(self, part: str, notes: list[dict]) -> None:
+        """Store a part's notes as one ``.npy`` array per field."""
+        relative = Path("notes") / part
+        directory = self.path / relative
+        directory.mkdir(parents=True, exist_ok=True)
+        columns = notes_to_columns(notes)
+        for stale in directory.glob("*.npy"):
+            stale.unlink()
+        try:
+            for name, values in columns.items():
+                np.save(directory / f"{name}.npy", values, allow_pickle=False)
+        except ValueError as exc:
+            raise BundleError(f"Notes for {part} have non-scalar fields") from exc
+        self._part_entry(part)["notes"] = {
+            "path": relative.as_posix(),
+            "count": len(notes),
+            "columns": sorted(columns),
+        }
+        self._write_index()
+
+    def stem_path(self, part: str) -> Path | None:
+        """Path of a part's stem audio, or None if the bundle has none."""
+        relative = self._index["parts"].get(part, {}).get("stem")
+        return self.path / relative if relative else None
+
+    def note_columns(self, part: str) -> dict[str, np.ndarray]:
+        """Memory-map a part's note columns without reading other parts.
+
+        Raises:
+            BundleError: If the bundle has no notes for the part.
+        """
+        entry = self._notes_entry(part)
+        directory = self.path / entry["path"]
+        return {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+            for name in entry["columns"]
+        }
+
+    def read_notes(self, part: str) -> list[dict]:
+        """Load a part's notes as note dictionaries."""
+        return columns_to_notes(self.note_columns(part), int(self._notes_entry(part)["count"]))
+
+    def snapshot(self) -> AssemblySnapshot:
+        """Rebuild the assembly input (analysis plus every part's notes).
+
+        Raises:
+            BundleError: If the bundle has no analysis.
+        """
+        analysis = self._index.get("analysis")
+        if not analysis:
+            raise BundleError(f"Project bundle has no analysis: {self.path}")
+        return AssemblySnapshot(
+            parts={
+                part: self.read_notes(part)
+                for part, entry in self._index["parts"].items()
+                if "notes" in entry
+            },
+            tempo=float(analysis["tempo"]),
+            key=str(analysis["key"]),
+            time_signature=int(analysis["time_signature"]),
+            beat_times=tuple(float(time) for time in analysis.get("beat_times", ())),
+            genre=str(analysis.get("genre", "pop")),
+        )
+
+    def _part_entry(self, part: str) -> dict:
+        entry: dict = self._index["parts"].setdefault(part, {})
+        return entry
+
+    def _notes_entry(self, part: str) -> dict:
+        entry = self._index["parts"].get(part, {}).get("notes")
+        if entry is None:
+            raise BundleError(f"Project bundle has no notes for {part}: {self.path}")
+        notes_entry: dict = entry
+        return notes_entry
+
+    def _write_index(self) -> None:
+        partial = self.path / f"{INDEX_FILENAME}.tmp"
+        partial.write_text(json.dumps(self._index, indent=2), encoding="utf-8")
+        os.replace(partial, self.path / INDEX_FILENAME)
+
+
+def save_bundle(
+    path: Path, snapshot: AssemblySnapshot, stems: dict[str, AudioSource] | None = None
+) -> ProjectBundle:
+    """Write a complete bundle for a finished transcription.
+
+    Args:
+        path: Bundle directory (conventionally ending in ``.stemscore``).
+        snapshot: Analysis and raw notes per part.
+        stems: Stem audio per part to encode into the bundle.
+
+    Returns:
+        The written ProjectBundle. Stems that cannot be encoded are skipped
+        with a warning; the notes alone are enough to reassemble.
+    """
+    bundle = ProjectBundle.create(path)
+    bundle.write_analysis(snapshot)
+    for part, notes in snapshot.parts.items():
+        bundle.write_notes(part, notes)
+    for part, stem_path in (stems or {}).items():
+        try:
+            bundle.write_stem(part, stem_path)
+        except BundleError as exc:
+            logger.warning("Skipping stem %s in bundle: %s", part, exc)
+    logger.info("Saved project bundle with %s parts to %s", len(bundle.parts), path)
+    return bundle
+
+
+def _peak(source: Any) -> float:
+    """Largest absolute sample of an open SoundFile; rewinds it afterwards."""
+    peak = 0.0
+    for block in source.blocks(blocksize=_ENCODE_BLOCK_FRAMES, dtype="float32"):
+        if block.size:
+            peak = max(peak, float(np.abs(block).max()))
+    source.seek(0)
+    return peak
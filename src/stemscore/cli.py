@@ -2,14 +2,15 @@
 from __future__ import annotations
 
 from pathlib import Path
+import json
 
 from rich.console import Console
-from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+from rich.table import Table
 import typer
 
-from stemscore import analyzer, assembler, router, separator, transcriber
+from stemscore import analyzer, budget, pipeline, router, transcriber
 from stemscore.config import GENRE_PRESETS
-from stemscore.suno import import_suno
+from stemscore.utils.exceptions import AssemblyError, AudioLoadError, BundleError
 
 app = typer.Typer(
     name="stemscore",
@@ -19,7 +20,9 @@ app = typer.Typer(
 
 @app.command()
 def transcribe(
-    input_path: str = typer.Argument(..., help="Input audio file or Suno export directory"),
+    input_path: str = typer.Argument(
+        ..., help="Input audio file, Suno export directory or Suno export zip"
+    ),
     output_dir: str = typer.Option("./output", help="Output directory"),
     parts: str = typer.Option(
         "lead_vocal,backing_vocal,bass,drums,backing_harmony,chords",
@@ -27,6 +30,19 @@ def transcribe(
     ),
     genre: str = typer.Option("pop", help="Genre preset"),
     format: str = typer.Option("midi,musicxml", help="Output formats"),
+    cache: bool = typer.Option(True, help="Reuse transcriptions of unchanged stems"),
+    cache_dir: str = typer.Option(
+        str(transcriber.DEFAULT_CACHE_DIR), help="Transcription cache directory"
+    ),
+    job: bool = typer.Option(
+        True, help="Write into a unique job directory under the output directory"
+    ),
+    deadline: float | None = typer.Option(
+        None, help="Time budget in seconds; cheaper settings are used to meet it"
+    ),
+    bundle_stems: bool = typer.Option(
+        False, help="Also store FLAC copies of the stems in the project bundle"
+    ),
 ) -> None:
     """Transcribe audio into multi-part score."""
     console = Console()
@@ -34,113 +50,199 @@ def transcribe(
     output_dir_obj = Path(output_dir)
     requested_parts = [part.strip().lower() for part in parts.split(",") if part.strip()]
     formats_list = [fmt.strip().lower() for fmt in format.split(",") if fmt.strip()]
-    preset = GENRE_PRESETS.get(genre, GENRE_PRESETS["pop"])
-
-    route_selector = router.InputRouter()
-    route = route_selector.route(input_path_obj)
+    transcription_cache = transcriber.TranscriptionCache(Path(cache_dir)) if cache else None
 
+    route = router.InputRouter().route(input_path_obj)
     console.print(f"StemScore v0.1.0 — Processing: {input_path_obj}")
     console.print(f"Route: {route} | Parts: {', '.join(requested_parts)} | Genre: {genre}")
 
-    progress = Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TimeElapsedColumn(),
-        console=console,
-    )
-
-    analysis = None
-    stems: dict[str, Path] = {}
-    with progress:
-        if route == "route_b":
-            task = progress.add_task("Analyzing mix", total=1)
-            analysis = analyzer.analyze(input_path_obj)
-            progress.advance(task)
-
-            task = progress.add_task("Separating stems", total=1)
-            stems = separator.separate(
-                input_path_obj,
-                output_dir_obj / "stems",
-                model=preset.separation.stage1_model,
-            )
-            progress.advance(task)
-
-            stems = _map_route_b_stems(stems)
-        elif route == "route_a":
-            task = progress.add_task("Importing Suno stems", total=1)
-            stems = import_suno(input_path_obj)
-            progress.advance(task)
-
-            task = progress.add_task("Analyzing stems", total=1)
-            analysis_path = _select_analysis_stem(stems)
-            analysis = analyzer.analyze(analysis_path)
-            progress.advance(task)
-        else:
-            raise typer.Exit(code=1)
-
-        stems = _filter_parts(stems, requested_parts)
-        if not stems:
-            console.print("No matching stems found for requested parts")
-            raise typer.Exit(code=1)
-
-        task = progress.add_task("Transcribing stems", total=len(stems))
-        note_parts: dict[str, list[dict]] = {}
-        for part_name, stem_path in stems.items():
-            result = transcriber.transcribe_part(stem_path, part_name, preset.transcription)
-            note_parts[part_name] = result.notes
-            progress.advance(task)
-
-        task = progress.add_task("Assembling score", total=1)
-        assembly = assembler.assemble(
-            note_parts,
-            tempo=analysis.tempo,
-            key=analysis.key,
-            time_signature=analysis.time_signature,
-            output_dir=output_dir_obj,
-            formats=formats_list,
-            level=preset.assembly.quantize_level,
-            swing=preset.assembly.swing_detection,
-        )
-        progress.advance(task)
-
+    try:
+        with console.status("Analyzing, separating and transcribing stems"):
+            if job:
+                result = pipeline.run_job(
+                    input_path_obj,
+                    output_dir_obj,
+                    requested_parts,
+                    genre,
+                    formats_list,
+                    cache=transcription_cache,
+                    deadline_seconds=deadline,
+                    bundle_stems=bundle_stems,
+                )
+            else:
+                result = pipeline.run_pipeline(
+                    input_path_obj,
+                    output_dir_obj,
+                    requested_parts,
+                    genre,
+                    formats_list,
+                    cache=transcription_cache,
+                    deadline_seconds=deadline,
+                    bundle_stems=bundle_stems,
+                )
+    except ValueError as exc:
+        console.print(str(exc))
+        raise typer.Exit(code=1) from exc
+
+    if job:
+        console.print(f"Job: {result['output_dir']}")
     console.print("Summary")
-    console.print(f"Tempo: {analysis.tempo}")
-    console.print(f"Key: {analysis.key}")
-    console.print(f"Time Signature: {analysis.time_signature}/4")
-    for fmt, path in assembly.output_files.items():
+    console.print(f"Tempo: {result['tempo']}")
+    console.print(f"Key: {result['key']}")
+    console.print(f"Time Signature: {result['time_signature']}/4")
+    if result.get("degradations"):
+        console.print(f"Degraded to meet the deadline: {', '.join(result['degradations'])}")
+    for fmt, path in result["output_files"].items():
         console.print(f"{fmt}: {path}")
+    if transcription_cache is not None:
+        stats = transcription_cache.stats
+        console.print(f"Transcription cache: {stats.hits} hits, {stats.misses} misses")
 
 
 @app.command()
-def version() -> None:
-    """Show version."""
-    typer.echo("stemscore 0.1.0")
+def watch(
+    watch_dir: str = typer.Argument(..., help="Directory receiving mixes and Suno exports"),
+    output_dir: str = typer.Option("./output", help="Directory for per-input outputs"),
+    parts: str = typer.Option(
+        "lead_vocal,backing_vocal,bass,drums,backing_harmony,chords",
+        help="Comma-separated parts to extract",
+    ),
+    genre: str = typer.Option("pop", help="Genre preset"),
+    format: str = typer.Option("midi,musicxml", help="Output formats"),
+    workers: int = typer.Option(2, help="Inputs processed concurrently"),
+    poll: float = typer.Option(5.0, help="Seconds between directory scans"),
+    settle: float = typer.Option(10.0, help="Seconds without writes before an input is complete"),
+    once: bool = typer.Option(False, help="Process complete inputs once and exit"),
+    cache_dir: str = typer.Option(
+        str(transcriber.DEFAULT_CACHE_DIR), help="Transcription cache directory"
+    ),
+) -> None:
+    """Transcribe inputs as they are dropped into a directory."""
+    from stemscore import watch as watcher
+
+    console = Console()
+    requested_parts = [part.strip().lower() for part in parts.split(",") if part.strip()]
+    formats_list = [fmt.strip().lower() for fmt in format.split(",") if fmt.strip()]
+    console.print(f"Watching {watch_dir} with {workers} workers (Ctrl+C to stop)")
+    try:
+        watcher.watch(
+            Path(watch_dir),
+            Path(output_dir),
+            requested_parts,
+            genre,
+            formats_list,
+            workers=workers,
+            poll_seconds=poll,
+            settle_seconds=settle,
+            cache=transcriber.TranscriptionCache(Path(cache_dir)),
+            once=once,
+        )
+    except KeyboardInterrupt:
+        console.print("Stopped")
+
+
+@app.command()
+def reassemble(
+    output_dir: str = typer.Argument(
+        ..., help="Output directory or .stemscore bundle of an earlier transcribe run"
+    ),
+    genre: str = typer.Option("", help="Genre preset (default: the one used to transcribe)"),
+    format: str = typer.Option("midi,musicxml", help="Output formats"),
+    level: int = typer.Option(0, help="Quantization level (default: from the genre preset)"),
+) -> None:
+    """Re-quantize and re-export saved notes without transcribing again."""
+    console = Console()
+    formats_list = [fmt.strip().lower() for fmt in format.split(",") if fmt.strip()]
+    try:
+        result = pipeline.reassemble(
+            Path(output_dir), formats_list, genre=genre or None, level=level or None
+        )
+    except (AssemblyError, BundleError) as exc:
+        console.print(str(exc))
+        raise typer.Exit(code=1) from exc
+    console.print(f"Reassembled {result['num_parts']} parts, {result['total_notes']} notes")
+    for fmt, path in result["output_files"].items():
+        console.print(f"{fmt}: {path}")
 
 
-def _map_route_b_stems(stems: dict[str, Path]) -> dict[str, Path]:
-    mapped: dict[str, Path] = {}
-    route_map = {
-        "vocals": "lead_vocal",
-        "drums": "drums",
-        "bass": "bass",
-        "other": "backing_harmony",
-    }
-    for stem_name, stem_path in stems.items():
-        mapped[route_map.get(stem_name.lower(), stem_name.lower())] = stem_path
-    return mapped
+@app.command()
+def plan(
+    input_path: str = typer.Argument(
+        ..., help="Input audio file, Suno export directory or Suno export zip"
+    ),
+    parts: str = typer.Option(
+        "lead_vocal,backing_vocal,bass,drums,backing_harmony,chords",
+        help="Comma-separated parts to extract",
+    ),
+    genre: str = typer.Option("pop", help="Genre preset"),
+    deadline: float | None = typer.Option(
+        None, help="Time budget in seconds; cheaper settings are used to meet it"
+    ),
+    calibration: str = typer.Option(
+        str(budget.DEFAULT_CALIBRATION_PATH), help="Calibration file from the stage benchmark"
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Print the plan as JSON"),
+) -> None:
+    """Estimate per-stage time and peak memory without running the pipeline."""
+    console = Console()
+    requested_parts = [part.strip().lower() for part in parts.split(",") if part.strip()]
+    try:
+        cost_model = budget.CostModel.from_calibration(Path(calibration))
+        execution = pipeline.plan_pipeline(
+            Path(input_path), requested_parts, genre, deadline, cost_model
+        )
+    except (FileNotFoundError, ValueError, AudioLoadError) as exc:
+        console.print(str(exc))
+        raise typer.Exit(code=1) from exc
+    if json_output:
+        typer.echo(json.dumps(execution.to_dict(), indent=2))
+        return
+
+    table = Table(title=f"{execution.route} | {execution.duration:.1f}s of audio")
+    for column in ("stage", "tiers", "est. s", "peak MB"):
+        table.add_column(column, justify="left" if column in {"stage", "tiers"} else "right")
+    for stage in execution.stages:
+        table.add_row(
+            stage.name,
+            ", ".join(sorted(set(stage.tiers))) or "skipped",
+            f"{stage.seconds:.1f}",
+            f"{stage.peak_memory_mb:.0f}",
+        )
+    console.print(table)
+    console.print(
+        f"Total: {execution.estimated_seconds:.1f}s, peak {execution.peak_memory_mb:.0f} MB"
+    )
+    if execution.degradations:
+        console.print(f"Degraded to meet the deadline: {', '.join(execution.degradations)}")
 
 
-def _filter_parts(stems: dict[str, Path], parts: list[str]) -> dict[str, Path]:
-    if not parts:
-        return stems
-    return {name: path for name, path in stems.items() if name.lower() in parts}
+@app.command()
+def analyze(
+    input_path: str = typer.Argument(..., help="Input audio file"),
+    genre: str = typer.Option("pop", help="Genre preset"),
+    fast: bool = typer.Option(True, help="Analyze excerpts, escalating when they disagree"),
+) -> None:
+    """Print tempo, key, and time signature without transcribing."""
+    console = Console()
+    preset = GENRE_PRESETS.get(genre, GENRE_PRESETS["pop"])
+    config = preset.analysis.model_copy(update={"fast_analysis": fast, "detect_repeats": False})
+    analysis = analyzer.analyze(Path(input_path), config, beats=False)
+    confidence = analysis.confidence
+    console.print(f"Tempo: {analysis.tempo:.1f}")
+    console.print(f"Key: {analysis.key}")
+    console.print(f"Time Signature: {analysis.time_signature}/4")
+    if confidence is not None:
+        console.print(
+            f"Confidence: tempo {confidence.tempo:.2f} | key {confidence.key:.2f} | "
+            f"meter {confidence.time_signature:.2f} ({confidence.excerpts} excerpts"
+            f"{', escalated' if confidence.escalated else ''})"
+        )
 
 
-def _select_analysis_stem(stems: dict[str, Path]) -> Path:
-    if "lead_vocal" in stems:
-        return stems["lead_vocal"]
-    return next(iter(stems.values()))
+@app.command()
+def version() -> None:
+    """Show version."""
+    typer.echo("stemscore 0.1.0")
 
 
 if __name__ == "__main__":
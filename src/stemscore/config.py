@@ -3,8 +3,17 @@ from pydantic import BaseModel
 
 
 class AnalysisConfig(BaseModel):
+    tempo_estimator: str = "beat_track"
     tempo_octave_correction: bool = True
+    tempo_prior_bpm: float = 120.0
     key_diatonic_bias: float = 0.8
+    key_window_seconds: float = 0.0
+    fast_analysis: bool = False
+    excerpt_count: int = 3
+    excerpt_seconds: float = 12.0
+    detect_repeats: bool = False
+    repeat_similarity: float = 0.9
+    repeat_min_seconds: float = 8.0
     time_sig_candidates: list[int] = [4, 3]
 
 
@@ -16,14 +25,28 @@ class SeparationConfig(BaseModel):
 class TranscriptionConfig(BaseModel):
     vocal_min_note_ms: int = 80
     melisma_mode: str = "grace_note"
+    melisma_max_ms: int = 120
+    melisma_max_beats: float = 0.2
+    merge_gap_ms: int = 30
+    min_confidence: float = 0.1
+    min_velocity: int = 0
     drum_classes: int = 9
     chord_model: str = "autochord"
+    chord_sync: str = "frame"
+    chord_transition_penalty: float = 0.5
+    skip_silence: bool = True
+    pitch_window_seconds: float = 0.0
+    pitch_backend: str = "tensorflow"
+    pitch_threads: int = 0
+    pitch_workers: int = 1
+    pitch_segment_seconds: float = 60.0
 
 
 class AssemblyConfig(BaseModel):
     quantize_level: int = 16
     swing_detection: bool = False
     triplet: bool = False
+    tempo_map: bool = False
 
 
 class GenrePreset(BaseModel):
@@ -36,12 +59,18 @@ class GenrePreset(BaseModel):
 GENRE_PRESETS: dict[str, GenrePreset] = {
     "pop": GenrePreset(),
     "jazz": GenrePreset(
-        analysis=AnalysisConfig(key_diatonic_bias=0.3, time_sig_candidates=[4, 3, 5, 7]),
+        analysis=AnalysisConfig(
+            key_diatonic_bias=0.3, time_sig_candidates=[4, 3, 5, 7], tempo_prior_bpm=140.0
+        ),
         transcription=TranscriptionConfig(vocal_min_note_ms=60, melisma_mode="individual_notes", drum_classes=13, chord_model="btc"),
-        assembly=AssemblyConfig(quantize_level=8, swing_detection=True, triplet=True),
+        assembly=AssemblyConfig(
+            quantize_level=8, swing_detection=True, triplet=True, tempo_map=True
+        ),
     ),
     "edm": GenrePreset(
-        analysis=AnalysisConfig(key_diatonic_bias=0.7),
+        analysis=AnalysisConfig(
+            key_diatonic_bias=0.7, tempo_estimator="autocorrelation", tempo_prior_bpm=126.0
+        ),
         transcription=TranscriptionConfig(vocal_min_note_ms=60),
     ),
 }
@@ -0,0 +1,151 @@
+"""Job-scoped output directories so concurrent runs never share files."""
+from __future__ import annotations
+
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+_MANIFEST_VERSION = 1
+_PARTIAL_SUFFIX = ".partial"
+# Manifest fields written by ``commit`` itself.
+_MANIFEST_FIELDS = frozenset({"version", "job_id", "completed", "files"})
+_HASH_CHUNK_BYTES = 1 << 20
+_SLUG_PATTERN = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def new_job_id(input_path: Path | None = None) -> str:
+    """Create a unique job id that sorts by start time.
+
+    Args:
+        input_path: Input whose name is embedded for readability.
+
+    Returns:
+        An id such as ``20261019-153000-song-1a2b3c4d``.
+    """
+    slug = _SLUG_PATTERN.sub("-", input_path.stem).strip("-")[:40] if input_path else ""
+    parts = [time.strftime("%Y%m%d-%H%M%S"), slug, uuid.uuid4().hex[:8]]
+    return "-".join(part for part in parts if part)
+
+
+class JobDirectory:
+    """Output directory of one job, staged under a hidden name until complete.
+
+    Everything the job writes goes to ``staging``. ``commit`` records a
+    manifest of the produced files and renames the staging directory to
+    ``path`` in one step, so readers never see a half-written job.
+    """
+
+    def __init__(self, output_root: Path, job_id: str) -> None:
+        self.job_id = job_id
+        self.path = output_root / job_id
+        self.staging = output_root / f".{job_id}{_PARTIAL_SUFFIX}"
+
+    @classmethod
+    def begin(cls, output_root: Path, job_id: str | None = None) -> JobDirectory:
+        """Create a fresh staging directory for a job.
+
+        Args:
+            output_root: Directory holding one subdirectory per job.
+            job_id: Job id; a new unique id is generated when omitted.
+
+        Returns:
+            The JobDirectory, with an empty staging directory.
+        """
+        job = cls(output_root, job_id or new_job_id())
+        # Leftovers of a run that crashed with the same id.
+        shutil.rmtree(job.staging, ignore_errors=True)
+        job.staging.mkdir(parents=True)
+        return job
+
+    @classmethod
+    def reopen(cls, job_dir: Path) -> JobDirectory:
+        """Stage a copy of a committed job so it can be changed and re-committed.
+
+        The committed directory stays untouched until ``commit``.
+
+        Args:
+            job_dir: Final directory of a committed job.
+
+        Returns:
+            The JobDirectory, with the job's files (minus its manifest) staged.
+        """
+        job = cls(job_dir.parent, job_dir.name)
+        shutil.rmtree(job.staging, ignore_errors=True)
+        shutil.copytree(job.path, job.staging)
+        (job.staging / MANIFEST_FILENAME).unlink(missing_ok=True)
+        return job
+
+    def final_path(self, staged: Path) -> Path:
+        """Where a file written under ``staging`` lives after ``commit``."""
+        return self.path / Path(staged).relative_to(self.staging)
+
+    def commit(self, details: dict | None = None) -> Path:
+        """Write the manifest and move the job to its final directory.
+
+        A committed job with the same id is replaced.
+
+        Args:
+            details: Extra JSON-serializable fields for the manifest.
+
+        Returns:
+            The final job directory.
+        """
+        files = [
+            _describe_file(path, self.staging)
+            for path in sorted(self.staging.rglob("*"))
+            if path.is_file()
+        ]
+        manifest = {
+            "version": _MANIFEST_VERSION,
+            "job_id": self.job_id,
+            "completed": time.time(),
+            **(details or {}),
+            "files": files,
+        }
+        (self.staging / MANIFEST_FILENAME).write_text(
+            json.dumps(manifest, indent=2, default=str), encoding="utf-8"
+        )
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.staging, self.path)
+        logger.info("Committed job %s with %s files", self.job_id, len(files))
+        return self.path
+
+    def discard(self) -> None:
+        """Remove the staging directory of a failed job."""
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+def manifest_details(manifest: dict) -> dict:
+    """The caller-supplied fields of a manifest, as passed to ``commit``."""
+    return {key: value for key, value in manifest.items() if key not in _MANIFEST_FIELDS}
+
+
+def read_manifest(job_dir: Path) -> dict:
+    """Read the manifest of a committed job.
+
+    Raises:
+        FileNotFoundError: If the directory has no manifest.
+    """
+    manifest: dict = json.loads((job_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    return manifest
+
+
+def _describe_file(path: Path, root: Path) -> dict:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return {
+        "path": path.relative_to(root).as_posix(),
+        "bytes": path.stat().st_size,
+        "sha256": digest.hexdigest(),
+    }
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from pathlib import Path
-import json
 import logging
 
-from stemscore import analyzer, assembler, router, separator, transcriber
+from stemscore import analyzer, assembler, budget, jobs, router, separator, transcriber
+from stemscore.bundle import BUNDLE_SUFFIX, DEFAULT_BUNDLE_NAME, ProjectBundle, save_bundle
 from stemscore.config import GENRE_PRESETS, GenrePreset
-from stemscore.suno import import_suno
+from stemscore.suno import import_suno, probe_suno, read_suno_metadata
+from stemscore.transcriber import TranscriptionCache
+from stemscore.utils.audio_io import AudioSource, audio_duration
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,11 @@ def run_pipeline(
     parts: list[str],
     genre: str,
     formats: list[str],
+    cache: TranscriptionCache | None = None,
+    deadline_seconds: float | None = None,
+    cost_model: budget.CostModel | None = None,
+    dry_run: bool = False,
+    bundle_stems: bool = False,
 ) -> dict:
     """Run the end-to-end StemScore pipeline.
 
@@ -34,36 +41,73 @@ def run_pipeline(
         parts: Requested parts to process.
         genre: Genre preset name.
         formats: Output formats.
+        cache: Optional transcription cache shared across runs.
+        deadline_seconds: Time budget; cheaper stage settings are chosen
+            when the full-quality run is estimated to take longer.
+        cost_model: Stage costs for deadlines and dry runs; defaults to the
+            calibration file if present.
+        dry_run: Only plan the run: return ``plan_pipeline``'s estimate as
+            a dictionary without writing anything.
+        bundle_stems: Also encode every stem into the project bundle. Off by
+            default: the bundle then holds only analysis and notes, which
+            is all reassembly needs.
 
     Returns:
-        Dictionary containing analysis results and output files.
+        Dictionary containing analysis results, output files and the
+        degradations applied to meet the deadline, or the execution plan
+        for a dry run.
     """
+    if dry_run:
+        return plan_pipeline(input_path, parts, genre, deadline_seconds, cost_model).to_dict()
     preset = _resolve_genre(genre)
     requested_parts = [part.lower() for part in parts]
+    degradations: tuple[str, ...] = ()
 
     route_selector = router.InputRouter()
     route = route_selector.route(input_path)
 
     if route == "route_b":
-        analysis = analyzer.analyze(input_path)
-        stems = separator.separate(
+        if deadline_seconds is not None:
+            preset, degradations = _fit_deadline(
+                preset,
+                route,
+                input_path,
+                _route_b_parts(requested_parts),
+                deadline_seconds,
+                cost_model,
+            )
+        analysis = analyzer.analyze(
+            input_path,
+            preset.analysis,
+            beats=budget.needs_beats(preset, _route_b_parts(requested_parts)),
+        )
+        separated = separator.separate(
             input_path,
             output_dir / "stems",
             model=preset.separation.stage1_model,
         )
-        mapped = _map_route_b_stems(stems)
+        mapped = _map_route_b_stems(separated)
     elif route == "route_a":
-        stems = import_suno(input_path)
-        analysis_path = _select_analysis_stem(stems)
-        analysis = analyzer.analyze(analysis_path)
-        mapped = stems
-        tempo_override = _read_suno_tempo(input_path)
-        if tempo_override is not None:
-            analysis = analyzer.AnalysisResult(
-                tempo=tempo_override,
-                key=analysis.key,
-                time_signature=analysis.time_signature,
+        mapped = import_suno(input_path, work_dir=output_dir / "stems")
+        metadata = read_suno_metadata(input_path)
+        if deadline_seconds is not None and mapped:
+            preset, degradations = _fit_deadline(
+                preset,
+                route,
+                _select_analysis_stem(mapped),
+                list(_filter_parts(mapped, requested_parts)),
+                deadline_seconds,
+                cost_model,
+                analysis_known=metadata.is_complete,
             )
+        analysis = analyzer.analyze(
+            _select_analysis_stem(mapped),
+            preset.analysis,
+            tempo=metadata.tempo,
+            key=metadata.key,
+            time_signature=metadata.time_signature,
+            beats=budget.needs_beats(preset, list(_filter_parts(mapped, requested_parts))),
+        )
     else:
         raise ValueError(f"Unsupported route: {route}")
 
@@ -73,19 +117,29 @@ def run_pipeline(
 
     note_parts: dict[str, list[dict]] = {}
     for part_name, stem_path in filtered.items():
-        result = transcriber.transcribe_part(stem_path, part_name, preset.transcription)
+        result = transcriber.transcribe_part(
+            stem_path,
+            part_name,
+            preset.transcription,
+            beat_times=analysis.beat_times,
+            sections=analysis.sections,
+            cache=cache,
+            tempo=analysis.tempo,
+        )
         note_parts[part_name] = result.notes
 
-    assembly = assembler.assemble(
-        note_parts,
+    snapshot = assembler.AssemblySnapshot(
+        parts=note_parts,
         tempo=analysis.tempo,
         key=analysis.key,
         time_signature=analysis.time_signature,
-        output_dir=output_dir,
-        formats=formats,
-        level=preset.assembly.quantize_level,
-        swing=preset.assembly.swing_detection,
+        beat_times=tuple(analysis.beat_times),
+        genre=genre,
     )
+    save_bundle(
+        output_dir / DEFAULT_BUNDLE_NAME, snapshot, stems=filtered if bundle_stems else None
+    )
+    assembly = _assemble_snapshot(snapshot, preset, output_dir, formats)
 
     logger.info("Pipeline complete for %s", input_path)
     return {
@@ -96,45 +150,264 @@ def run_pipeline(
         "output_files": assembly.output_files,
         "num_parts": assembly.num_parts,
         "total_notes": assembly.total_notes,
+        "degradations": list(degradations),
+    }
+
+
+def plan_pipeline(
+    input_path: Path,
+    parts: list[str],
+    genre: str,
+    deadline_seconds: float | None = None,
+    cost_model: budget.CostModel | None = None,
+) -> budget.ExecutionPlan:
+    """Estimate a run's stages, time and peak memory without running it.
+
+    Only the route, audio headers, a few sampled blocks of each Suno stem
+    (to drop silent and unreadable ones as the run would) and the export's
+    metadata.json are read; nothing is written.
+
+    Args:
+        input_path: Input mix or Suno export.
+        parts: Requested parts to process.
+        genre: Genre preset name.
+        deadline_seconds: Time budget; the plan includes the degradations
+            ``run_pipeline`` would apply to meet it.
+        cost_model: Stage costs; defaults to the calibration file if present.
+
+    Returns:
+        The ExecutionPlan.
+    """
+    preset = _resolve_genre(genre)
+    requested_parts = [part.lower() for part in parts]
+    cost_model = cost_model or budget.CostModel.from_calibration()
+    route = router.InputRouter().route(input_path)
+    analysis_known = False
+    if route == "route_b":
+        source: AudioSource = input_path
+        planned_parts = _route_b_parts(requested_parts)
+    elif route == "route_a":
+        stems = probe_suno(input_path)
+        source = _select_analysis_stem(stems)
+        planned_parts = list(_filter_parts(stems, requested_parts))
+        analysis_known = read_suno_metadata(input_path).is_complete
+    else:
+        raise ValueError(f"Unsupported route: {route}")
+
+    duration = audio_duration(source)
+    degradations: tuple[str, ...] = ()
+    if deadline_seconds is not None:
+        fitted = budget.fit_to_deadline(
+            preset, route, duration, planned_parts, deadline_seconds, cost_model, analysis_known
+        )
+        preset, degradations = fitted.preset, fitted.degradations
+    return budget.plan_execution(
+        preset,
+        route,
+        duration,
+        planned_parts,
+        cost_model,
+        analysis_known=analysis_known,
+        input_path=str(input_path),
+        degradations=degradations,
+        deadline_seconds=deadline_seconds,
+    )
+
+
+def run_job(
+    input_path: Path,
+    output_root: Path,
+    parts: list[str],
+    genre: str,
+    formats: list[str],
+    cache: TranscriptionCache | None = None,
+    job_id: str | None = None,
+    deadline_seconds: float | None = None,
+    bundle_stems: bool = False,
+) -> dict:
+    """Run the pipeline into its own job directory under ``output_root``.
+
+    Outputs are staged in a hidden directory and renamed into
+    ``output_root/<job_id>`` with a manifest once the run succeeds, so
+    concurrent jobs on one host never write to the same files.
+
+    Args:
+        input_path: Input mix or Suno export.
+        output_root: Directory holding one subdirectory per job.
+        parts: Requested parts to process.
+        genre: Genre preset name.
+        formats: Output formats.
+        cache: Optional transcription cache shared across runs.
+        job_id: Job id; a unique id is generated when omitted.
+        deadline_seconds: Time budget passed on to ``run_pipeline``.
+        bundle_stems: Encode stems into the project bundle; see ``run_pipeline``.
+
+    Returns:
+        The ``run_pipeline`` result with paths in the final job directory,
+        plus ``job_id`` and ``output_dir``.
+    """
+    job = jobs.JobDirectory.begin(output_root, job_id or jobs.new_job_id(input_path))
+    try:
+        result = run_pipeline(
+            input_path=input_path,
+            output_dir=job.staging,
+            parts=parts,
+            genre=genre,
+            formats=formats,
+            cache=cache,
+            deadline_seconds=deadline_seconds,
+            bundle_stems=bundle_stems,
+        )
+        job.commit(
+            {
+                "input": str(input_path),
+                "route": result["route"],
+                "genre": genre,
+                "parts": sorted(parts),
+                "formats": list(formats),
+                "tempo": result["tempo"],
+                "key": result["key"],
+                "time_signature": result["time_signature"],
+                "degradations": result.get("degradations", []),
+            }
+        )
+    except BaseException:
+        job.discard()
+        raise
+    result["output_files"] = {
+        fmt: job.final_path(path) for fmt, path in result["output_files"].items()
+    }
+    return {**result, "job_id": job.job_id, "output_dir": job.path}
+
+
+def reassemble(
+    output_dir: Path,
+    formats: list[str],
+    genre: str | None = None,
+    level: int | None = None,
+) -> dict:
+    """Re-quantize and re-export a score from a finished run's saved notes.
+
+    Args:
+        output_dir: Output directory of an earlier run, or its project bundle.
+        formats: Output formats.
+        genre: Genre preset for assembly settings; defaults to the one the
+            notes were transcribed with.
+        level: Quantization level overriding the preset.
+
+    A committed job directory is re-staged and committed again, so its
+    manifest keeps describing the files on disk.
+
+    Returns:
+        Dictionary containing the analysis results and output files.
+    """
+    snapshot = _load_snapshot(output_dir)
+    if output_dir.suffix == BUNDLE_SUFFIX:
+        output_dir = output_dir.parent
+    preset = _resolve_genre(genre or snapshot.genre)
+    if level is not None:
+        preset = preset.model_copy(
+            update={"assembly": preset.assembly.model_copy(update={"quantize_level": level})}
+        )
+    job = None
+    if (output_dir / jobs.MANIFEST_FILENAME).is_file():
+        details = jobs.manifest_details(jobs.read_manifest(output_dir))
+        job = jobs.JobDirectory.reopen(output_dir)
+    try:
+        assembly = _assemble_snapshot(
+            snapshot, preset, job.staging if job else output_dir, formats
+        )
+        output_files = assembly.output_files
+        if job is not None:
+            job.commit(details)
+            output_files = {fmt: job.final_path(path) for fmt, path in output_files.items()}
+    except BaseException:
+        if job is not None:
+            job.discard()
+        raise
+    logger.info("Reassembled %s", output_dir)
+    return {
+        "tempo": snapshot.tempo,
+        "key": snapshot.key,
+        "time_signature": snapshot.time_signature,
+        "output_files": output_files,
+        "num_parts": assembly.num_parts,
+        "total_notes": assembly.total_notes,
     }
 
 
+def _load_snapshot(output_dir: Path) -> assembler.AssemblySnapshot:
+    if output_dir.suffix != BUNDLE_SUFFIX:
+        output_dir = output_dir / DEFAULT_BUNDLE_NAME
+    return ProjectBundle.open(output_dir).snapshot()
+
+
+def _assemble_snapshot(
+    snapshot: assembler.AssemblySnapshot,
+    preset: GenrePreset,
+    output_dir: Path,
+    formats: list[str],
+) -> assembler.AssemblyResult:
+    return assembler.assemble(
+        snapshot.parts,
+        tempo=snapshot.tempo,
+        key=snapshot.key,
+        time_signature=snapshot.time_signature,
+        output_dir=output_dir,
+        formats=formats,
+        level=preset.assembly.quantize_level,
+        swing=preset.assembly.swing_detection,
+        beat_times=snapshot.beat_times if preset.assembly.tempo_map else None,
+    )
+
+
+def _fit_deadline(
+    preset: GenrePreset,
+    route: str,
+    source: AudioSource,
+    parts: list[str],
+    deadline_seconds: float,
+    cost_model: budget.CostModel | None,
+    analysis_known: bool = False,
+) -> tuple[GenrePreset, tuple[str, ...]]:
+    plan = budget.fit_to_deadline(
+        preset,
+        route,
+        audio_duration(source),
+        parts,
+        deadline_seconds,
+        cost_model,
+        analysis_known,
+    )
+    return plan.preset, plan.degradations
+
+
 def _resolve_genre(genre: str) -> GenrePreset:
     return GENRE_PRESETS.get(genre, GENRE_PRESETS["pop"])
 
 
-def _map_route_b_stems(stems: dict[str, Path]) -> dict[str, Path]:
-    mapped: dict[str, Path] = {}
+def _map_route_b_stems(stems: dict[str, Path]) -> dict[str, AudioSource]:
+    mapped: dict[str, AudioSource] = {}
     for stem_name, stem_path in stems.items():
         part_name = _ROUTE_B_MAP.get(stem_name.lower(), stem_name.lower())
         mapped[part_name] = stem_path
     return mapped
 
 
-def _filter_parts(stems: dict[str, Path], parts: list[str]) -> dict[str, Path]:
+def _route_b_parts(parts: list[str]) -> list[str]:
+    """Parts the separated stems of a mix will provide."""
+    available = dict.fromkeys(_ROUTE_B_MAP.values())
+    return [part for part in available if not parts or part in parts]
+
+
+def _filter_parts(stems: dict[str, AudioSource], parts: list[str]) -> dict[str, AudioSource]:
     if not parts:
         return stems
     return {name: path for name, path in stems.items() if name.lower() in parts}
 
 
-def _select_analysis_stem(stems: dict[str, Path]) -> Path:
+def _select_analysis_stem(stems: dict[str, AudioSource]) -> AudioSource:
     if "lead_vocal" in stems:
         return stems["lead_vocal"]
     return next(iter(stems.values()))
 
-
-def _read_suno_tempo(input_dir: Path) -> float | None:
-    metadata_path = input_dir / "metadata.json"
-    if not metadata_path.exists():
-        return None
-    try:
-        payload = json.loads(metadata_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        logger.warning("Malformed Suno metadata: %s", metadata_path)
-        return None
-    if isinstance(payload, dict) and "tempo" in payload:
-        try:
-            return float(payload["tempo"])
-        except (TypeError, ValueError):
-            logger.warning("Invalid tempo in Suno metadata: %s", payload.get("tempo"))
-    return None
@@ -1,6 +1,7 @@
 """Input routing: Suno stems (Route A) vs full mix (Route B)."""
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 import logging
+import zipfile
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,25 @@ class InputRouter:
             if stems_dir.exists() and len(list(stems_dir.glob("*.wav"))) >= 3:
                 logger.info("Route A: Suno stems detected")
                 return "route_a"
+        is_zip = input_path.is_file() and input_path.suffix.lower() == ".zip"
+        if is_zip and _count_zipped_stems(input_path) >= 3:
+            logger.info("Route A: Suno stems archive detected")
+            return "route_a"
         if input_path.is_file() and input_path.suffix in (".mp3", ".wav", ".flac", ".ogg", ".m4a"):
             logger.info("Route B: Full mix")
             return "route_b"
         raise FileNotFoundError(f"No valid input at {input_path}")
+
+
+def _count_zipped_stems(archive_path: Path) -> int:
+    """Count WAV members in a stems/ folder using only the central directory."""
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            names = archive.namelist()
+    except (OSError, zipfile.BadZipFile):
+        logger.warning("Unreadable zip archive: %s", archive_path)
+        return 0
+    members = (PurePosixPath(name) for name in names)
+    return sum(
+        1 for member in members if member.parent.name == "stems" and member.suffix == ".wav"
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
-from stemscore.suno.importer import import_suno
+from stemscore.suno.importer import import_suno, probe_suno, read_suno_metadata
+from stemscore.suno.metadata import SunoMetadata
 
-__all__ = ["import_suno"]
+__all__ = ["SunoMetadata", "import_suno", "probe_suno", "read_suno_metadata"]
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 import json
 import logging
+import zipfile
+
+from stemscore.suno.metadata import SunoMetadata
+from stemscore.suno.validation import mix_stems, probe_stems
+from stemscore.utils.audio_io import ArchiveMember, AudioSource
 
 logger = logging.getLogger(__name__)
 
@@ -19,39 +24,182 @@ _PART_MAP = {
 }
 
 
-def import_suno(input_dir: Path) -> dict[str, Path]:
-    """Import Suno stems from an export directory.
+def import_suno(
+    input_path: Path, work_dir: Path | None = None, workers: int = 4
+) -> dict[str, AudioSource]:
+    """Import Suno stems from an export directory or zip archive.
+
+    Zipped exports are not extracted: stems are returned as ArchiveMember
+    handles that stream the WAV data out of the archive when read.
+
+    With ``work_dir``, every stem's header and a sampled level profile are
+    read concurrently; silent, empty and unreadable stems are dropped, and
+    parts fed by several stems (e.g. guitar and keys) are mixed down into
+    ``work_dir``. Without it, stems are not read and each part keeps a single
+    stem.
 
     Args:
-        input_dir: Suno export directory containing a stems/ subfolder.
+        input_path: Suno export directory containing a stems/ subfolder, or a
+            zip archive of one.
+        work_dir: Directory for mixdowns; enables stem validation.
+        workers: Threads used to probe stems.
 
     Returns:
-        Mapping of part name to WAV path.
+        Mapping of part name to WAV path or archive member.
 
     Raises:
-        FileNotFoundError: If no stems are found.
+        FileNotFoundError: If no (usable) stems are found.
     """
-    stems_dir = input_dir / "stems"
-    if not stems_dir.exists():
-        raise FileNotFoundError(f"Missing stems directory: {stems_dir}")
+    grouped = _collect_stems(input_path)
+    if work_dir is None:
+        stems = {part: sources[-1] for part, sources in grouped.items()}
+    else:
+        stems = _validate_stems(grouped, work_dir, workers)
+        if not stems:
+            raise FileNotFoundError(f"No usable stems found in {input_path}")
+    logger.info("Imported %s Suno stems", len(stems))
+    return stems
+
+
+def probe_suno(input_path: Path, workers: int = 4) -> dict[str, AudioSource]:
+    """List the stems ``import_suno`` would use with a work directory, writing nothing.
+
+    Stems are validated exactly as on import. A part fed by several usable
+    stems maps to the longest of them, which sets the length of its mixdown.
+
+    Args:
+        input_path: Suno export directory or zip archive.
+        workers: Threads used to probe stems.
+
+    Returns:
+        Mapping of part name to a representative WAV path or archive member.
+
+    Raises:
+        FileNotFoundError: If no (usable) stems are found.
+    """
+    stems = _validate_stems(_collect_stems(input_path), None, workers)
+    if not stems:
+        raise FileNotFoundError(f"No usable stems found in {input_path}")
+    return stems
 
-    _log_metadata(input_dir)
 
-    stems: dict[str, Path] = {}
-    for wav_path in stems_dir.glob("*.wav"):
-        part_name = _map_stem_name(wav_path.stem.lower())
+def _collect_stems(input_path: Path) -> dict[str, list[AudioSource]]:
+    """Group the export's stems by part, in file name order."""
+    if input_path.is_file() and input_path.suffix.lower() == ".zip":
+        try:
+            with zipfile.ZipFile(input_path) as archive:
+                names = archive.namelist()
+        except zipfile.BadZipFile as exc:
+            raise FileNotFoundError(f"Unreadable Suno archive: {input_path}") from exc
+        members = [PurePosixPath(name) for name in sorted(names)]
+        candidates: list[tuple[str, AudioSource]] = [
+            (member.stem, ArchiveMember(archive=input_path, member=str(member)))
+            for member in members
+            if member.parent.name == "stems" and member.suffix == ".wav"
+        ]
+    else:
+        stems_dir = input_path / "stems"
+        if not stems_dir.exists():
+            raise FileNotFoundError(f"Missing stems directory: {stems_dir}")
+        candidates = [(path.stem, path) for path in sorted(stems_dir.glob("*.wav"))]
+
+    grouped: dict[str, list[AudioSource]] = {}
+    for stem_name, source in candidates:
+        part_name = _map_stem_name(stem_name.lower())
         if part_name is None:
-            logger.info("Skipping unmapped stem: %s", wav_path.name)
+            logger.info("Skipping unmapped stem: %s", source.name)
             continue
-        stems[part_name] = wav_path
+        grouped.setdefault(part_name, []).append(source)
 
-    if not stems:
-        raise FileNotFoundError(f"No supported stems found in {stems_dir}")
+    if not grouped:
+        raise FileNotFoundError(f"No supported stems found in {input_path}")
+    return grouped
 
-    logger.info("Imported %s Suno stems", len(stems))
+
+def _validate_stems(
+    grouped: dict[str, list[AudioSource]], work_dir: Path | None, workers: int
+) -> dict[str, AudioSource]:
+    """Drop unusable stems and mix multi-stem parts into ``work_dir``.
+
+    Without a work directory nothing is mixed; such parts keep their longest
+    usable stem.
+    """
+    sources = [source for part_sources in grouped.values() for source in part_sources]
+    probes = dict(zip(map(str, sources), probe_stems(sources, workers=workers)))
+
+    stems: dict[str, AudioSource] = {}
+    for part, part_sources in grouped.items():
+        usable = []
+        for source in part_sources:
+            probe = probes[str(source)]
+            if probe.error is not None:
+                logger.warning("Skipping unreadable stem %s: %s", source, probe.error)
+            elif not probe.is_usable:
+                logger.info("Skipping silent stem %s", source)
+            else:
+                usable.append(probe)
+        if len(usable) == 1:
+            stems[part] = usable[0].source
+        elif usable and work_dir is None:
+            stems[part] = max(usable, key=lambda probe: probe.frames).source
+        elif usable and work_dir is not None:
+            try:
+                stems[part] = mix_stems(usable, work_dir / f"{part}.wav")
+            except ValueError as exc:
+                loudest = max(usable, key=lambda probe: probe.peak_rms_db)
+                logger.warning("Using only %s for %s: %s", loudest.source, part, exc)
+                stems[part] = loudest.source
     return stems
 
 
+def read_suno_metadata(input_path: Path) -> SunoMetadata:
+    """Read metadata.json from a Suno export directory or zip archive.
+
+    Returns:
+        Parsed metadata; fields are None when the file or the field is
+        missing or malformed.
+    """
+    metadata = SunoMetadata.from_payload(_read_metadata_payload(input_path))
+    logger.info(
+        "Suno metadata: tempo=%s key=%s time_signature=%s",
+        metadata.tempo,
+        metadata.key,
+        metadata.time_signature,
+    )
+    return metadata
+
+
+def _read_metadata_payload(input_path: Path) -> object:
+    if input_path.is_file() and input_path.suffix.lower() == ".zip":
+        try:
+            with zipfile.ZipFile(input_path) as archive:
+                name = _archive_metadata_name(archive.namelist())
+                if name is None:
+                    return None
+                raw = archive.read(name)
+        except (OSError, zipfile.BadZipFile):
+            logger.warning("Unreadable Suno archive: %s", input_path)
+            return None
+        source = f"{input_path}!{name}"
+    else:
+        metadata_path = input_path / "metadata.json"
+        if not metadata_path.exists():
+            return None
+        raw = metadata_path.read_bytes()
+        source = str(metadata_path)
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        logger.warning("Malformed Suno metadata: %s", source)
+        return None
+
+
+def _archive_metadata_name(names: list[str]) -> str | None:
+    """The metadata.json closest to the archive root."""
+    candidates = [name for name in names if PurePosixPath(name).name == "metadata.json"]
+    return min(candidates, key=lambda name: name.count("/"), default=None)
+
+
 def _map_stem_name(stem_name: str) -> str | None:
     if stem_name in _PART_MAP:
         return _PART_MAP[stem_name]
@@ -59,18 +207,3 @@ def _map_stem_name(stem_name: str) -> str | None:
         if key in stem_name:
             return value
     return None
-
-
-def _log_metadata(input_dir: Path) -> None:
-    metadata_path = input_dir / "metadata.json"
-    if not metadata_path.exists():
-        return
-    try:
-        payload = json.loads(metadata_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        logger.warning("Malformed Suno metadata: %s", metadata_path)
-        return
-
-    tempo = payload.get("tempo") if isinstance(payload, dict) else None
-    if tempo is not None:
-        logger.info("Suno metadata tempo: %s", tempo)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+_PITCH_CLASSES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+_SHARP_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+# Mode words match in any case ("A Minor"); the "m"/"M" abbreviations do not.
+_KEY_PATTERN = re.compile(
+    r"^\s*([A-Ga-g])\s*([#♯b♭]?)\s*((?i:major|minor|maj|min)|m|M)?\s*$"
+)
+_MINOR_MODES = {"minor", "min", "m"}
+
+
+@dataclass(frozen=True)
+class SunoMetadata:
+    """Musical attributes stated in a Suno export's metadata.json.
+
+    Fields are None when missing or unparseable. Keys use the analyzer's
+    spelling ("F# minor").
+    """
+
+    tempo: float | None = None
+    key: str | None = None
+    time_signature: int | None = None
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether analysis can be skipped entirely."""
+        return self.tempo is not None and self.key is not None and self.time_signature is not None
+
+    @classmethod
+    def from_payload(cls, payload: object) -> SunoMetadata:
+        """Parse a decoded metadata.json object, ignoring unusable fields."""
+        if not isinstance(payload, dict):
+            return cls()
+        return cls(
+            tempo=_parse_tempo(payload.get("tempo", payload.get("bpm"))),
+            key=_parse_key(payload.get("key")),
+            time_signature=_parse_time_signature(
+                payload.get("time_signature", payload.get("meter"))
+            ),
+        )
+
+
+def _parse_tempo(value: object) -> float | None:
+    if value is None:
+        return None
+    try:
+        tempo = float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        logger.warning("Invalid tempo in Suno metadata: %s", value)
+        return None
+    return tempo if tempo > 0 else None
+
+
+def _parse_key(value: object) -> str | None:
+    if value is None:
+        return None
+    match = _KEY_PATTERN.match(str(value))
+    if match is None:
+        logger.warning("Invalid key in Suno metadata: %s", value)
+        return None
+    letter, accidental, mode = match.groups()
+    pitch_class = _PITCH_CLASSES[letter.upper()]
+    if accidental in {"#", "♯"}:
+        pitch_class += 1
+    elif accidental in {"b", "♭"}:
+        pitch_class -= 1
+    # "Am" is minor but a bare "M" is major; a lowercase tonic also means minor.
+    if mode is not None and len(mode) > 1:
+        mode = mode.lower()
+    minor = mode in _MINOR_MODES or (mode is None and letter.islower())
+    return f"{_SHARP_NAMES[pitch_class % 12]} {'minor' if minor else 'major'}"
+
+
+def _parse_time_signature(value: object) -> int | None:
+    if value is None:
+        return None
+    numerator = str(value).split("/", 1)[0].strip()
+    if not numerator.isdigit() or int(numerator) <= 0:
+        logger.warning("Invalid time signature in Suno metadata: %s", value)
+        return None
+    return int(numerator)
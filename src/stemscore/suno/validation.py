@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+import logging
+
+import numpy as np
+
+from stemscore.utils.activity import DEFAULT_THRESHOLD_DB
+from stemscore.utils.audio_io import AudioSource, open_audio_source
+
+logger = logging.getLogger(__name__)
+
+# Blocks sampled evenly across a stem for its RMS profile.
+_PROBE_BLOCKS = 16
+_PROBE_BLOCK_SECONDS = 0.5
+# Frames per block when mixing stems down.
+_MIX_BLOCK_FRAMES = 1 << 16
+
+
+@dataclass(frozen=True)
+class StemProbe:
+    """Header fields and a sampled level profile of one stem."""
+
+    source: AudioSource
+    sample_rate: int = 0
+    channels: int = 0
+    frames: int = 0
+    peak_rms_db: float = -np.inf
+    error: str | None = None
+
+    @property
+    def is_silent(self) -> bool:
+        return self.peak_rms_db < DEFAULT_THRESHOLD_DB
+
+    @property
+    def is_usable(self) -> bool:
+        return self.error is None and self.frames > 0 and not self.is_silent
+
+
+def probe_stem(source: AudioSource) -> StemProbe:
+    """Read a stem's header and the RMS of blocks sampled across it.
+
+    Only ``_PROBE_BLOCKS`` short blocks are decoded, front to back, so the
+    probe stays cheap for long stems and streams from archives.
+
+    Args:
+        source: Stem file or archive member.
+
+    Returns:
+        StemProbe; unreadable or truncated files carry an error message.
+    """
+    import soundfile as sf  # lazy import for heavy deps
+
+    try:
+        with open_audio_source(source) as stream, sf.SoundFile(stream) as handle:
+            frames = int(handle.frames)
+            block = max(round(_PROBE_BLOCK_SECONDS * handle.samplerate), 1)
+            starts = np.linspace(0, max(frames - block, 0), _PROBE_BLOCKS).astype(int)
+            levels = [0.0]
+            for start in np.unique(starts).tolist():
+                expected = min(block, frames - start)
+                handle.seek(start)
+                samples = handle.read(expected, dtype="float32", always_2d=True)
+                if samples.shape[0] < expected:
+                    raise RuntimeError(f"truncated at frame {start + samples.shape[0]}")
+                if samples.size:
+                    levels.append(float(np.sqrt(np.mean(np.square(samples)))))
+            peak = 20.0 * np.log10(max(levels) + 1e-12)
+            return StemProbe(
+                source=source,
+                sample_rate=int(handle.samplerate),
+                channels=int(handle.channels),
+                frames=frames,
+                peak_rms_db=float(peak),
+            )
+    except (RuntimeError, OSError, ValueError, sf.SoundFileError) as exc:
+        return StemProbe(source=source, error=str(exc) or type(exc).__name__)
+
+
+def probe_stems(sources: Sequence[AudioSource], workers: int = 4) -> list[StemProbe]:
+    """Probe several stems concurrently; results are in input order."""
+    if not sources:
+        return []
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(sources)), 1)) as executor:
+        return list(executor.map(probe_stem, sources))
+
+
+def mix_stems(probes: Sequence[StemProbe], target: Path) -> Path:
+    """Sum stems into one file, reading and writing block by block.
+
+    Stems must share a sample rate. Mono stems are spread across all output
+    channels, and shorter stems are padded with silence. The mix is written
+    as 32-bit float WAV so summing never clips, then scaled down to full
+    scale if it peaks above it, so later fixed-point encodes do not clip.
+
+    Args:
+        probes: Usable probes of the stems to mix.
+        target: Output WAV path.
+
+    Returns:
+        The target path.
+
+    Raises:
+        ValueError: If the stems have different sample rates.
+    """
+    import soundfile as sf  # lazy import for heavy deps
+
+    rates = {probe.sample_rate for probe in probes}
+    if len(rates) != 1:
+        raise ValueError(f"Cannot mix stems with sample rates {sorted(rates)}")
+    channels = max(probe.channels for probe in probes)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        streams = [stack.enter_context(open_audio_source(probe.source)) for probe in probes]
+        handles = [stack.enter_context(sf.SoundFile(stream)) for stream in streams]
+        mixed = stack.enter_context(
+            sf.SoundFile(
+                str(target), "w", samplerate=rates.pop(), channels=channels, subtype="FLOAT"
+            )
+        )
+        total = max(probe.frames for probe in probes)
+        peak = 0.0
+        for start in range(0, total, _MIX_BLOCK_FRAMES):
+            length = min(_MIX_BLOCK_FRAMES, total - start)
+            block = np.zeros((length, channels), dtype=np.float32)
+            for handle in handles:
+                samples = handle.read(length, dtype="float32", always_2d=True)
+                block[: samples.shape[0]] += samples
+            if block.size:
+                peak = max(peak, float(np.abs(block).max()))
+            mixed.write(block)
+    if peak > 1.0:
+        _scale_in_place(target, 1.0 / peak)
+        logger.info("Scaled mix of %s by %.2f dB to avoid clipping", target, -20 * np.log10(peak))
+    logger.info("Mixed %s stems into %s", len(probes), target)
+    return target
+
+
+def _scale_in_place(path: Path, gain: float) -> None:
+    """Multiply a float WAV by ``gain`` block by block, rewriting it in place."""
+    import soundfile as sf  # lazy import for heavy deps
+
+    with sf.SoundFile(str(path), "r+") as handle:
+        for start in range(0, handle.frames, _MIX_BLOCK_FRAMES):
+            handle.seek(start)
+            block = handle.read(_MIX_BLOCK_FRAMES, dtype="float32", always_2d=True)
+            handle.seek(start)
+            handle.write(block * np.float32(gain))
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
-from pathlib import Path
 import logging
 
+from stemscore.analyzer.structure import RepeatedSection, SectionMap, confirm_repeats
 from stemscore.config import TranscriptionConfig
+from stemscore.transcriber.cache import DEFAULT_CACHE_DIR, CacheStats, TranscriptionCache
 from stemscore.transcriber.chord_recognizer import recognize_chords
 from stemscore.transcriber.drum_transcriber import transcribe_drums
-from stemscore.transcriber.pitch_transcriber import transcribe_pitch
+from stemscore.transcriber.pitch_transcriber import (
+    PitchBatchResult,
+    iter_pitch_notes,
+    transcribe_pitch,
+    transcribe_pitch_batch,
+)
+from stemscore.transcriber.postprocess import VOCAL_PARTS, postprocess_notes
+from stemscore.utils.audio_io import AudioSource, load_audio
 
 logger = logging.getLogger(__name__)
 
+_BEAT_DIVISIONS = {"beat": 1, "half_beat": 2}
+
 
 @dataclass(frozen=True)
 class TranscriptionResult:
@@ -21,20 +32,137 @@ class TranscriptionResult:
     method: str
 
 
-def transcribe_part(audio_path: Path, part: str, config: TranscriptionConfig) -> TranscriptionResult:
-    """Dispatch transcription based on part name."""
+def transcribe_part(
+    audio_path: AudioSource,
+    part: str,
+    config: TranscriptionConfig,
+    beat_times: Sequence[float] | None = None,
+    sections: SectionMap | None = None,
+    cache: TranscriptionCache | None = None,
+    tempo: float | None = None,
+) -> TranscriptionResult:
+    """Dispatch transcription based on part name.
+
+    Args:
+        audio_path: Path to the stem audio file.
+        part: Part name (e.g. "lead_vocal", "drums", "chords").
+        config: Transcription settings from the genre preset.
+        beat_times: Beat positions from analysis, used for beat-synchronous chords.
+        sections: Repeated sections from analysis. Melodic parts re-check
+            each repeat on their own stem, transcribe confirmed sections
+            once and copy their notes onto the repeats.
+        cache: Optional store of earlier results; a hit skips transcription.
+        tempo: Song tempo in BPM; scales the vocal melisma cutoff to the beat.
+
+    Returns:
+        TranscriptionResult with the part's note events.
+    """
     logger.info("Dispatching transcription for part %s", part)
     normalized = part.lower()
+    division = _BEAT_DIVISIONS.get(config.chord_sync)
+    use_beats = division is not None and bool(beat_times)
+    repeats = sections.repeats if sections is not None else ()
+    method = _method_for(normalized, config)
+    melisma_mode = config.melisma_mode if normalized in VOCAL_PARTS else "individual_notes"
+
+    key = None
+    if cache is not None:
+        key = cache.key(
+            audio_path,
+            part,
+            method,
+            config,
+            _cache_inputs(
+                method,
+                beat_times if use_beats else None,
+                repeats,
+                tempo if melisma_mode != "individual_notes" else None,
+            ),
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return TranscriptionResult(notes=cached, part_name=part, method=method)
+
     if normalized == "drums":
-        notes = transcribe_drums(audio_path, num_classes=config.drum_classes)
-        method = "onset_heuristic"
+        notes = transcribe_drums(
+            audio_path,
+            num_classes=config.drum_classes,
+            skip_silence=config.skip_silence,
+        )
     elif normalized in {"chords", "harmony"}:
-        notes = recognize_chords(audio_path)
-        method = "chroma_template"
+        notes = recognize_chords(
+            audio_path,
+            skip_silence=config.skip_silence,
+            beat_times=beat_times if use_beats else None,
+            beat_division=division or 1,
+            decoder="viterbi" if config.chord_model == "hmm" else "argmax",
+            transition_penalty=config.chord_transition_penalty,
+        )
     else:
-        notes = transcribe_pitch(audio_path, min_note_ms=config.vocal_min_note_ms)
-        method = "basic_pitch"
+        if sections is not None and repeats:
+            sections = confirm_repeats(*load_audio(audio_path), sections)
+            repeats = sections.repeats
+        # Length filtering happens after fragments are merged.
+        notes = transcribe_pitch(
+            audio_path,
+            min_note_ms=0,
+            skip_silence=config.skip_silence,
+            window_seconds=config.pitch_window_seconds,
+            backend=config.pitch_backend,
+            threads=config.pitch_threads,
+            exclude=[(section.start, section.end) for section in repeats],
+            workers=config.pitch_workers,
+            segment_seconds=config.pitch_segment_seconds,
+        )
+        if sections is not None and repeats:
+            notes = sections.replicate_notes(notes)
+        notes = postprocess_notes(
+            notes,
+            merge_gap_ms=config.merge_gap_ms,
+            min_note_ms=config.vocal_min_note_ms,
+            min_confidence=config.min_confidence,
+            min_velocity=config.min_velocity,
+            melisma_mode=melisma_mode,
+            melisma_max_ms=config.melisma_max_ms,
+            melisma_max_beats=config.melisma_max_beats,
+            tempo=tempo,
+        )
+
+    if cache is not None and key is not None:
+        cache.put(key, notes)
     return TranscriptionResult(notes=notes, part_name=part, method=method)
 
 
-__all__ = ["TranscriptionResult", "transcribe_part"]
+def _method_for(normalized: str, config: TranscriptionConfig) -> str:
+    if normalized == "drums":
+        return "onset_heuristic"
+    if normalized in {"chords", "harmony"}:
+        return "chroma_hmm" if config.chord_model == "hmm" else "chroma_template"
+    return "basic_pitch"
+
+
+def _cache_inputs(
+    method: str,
+    beat_times: Sequence[float] | None,
+    repeats: Sequence[RepeatedSection],
+    tempo: float | None = None,
+) -> object:
+    """Analysis results that change a method's output, as cache key input."""
+    if method.startswith("chroma") and beat_times:
+        return [float(time) for time in beat_times]
+    if method == "basic_pitch":
+        sections = [[section.start, section.end, section.source_start] for section in repeats]
+        return {"repeats": sections, "tempo": tempo} if tempo else sections
+    return None
+
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "CacheStats",
+    "PitchBatchResult",
+    "TranscriptionCache",
+    "TranscriptionResult",
+    "iter_pitch_notes",
+    "transcribe_part",
+    "transcribe_pitch_batch",
+]
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from stemscore.config import TranscriptionConfig
+from stemscore.utils.audio_io import ArchiveMember, AudioSource
+from stemscore.utils.columns import columns_to_notes, notes_to_columns
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "stemscore" / "transcriptions"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# TranscriptionConfig fields that change each method's output. Execution
+# settings such as thread and worker counts are deliberately left out.
+_KEY_FIELDS: dict[str, tuple[str, ...]] = {
+    "onset_heuristic": ("drum_classes", "skip_silence"),
+    "chroma_template": ("chord_model", "chord_sync", "skip_silence"),
+    "chroma_hmm": ("chord_model", "chord_sync", "chord_transition_penalty", "skip_silence"),
+    "basic_pitch": (
+        "vocal_min_note_ms",
+        "melisma_mode",
+        "melisma_max_ms",
+        "melisma_max_beats",
+        "merge_gap_ms",
+        "min_confidence",
+        "min_velocity",
+        "skip_silence",
+        "pitch_window_seconds",
+        "pitch_backend",
+        "pitch_segment_seconds",
+    ),
+}
+# Bumped whenever the stored layout or a transcriber's output changes.
+_FORMAT_VERSION = 1
+_HASH_CHUNK_BYTES = 1 << 20
+_COUNT_COLUMN = "__count__"
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters for one cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TranscriptionCache:
+    """Persistent, size-bounded store of per-part transcription output.
+
+    Entries are keyed by stem content, part, method and the config fields
+    that affect that method, and stored as one uncompressed ``.npz`` file of
+    note columns each. When the directory grows past ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(
+        self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._stats = CacheStats()
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
+
+    def key(
+        self,
+        audio_path: AudioSource,
+        part: str,
+        method: str,
+        config: TranscriptionConfig,
+        extra: object = None,
+    ) -> str:
+        """Build the cache key for one transcription.
+
+        Args:
+            audio_path: Stem audio file or archive member; its content is
+                hashed, not its path.
+            part: Part name.
+            method: Transcription method name.
+            config: Transcription settings.
+            extra: Any other JSON-serializable input that affects the output
+                (beat grid, repeated sections).
+
+        Returns:
+            Hex digest identifying the entry.
+        """
+        fields = {name: getattr(config, name) for name in _KEY_FIELDS.get(method, ())}
+        payload = json.dumps(
+            [_FORMAT_VERSION, self._content_digest(audio_path), part.lower(), method, fields, extra],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> list[dict] | None:
+        """Return cached notes for a key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as columns:
+                count = int(columns[_COUNT_COLUMN])
+                notes = columns_to_notes(
+                    {name: columns[name] for name in columns.files if name != _COUNT_COLUMN},
+                    count,
+                )
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            self._record(misses=1)
+            return None
+        self._record(hits=1)
+        logger.info("Transcription cache hit %s", key[:12])
+        return notes
+
+    def put(self, key: str, notes: Sequence[dict]) -> None:
+        """Store notes for a key and evict old entries beyond the size bound."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        columns = notes_to_columns(notes)
+        columns[_COUNT_COLUMN] = np.array(len(notes))
+        partial = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with partial.open("wb") as handle:
+                np.savez(handle, **columns)  # type: ignore[arg-type]
+            os.replace(partial, path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Could not cache transcription %s: %s", key[:12], exc)
+            partial.unlink(missing_ok=True)
+            return
+        self._record(stores=1)
+        self._evict()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def _content_digest(self, audio_path: AudioSource) -> str:
+        # Archive members are identified by the archive they are read from.
+        if isinstance(audio_path, ArchiveMember):
+            stat = audio_path.archive.stat()
+            identity = (str(audio_path), stat.st_size, stat.st_mtime_ns)
+        else:
+            stat = audio_path.stat()
+            identity = (str(audio_path.resolve()), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(identity)
+        if digest is None:
+            hasher = hashlib.sha256()
+            opened = audio_path.open() if isinstance(audio_path, ArchiveMember) else audio_path.open("rb")
+            with opened as handle:
+                for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._digests[identity] = digest
+        return digest
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        if evicted:
+            self._record(evictions=evicted)
+            logger.info("Evicted %s transcription cache entries", evicted)
+
+    def _record(self, hits: int = 0, misses: int = 0, stores: int = 0, evictions: int = 0) -> None:
+        with self._lock:
+            stats = self._stats
+            self._stats = CacheStats(
+                hits=stats.hits + hits,
+                misses=stats.misses + misses,
+                stores=stats.stores + stores,
+                evictions=stats.evictions + evictions,
+            )
+
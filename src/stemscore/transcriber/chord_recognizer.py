@@ -1,23 +1,42 @@
 from __future__ import annotations
 
-from pathlib import Path
+from collections.abc import Sequence
+from types import ModuleType
 import logging
 
 import numpy as np
 
-from stemscore.utils.audio_io import load_audio
+from stemscore.utils.activity import detect_activity
+from stemscore.utils.audio_io import AudioSource, load_audio
 from stemscore.utils.exceptions import TranscriptionError
 
 logger = logging.getLogger(__name__)
 
 PITCH_CLASS_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 
+_HOP_LENGTH = 512
 
-def recognize_chords(audio_path: Path) -> list[dict]:
+
+def recognize_chords(
+    audio_path: AudioSource,
+    skip_silence: bool = False,
+    beat_times: Sequence[float] | None = None,
+    beat_division: int = 1,
+    decoder: str = "argmax",
+    transition_penalty: float = 0.5,
+) -> list[dict]:
     """Recognize chord changes using chroma template matching.
 
     Args:
         audio_path: Path to the input audio file.
+        skip_silence: Only analyze active regions of the stem.
+        beat_times: Beat positions in seconds. When given, chroma is averaged
+            per beat before template scoring and chords change on the grid.
+        beat_division: Segments per beat when beat-synchronous (2 = half-beats).
+        decoder: "argmax" labels each frame independently; "viterbi" decodes
+            the most likely chord sequence with a penalty on chord changes.
+        transition_penalty: Score a chord change must overcome when decoding
+            with "viterbi".
 
     Returns:
         List of chord event dictionaries.
@@ -28,44 +47,36 @@ def recognize_chords(audio_path: Path) -> list[dict]:
     logger.info("Recognizing chords for %s", audio_path)
     if not audio_path.exists():
         raise TranscriptionError(f"Input audio not found: {audio_path}")
+    if decoder not in {"argmax", "viterbi"}:
+        raise TranscriptionError(f"Unknown chord decoder: {decoder}")
 
     try:
         import librosa  # lazy import for heavy deps
 
         audio, sr = load_audio(audio_path)
-        chroma = librosa.feature.chroma_cqt(y=audio, sr=sr)
-        if chroma.size == 0:
-            return []
-
-        templates = _build_templates()
-        labels = list(templates.keys())
-        template_matrix = np.stack([templates[label] for label in labels], axis=0)
-
-        norm_chroma = chroma / (np.linalg.norm(chroma, axis=0, keepdims=True) + 1e-6)
-        scores = template_matrix @ norm_chroma
-        best_indices = np.argmax(scores, axis=0)
-        best_labels = [labels[idx] for idx in best_indices]
+        if skip_silence:
+            activity = detect_activity(audio, sr)
+            if activity.is_silent:
+                logger.info("Skipping silent stem %s", audio_path)
+                return []
+            segments = activity.sample_ranges(sr)
+        else:
+            segments = [(0, audio.shape[0])]
 
-        hop_length = 512
-        frame_times = librosa.frames_to_time(np.arange(chroma.shape[1] + 1), sr=sr, hop_length=hop_length)
+        grid = _beat_grid(beat_times, beat_division) if beat_times is not None else None
 
         events: list[dict] = []
-        current_label = best_labels[0]
-        start_time = float(frame_times[0])
-        for frame_idx in range(1, len(best_labels)):
-            if best_labels[frame_idx] != current_label:
-                end_time = float(frame_times[frame_idx])
-                events.append({"start": start_time, "end": end_time, "chord": current_label})
-                current_label = best_labels[frame_idx]
-                start_time = float(frame_times[frame_idx])
-
-        events.append(
-            {
-                "start": start_time,
-                "end": float(frame_times[-1]),
-                "chord": current_label,
-            }
-        )
+        for start, end in segments:
+            events.extend(
+                _segment_events(
+                    librosa,
+                    audio[start:end],
+                    sr,
+                    start / sr,
+                    grid,
+                    transition_penalty if decoder == "viterbi" else None,
+                )
+            )
 
         logger.info("Recognized %s chord segments for %s", len(events), audio_path)
         return events
@@ -76,6 +87,112 @@ def recognize_chords(audio_path: Path) -> list[dict]:
         raise TranscriptionError("Chord recognition failed") from exc
 
 
+def _segment_events(
+    librosa: ModuleType,
+    audio: np.ndarray,
+    sr: int,
+    offset: float,
+    grid: np.ndarray | None,
+    transition_penalty: float | None,
+) -> list[dict]:
+    chroma = librosa.feature.chroma_cqt(y=audio, sr=sr)
+    if chroma.size == 0:
+        return []
+
+    frame_times = librosa.frames_to_time(
+        np.arange(chroma.shape[1] + 1), sr=sr, hop_length=_HOP_LENGTH
+    )
+    frame_times = np.asarray(frame_times, dtype=float) + offset
+    if grid is not None:
+        chroma, frame_times = _sync_to_grid(chroma, frame_times, grid)
+
+    norm_chroma = chroma / (np.linalg.norm(chroma, axis=0, keepdims=True) + 1e-6)
+    scores = _TEMPLATE_MATRIX @ norm_chroma
+    if transition_penalty is None:
+        best_indices = np.argmax(scores, axis=0)
+    else:
+        best_indices = _viterbi_path(scores, transition_penalty)
+    return _label_runs(best_indices, frame_times)
+
+
+def _viterbi_path(scores: np.ndarray, penalty: float) -> np.ndarray:
+    """Decode the best chord sequence under a uniform chord-change penalty.
+
+    Template scores act as log-domain emissions. Staying on a chord is free
+    and moving to any other chord costs ``penalty``, so the best predecessor
+    of every state is either itself or the single best state of the previous
+    frame. Each step is therefore O(states) and the decode is O(frames x
+    states) instead of the O(frames x states^2) of a dense transition matrix.
+
+    Args:
+        scores: Template scores of shape (n_states, n_frames).
+        penalty: Log-score cost of a chord change.
+
+    Returns:
+        Best state index per frame.
+    """
+    n_states, n_frames = scores.shape
+    delta = scores[:, 0].astype(float)
+    switched = np.zeros((n_frames, n_states), dtype=bool)
+    best_prev = np.zeros(n_frames, dtype=int)
+    for frame in range(1, n_frames):
+        best = int(np.argmax(delta))
+        jump = delta[best] - penalty
+        np.greater(jump, delta, out=switched[frame])
+        best_prev[frame] = best
+        delta = np.maximum(delta, jump) + scores[:, frame]
+
+    # Runs of a state end where it was entered by a jump; walk back run by run.
+    path = np.empty(n_frames, dtype=int)
+    state = int(np.argmax(delta))
+    end = n_frames
+    while end > 0:
+        entries = np.flatnonzero(switched[1:end, state]) + 1
+        start = int(entries[-1]) if entries.size else 0
+        path[start:end] = state
+        state = int(best_prev[start])
+        end = start
+    return path
+
+
+def _label_runs(label_indices: np.ndarray, frame_times: np.ndarray) -> list[dict]:
+    """Collapse per-frame template indices into chord segments."""
+    changes = np.flatnonzero(np.diff(label_indices)) + 1
+    run_starts = np.concatenate(([0], changes))
+    run_ends = np.concatenate((changes, [label_indices.shape[0]]))
+    return [
+        {"start": start, "end": end, "chord": _TEMPLATE_LABELS[idx]}
+        for start, end, idx in zip(
+            frame_times[run_starts].tolist(),
+            frame_times[run_ends].tolist(),
+            label_indices[run_starts].tolist(),
+        )
+    ]
+
+
+def _beat_grid(beat_times: Sequence[float], beat_division: int) -> np.ndarray:
+    beats = np.unique(np.asarray(beat_times, dtype=float))
+    if beat_division <= 1 or beats.size < 2:
+        return beats
+    steps = np.arange(beat_division) / beat_division
+    subdivided = beats[:-1, None] + np.diff(beats)[:, None] * steps[None, :]
+    return np.concatenate((subdivided.ravel(), beats[-1:]))
+
+
+def _sync_to_grid(
+    chroma: np.ndarray, frame_times: np.ndarray, grid: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Average chroma frames between grid lines; returns chroma and boundary times."""
+    n_frames = chroma.shape[1]
+    boundaries = np.searchsorted(frame_times[:n_frames], grid)
+    inside = boundaries[(boundaries > 0) & (boundaries < n_frames)]
+    boundaries = np.unique(np.concatenate(([0], inside)))
+    sums = np.add.reduceat(chroma, boundaries, axis=1)
+    counts = np.diff(np.concatenate((boundaries, [n_frames])))
+    edges = np.concatenate((frame_times[boundaries], frame_times[-1:]))
+    return sums / counts[None, :], edges
+
+
 def _build_templates() -> dict[str, np.ndarray]:
     templates: dict[str, np.ndarray] = {}
     for root_idx, root_name in enumerate(PITCH_CLASS_NAMES):
@@ -90,3 +207,8 @@ def _template(root_idx: int, intervals: list[int]) -> np.ndarray:
     for interval in intervals:
         vector[(root_idx + interval) % 12] = 1.0
     return vector / (np.linalg.norm(vector) + 1e-6)
+
+
+_TEMPLATES = _build_templates()
+_TEMPLATE_LABELS = list(_TEMPLATES)
+_TEMPLATE_MATRIX = np.stack([_TEMPLATES[label] for label in _TEMPLATE_LABELS], axis=0)
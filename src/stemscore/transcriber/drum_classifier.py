@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# STFT geometry matching librosa's feature defaults.
+N_FFT = 2048
+HOP_LENGTH = 512
+# Frames after the onset used to measure decay (~93 ms at 22.05 kHz).
+DECAY_FRAMES = 4
+
+BANDS: dict[str, tuple[float, float]] = {
+    "sub": (20.0, 100.0),
+    "low": (100.0, 250.0),
+    "mid": (250.0, 2000.0),
+    "high": (2000.0, 6000.0),
+    "air": (6000.0, 16000.0),
+}
+FEATURE_NAMES = (*BANDS, "decay_sub", "decay_low", "decay_high", "decay_air", "level_db")
+
+# Each drum label falls back along its chain to the first GM note the kit has.
+LABEL_NOTES: dict[str, tuple[int, ...]] = {
+    "kick": (36,),
+    "snare": (38,),
+    "side_stick": (37, 38),
+    "closed_hat": (42,),
+    "pedal_hat": (44, 42),
+    "open_hat": (46, 42),
+    "low_tom": (41, 45, 38),
+    "high_tom": (48, 45, 41, 38),
+    "crash": (49, 57, 46, 42),
+    "ride": (51, 49, 42),
+    "ride_bell": (53, 51, 49, 42),
+}
+LABELS = tuple(LABEL_NOTES)
+
+_NINE_PIECE = [36, 38, 42, 46, 41, 45, 49, 51, 57]
+_THIRTEEN_PIECE_EXTRAS = [37, 44, 48, 53]
+
+_ONSET_BLOCK = 512
+
+# Onsets quieter than this (relative to the loudest) are not classified.
+_MIN_LEVEL_DB = -60.0
+
+
+def gm_note_classes(num_classes: int) -> list[int]:
+    """GM percussion notes available for a 9- or 13-piece kit mapping."""
+    if num_classes <= 0:
+        return [36]
+    full = _NINE_PIECE + _THIRTEEN_PIECE_EXTRAS
+    if num_classes <= len(full):
+        return full[:num_classes]
+    return full + [42] * (num_classes - len(full))
+
+
+def onset_features(audio: np.ndarray, sr: int, onset_frames: np.ndarray) -> np.ndarray:
+    """Build the per-onset feature matrix from one batched STFT gather.
+
+    Only the STFT frames at each onset and its decay frames are computed,
+    all in a single rfft call.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        onset_frames: Onset positions in hops of ``HOP_LENGTH`` samples.
+
+    Returns:
+        Array of shape (n_onsets, len(FEATURE_NAMES)). Band columns are the
+        attack energy in each band in dB relative to the onset's total;
+        decay columns are the energy ratio between the decay frame and the
+        attack; level_db is the total attack energy in dB.
+    """
+    onset_frames = np.asarray(onset_frames, dtype=int)
+    if onset_frames.size == 0:
+        return np.zeros((0, len(FEATURE_NAMES)), dtype=float)
+
+    offsets = np.array([0, 1, DECAY_FRAMES], dtype=int)
+    starts = (onset_frames[:, None] + offsets[None, :]) * HOP_LENGTH
+    needed = int(starts.max()) + N_FFT
+    padded = np.zeros(max(needed, audio.shape[0] + N_FFT), dtype=np.float32)
+    padded[N_FFT // 2 : N_FFT // 2 + audio.shape[0]] = audio
+
+    window = np.hanning(N_FFT + 1)[:-1].astype(np.float32)
+    freqs = np.fft.rfftfreq(N_FFT, d=1.0 / sr)
+    band_masks = np.stack(
+        [(freqs >= lo) & (freqs < hi) for lo, hi in BANDS.values()], axis=1
+    ).astype(np.float32)
+
+    # (n_onsets, n_offsets, n_bands); blocks bound the frame buffer on busy stems.
+    band_energy = np.empty((onset_frames.size, offsets.size, len(BANDS)), dtype=np.float64)
+    sample_idx = np.arange(N_FFT)[None, None, :]
+    for lo in range(0, onset_frames.size, _ONSET_BLOCK):
+        block = starts[lo : lo + _ONSET_BLOCK]
+        frames = padded[block[:, :, None] + sample_idx] * window
+        power = np.abs(np.fft.rfft(frames, axis=-1)) ** 2
+        band_energy[lo : lo + _ONSET_BLOCK] = power @ band_masks
+
+    attack = band_energy[:, :2, :].max(axis=1)
+    decay = band_energy[:, 2, :]
+    total = attack.sum(axis=1, keepdims=True) + 1e-12
+    relative_db = 10.0 * np.log10(attack / total + 1e-12)
+    decay_ratio = decay / (attack + 1e-12)
+    level_db = 10.0 * np.log10(total)
+
+    # Decay columns skip the mid band, which mixes snare body and tom overtones.
+    features: np.ndarray = np.concatenate(
+        [relative_db, decay_ratio[:, :2], decay_ratio[:, 3:], level_db], axis=1
+    )
+    return features
+
+
+def classify_onsets(features: np.ndarray, num_classes: int = 9) -> tuple[np.ndarray, np.ndarray]:
+    """Classify onsets into drum hits; one onset may produce several hits.
+
+    Args:
+        features: Matrix from ``onset_features``.
+        num_classes: Kit size (9 or 13 GM classes).
+
+    Returns:
+        Tuple of (onset_indices, gm_notes) arrays, one entry per hit.
+    """
+    if features.shape[0] == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    col = {name: features[:, idx] for idx, name in enumerate(FEATURE_NAMES)}
+    sub, low, mid, high, air = col["sub"], col["low"], col["mid"], col["high"], col["air"]
+    decay_sub, decay_low = col["decay_sub"], col["decay_low"]
+    decay_high, decay_air = col["decay_high"], col["decay_air"]
+    audible = col["level_db"] > (col["level_db"].max() + _MIN_LEVEL_DB)
+
+    hits = np.zeros((features.shape[0], len(LABELS)), dtype=bool)
+    label_idx = {label: idx for idx, label in enumerate(LABELS)}
+
+    hits[:, label_idx["kick"]] = (sub >= -6.0) & (decay_sub < 0.8)
+    tom = (low >= -3.0) & (decay_low >= 0.4) & (mid < -15.0)
+    hits[:, label_idx["low_tom"]] = tom & (sub >= -18.0)
+    hits[:, label_idx["high_tom"]] = tom & (sub < -18.0)
+
+    # Snares are broadband: a pitched body plus noise reaching the high band.
+    snare = (mid >= -15.0) & (high >= -12.0) & (air - mid < 15.0) & (decay_low < 0.4)
+    side_stick = snare & (decay_high < 0.1) & (high < -10.0)
+    hits[:, label_idx["snare"]] = snare & ~side_stick
+    hits[:, label_idx["side_stick"]] = side_stick
+
+    bright = (air >= -10.0) & (air - mid >= 15.0)
+    short = decay_air < 0.3
+    hits[:, label_idx["closed_hat"]] = bright & short
+    pedal = (air >= -10.0) & (air - mid >= 5.0) & ~bright & ~snare & short
+    hits[:, label_idx["pedal_hat"]] = pedal
+    hits[:, label_idx["open_hat"]] = bright & (decay_air >= 0.3) & (decay_air < 0.7)
+    sustained = bright & (decay_air >= 0.7)
+    hits[:, label_idx["crash"]] = sustained & (air >= high)
+    hits[:, label_idx["ride"]] = sustained & (air < high)
+    hits[:, label_idx["ride_bell"]] = (high >= -3.0) & (air < -6.0) & (decay_high >= 0.7)
+
+    # Every audible onset yields at least its dominant band's instrument.
+    fallback = np.array(
+        [label_idx[name] for name in ("kick", "low_tom", "snare", "ride", "closed_hat")]
+    )
+    empty = ~hits.any(axis=1)
+    dominant = np.argmax(features[:, : len(BANDS)], axis=1)
+    hits[np.flatnonzero(empty), fallback[dominant[empty]]] = True
+    hits &= audible[:, None]
+
+    available = gm_note_classes(num_classes)
+    lookup = np.array([_resolve_note(LABEL_NOTES[label], available) for label in LABELS])
+    onset_idx, label_hits = np.nonzero(hits)
+    notes = lookup[label_hits]
+
+    # Labels that fall back to the same note must not double-trigger it.
+    keys = np.unique(onset_idx * 128 + notes)
+    return keys // 128, keys % 128
+
+
+def _resolve_note(chain: tuple[int, ...], available: list[int]) -> int:
+    for note in chain:
+        if note in available:
+            return note
+    return available[0]
@@ -1,22 +1,31 @@
 from __future__ import annotations
 
-from pathlib import Path
+from types import ModuleType
 import logging
 
 import numpy as np
 
-from stemscore.utils.audio_io import load_audio
+from stemscore.transcriber.drum_classifier import classify_onsets, onset_features
+from stemscore.utils.activity import detect_activity
+from stemscore.utils.audio_io import AudioSource, load_audio
 from stemscore.utils.exceptions import TranscriptionError
 
 logger = logging.getLogger(__name__)
 
 
-def transcribe_drums(audio_path: Path, num_classes: int = 9) -> list[dict]:
-    """Transcribe drum hits using onset detection and spectral heuristics.
+def transcribe_drums(
+    audio_path: AudioSource,
+    num_classes: int = 9,
+    skip_silence: bool = False,
+) -> list[dict]:
+    """Transcribe drum hits using onset detection and multi-band classification.
+
+    Each onset may produce several simultaneous hits (e.g. kick and hi-hat).
 
     Args:
         audio_path: Path to the input audio file.
-        num_classes: Number of drum classes to map into GM MIDI notes.
+        num_classes: Number of drum classes to map into GM MIDI notes (9 or 13).
+        skip_silence: Only analyze active regions of the stem.
 
     Returns:
         List of drum event dictionaries.
@@ -32,32 +41,32 @@ def transcribe_drums(audio_path: Path, num_classes: int = 9) -> list[dict]:
         import librosa  # lazy import for heavy deps
 
         audio, sr = load_audio(audio_path)
-        onset_env = librosa.onset.onset_strength(y=audio, sr=sr)
-        onset_frames = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr)
-        if len(onset_frames) == 0:
-            logger.info("No drum onsets detected for %s", audio_path)
-            return []
-
-        times = librosa.frames_to_time(onset_frames, sr=sr)
-        centroid = librosa.feature.spectral_centroid(y=audio, sr=sr)
-
-        max_env = float(np.max(onset_env)) if onset_env.size else 1.0
-        gm_notes = _gm_note_classes(num_classes)
+        if skip_silence:
+            activity = detect_activity(audio, sr)
+            if activity.is_silent:
+                logger.info("Skipping silent stem %s", audio_path)
+                return []
+            segments = activity.sample_ranges(sr)
+        else:
+            segments = [(0, audio.shape[0])]
+
+        envelopes = [
+            librosa.onset.onset_strength(y=audio[start:end], sr=sr) for start, end in segments
+        ]
+        max_env = max((float(np.max(env)) for env in envelopes if env.size), default=1.0)
 
         events: list[dict] = []
-        for frame, time_sec in zip(onset_frames, times):
-            frame_idx = min(frame, centroid.shape[1] - 1)
-            centroid_hz = float(centroid[0, frame_idx])
-            pitch = _map_centroid_to_gm(centroid_hz, gm_notes)
-            velocity = _velocity_from_env(onset_env, frame, max_env)
-            events.append(
-                {
-                    "start": float(time_sec),
-                    "pitch": int(pitch),
-                    "velocity": int(velocity),
-                }
+        for (start, end), onset_env in zip(segments, envelopes):
+            events.extend(
+                _segment_events(
+                    librosa, audio[start:end], sr, onset_env, max_env, num_classes, start / sr
+                )
             )
 
+        if not events:
+            logger.info("No drum onsets detected for %s", audio_path)
+            return []
+
         logger.info("Transcribed %s drum hits for %s", len(events), audio_path)
         return events
     except TranscriptionError:
@@ -67,26 +76,38 @@ def transcribe_drums(audio_path: Path, num_classes: int = 9) -> list[dict]:
         raise TranscriptionError("Drum transcription failed") from exc
 
 
-def _gm_note_classes(num_classes: int) -> list[int]:
-    base = [36, 38, 42, 46, 41, 45, 49, 51, 57]
-    if num_classes <= 0:
-        return [36]
-    if num_classes <= len(base):
-        return base[:num_classes]
-    return base + [42] * (num_classes - len(base))
-
-
-def _map_centroid_to_gm(centroid_hz: float, gm_notes: list[int]) -> int:
-    if len(gm_notes) == 1:
-        return gm_notes[0]
-    normalized = min(max(centroid_hz / 5000.0, 0.0), 0.999)
-    index = int(normalized * len(gm_notes))
-    return gm_notes[index]
-
-
-def _velocity_from_env(onset_env: np.ndarray, frame: int, max_env: float) -> int:
+def _segment_events(
+    librosa: ModuleType,
+    audio: np.ndarray,
+    sr: int,
+    onset_env: np.ndarray,
+    max_env: float,
+    num_classes: int,
+    offset: float,
+) -> list[dict]:
+    onset_frames = np.asarray(
+        librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr), dtype=int
+    )
+    if onset_frames.size == 0:
+        return []
+
+    times = np.asarray(librosa.frames_to_time(onset_frames, sr=sr), dtype=float) + offset
+    velocities = _velocities_from_env(onset_env, onset_frames, max_env)
+    features = onset_features(audio, sr, onset_frames)
+    onset_idx, pitches = classify_onsets(features, num_classes)
+
+    return [
+        {"start": start, "pitch": pitch, "velocity": velocity}
+        for start, pitch, velocity in zip(
+            times[onset_idx].tolist(), pitches.tolist(), velocities[onset_idx].tolist()
+        )
+    ]
+
+
+def _velocities_from_env(onset_env: np.ndarray, frames: np.ndarray, max_env: float) -> np.ndarray:
     if onset_env.size == 0 or max_env <= 0:
-        return 80
-    value = float(onset_env[min(frame, onset_env.shape[0] - 1)])
-    normalized = min(max(value / max_env, 0.0), 1.0)
-    return int(1 + normalized * 126)
+        return np.full(frames.shape, 80, dtype=int)
+    values = onset_env[np.minimum(frames, onset_env.shape[0] - 1)]
+    normalized = np.clip(values / max_env, 0.0, 1.0)
+    velocities: np.ndarray = (1 + normalized * 126).astype(int)
+    return velocities
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import logging
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from stemscore.utils.audio_io import ArchiveMember, AudioSource, load_audio, save_audio
+from stemscore.utils.exceptions import TranscriptionError
+
+logger = logging.getLogger(__name__)
+
+# Inference settings mirrored from basic_pitch.inference.predict defaults.
+_N_OVERLAPPING_FRAMES = 30
+_ONSET_THRESHOLD = 0.5
+_FRAME_THRESHOLD = 0.3
+_MIN_NOTE_FRAMES = 11
+
+BACKENDS = ("tensorflow", "onnx")
+
+# Output tensor names of the exported Basic Pitch ONNX graph.
+_ONNX_OUTPUTS = {
+    "note": "StatefulPartitionedCall:1",
+    "onset": "StatefulPartitionedCall:2",
+    "contour": "StatefulPartitionedCall:0",
+}
+
+_SESSIONS: dict[tuple[str, int], PitchModelSession] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+@dataclass
+class PitchModelSession:
+    """A Basic Pitch model loaded once and shared across calls and jobs."""
+
+    model: object | None
+    backend: str = "tensorflow"
+    load_seconds: float = 0.0
+
+    @property
+    def supports_arrays(self) -> bool:
+        """Whether the model can run on in-memory audio windows."""
+        return self.model is not None and hasattr(self.model, "predict")
+
+    def predict_path(self, audio_path: AudioSource) -> list[object]:
+        """Run Basic Pitch on a file and return its raw note events."""
+        if isinstance(self.model, OnnxPitchModel) or isinstance(audio_path, ArchiveMember):
+            # Basic Pitch only reads from the filesystem; decode archive members here.
+            audio, sr = load_audio(audio_path)
+            return self.predict_audio_batch([audio], sr)[0]
+
+        from basic_pitch.inference import predict  # lazy import for heavy deps
+
+        if self.model is None:
+            result = predict(str(audio_path))
+        else:
+            result = predict(str(audio_path), self.model)
+        return extract_note_events(result)
+
+    def predict_audio_batch(self, audios: list[np.ndarray], sr: int) -> list[list[object]]:
+        """Transcribe several audio buffers with a single batched model call.
+
+        Args:
+            audios: Mono audio buffers.
+            sr: Sample rate shared by all buffers.
+
+        Returns:
+            Raw note events for each buffer, in input order.
+        """
+        if not audios:
+            return []
+        if not self.supports_arrays:
+            return self._predict_via_files(audios, sr)
+
+        from basic_pitch.constants import (
+            ANNOT_N_FRAMES,
+            AUDIO_N_SAMPLES,
+            AUDIO_SAMPLE_RATE,
+            FFT_HOP,
+        )
+        from basic_pitch.note_creation import model_output_to_notes
+
+        overlap_len = _N_OVERLAPPING_FRAMES * FFT_HOP
+        hop_size = AUDIO_N_SAMPLES - overlap_len
+
+        resampled = [_resample(audio, sr, AUDIO_SAMPLE_RATE) for audio in audios]
+        windowed = [
+            _window_audio(audio, AUDIO_N_SAMPLES, hop_size, overlap_len) for audio in resampled
+        ]
+        counts = [windows.shape[0] for windows in windowed]
+        batch = np.concatenate(windowed, axis=0)
+
+        output = self.model.predict(batch)  # type: ignore[union-attr]
+
+        results: list[list[object]] = []
+        boundaries = np.cumsum([0, *counts])
+        # Model frames per input sample, as in basic_pitch.inference.
+        frames_per_sample = ANNOT_N_FRAMES / AUDIO_N_SAMPLES
+        for index, audio in enumerate(resampled):
+            lo, hi = int(boundaries[index]), int(boundaries[index + 1])
+            n_frames = int(np.floor(audio.shape[0] * frames_per_sample))
+            unwrapped = {
+                name: _unwrap_output(np.asarray(values)[lo:hi], n_frames)
+                for name, values in output.items()
+            }
+            _, note_events = model_output_to_notes(
+                unwrapped,
+                onset_thresh=_ONSET_THRESHOLD,
+                frame_thresh=_FRAME_THRESHOLD,
+                min_note_len=_MIN_NOTE_FRAMES,
+            )
+            results.append(list(note_events))
+        return results
+
+    def _predict_via_files(self, audios: list[np.ndarray], sr: int) -> list[list[object]]:
+        results: list[list[object]] = []
+        with tempfile.TemporaryDirectory(prefix="stemscore_pitch_") as tmp_dir:
+            for index, audio in enumerate(audios):
+                buffer_path = Path(tmp_dir) / f"buffer_{index:04d}.wav"
+                save_audio(buffer_path, audio, sr)
+                results.append(self.predict_path(buffer_path))
+        return results
+
+
+class OnnxPitchModel:
+    """Basic Pitch ONNX graph run through ONNX Runtime on the CPU."""
+
+    def __init__(self, model_path: Path, threads: int = 0) -> None:
+        import onnxruntime as ort  # lazy import for optional deps
+
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self._session.get_inputs()[0].name
+        available = {output.name for output in self._session.get_outputs()}
+        if not set(_ONNX_OUTPUTS.values()) <= available:
+            # Note and onset outputs have the same shape, so they cannot be
+            # told apart in a renamed graph.
+            raise TranscriptionError(
+                f"Unexpected Basic Pitch ONNX outputs {sorted(available)} in {model_path}"
+            )
+        self._outputs = _ONNX_OUTPUTS
+
+    def predict(self, batch: np.ndarray) -> dict[str, np.ndarray]:
+        keys = list(self._outputs)
+        values = self._session.run(
+            [self._outputs[key] for key in keys],
+            {self._input_name: batch.astype(np.float32, copy=False)},
+        )
+        return dict(zip(keys, values))
+
+
+def get_session(backend: str = "tensorflow", threads: int = 0) -> PitchModelSession:
+    """Return the process-wide model session, loading the model on first use.
+
+    Args:
+        backend: Inference backend name ("tensorflow" or "onnx").
+        threads: Intra-op thread count; 0 keeps the runtime default.
+
+    Returns:
+        The shared PitchModelSession for the backend and thread setting.
+
+    Raises:
+        TranscriptionError: If the backend is unknown.
+    """
+    if backend not in BACKENDS:
+        raise TranscriptionError(f"Unknown pitch backend: {backend}")
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get((backend, threads))
+        if session is None:
+            session = _load_session(backend, threads)
+            _SESSIONS[(backend, threads)] = session
+        return session
+
+
+def reset_sessions() -> None:
+    """Drop all loaded model sessions."""
+    with _SESSIONS_LOCK:
+        _SESSIONS.clear()
+
+
+def _load_session(backend: str, threads: int) -> PitchModelSession:
+    started = time.perf_counter()
+    if backend == "onnx":
+        onnx_model = OnnxPitchModel(_onnx_model_path(), threads=threads)
+        elapsed = time.perf_counter() - started
+        logger.info("Loaded Basic Pitch onnx model in %.2fs (threads=%s)", elapsed, threads)
+        return PitchModelSession(model=onnx_model, backend=backend, load_seconds=elapsed)
+
+    if threads > 0:
+        _set_tensorflow_threads(threads)
+    try:
+        from basic_pitch import ICASSP_2022_MODEL_PATH
+        from basic_pitch.inference import Model
+    except ImportError:
+        logger.info("Basic Pitch model class unavailable; predict() will load the model per call")
+        return PitchModelSession(model=None, backend=backend)
+
+    model = Model(ICASSP_2022_MODEL_PATH)
+    elapsed = time.perf_counter() - started
+    logger.info("Loaded Basic Pitch %s model in %.2fs", backend, elapsed)
+    return PitchModelSession(model=model, backend=backend, load_seconds=elapsed)
+
+
+def _onnx_model_path() -> Path:
+    from basic_pitch import ICASSP_2022_MODEL_PATH  # lazy import for heavy deps
+
+    return Path(ICASSP_2022_MODEL_PATH).parent / "nmp.onnx"
+
+
+def _set_tensorflow_threads(threads: int) -> None:
+    try:
+        import tensorflow as tf  # lazy import for heavy deps
+
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except (ImportError, RuntimeError):  # pragma: no cover - runtime already initialized
+        logger.warning("Could not set TensorFlow thread count to %s", threads)
+
+
+def extract_note_events(result: object) -> list[object]:
+    """Pull the note event list out of a Basic Pitch predict() result."""
+    if isinstance(result, dict) and "note_events" in result:
+        note_events = result["note_events"]
+    elif isinstance(result, tuple) and len(result) >= 3:
+        note_events = result[2]
+    else:
+        raise TranscriptionError("Unexpected Basic Pitch result format")
+
+    if not isinstance(note_events, list):
+        raise TranscriptionError("Basic Pitch note events must be a list")
+
+    return note_events
+
+
+def _resample(audio: np.ndarray, sr: int, target_sr: int) -> np.ndarray:
+    if sr == target_sr:
+        return audio.astype(np.float32, copy=False)
+    import librosa  # lazy import for heavy deps
+
+    resampled: np.ndarray = librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
+    return resampled.astype(np.float32, copy=False)
+
+
+def _window_audio(audio: np.ndarray, n_samples: int, hop_size: int, overlap_len: int) -> np.ndarray:
+    padded = np.concatenate([np.zeros(overlap_len // 2, dtype=np.float32), audio])
+    n_windows = max(int(np.ceil(padded.shape[0] / hop_size)), 1)
+    total = (n_windows - 1) * hop_size + n_samples
+    padded = np.pad(padded, (0, max(total - padded.shape[0], 0)))
+    starts = np.arange(n_windows) * hop_size
+    windows: np.ndarray = padded[starts[:, None] + np.arange(n_samples)[None, :]]
+    return windows[:, :, None]
+
+
+def _unwrap_output(output: np.ndarray, n_frames: int) -> np.ndarray:
+    n_olap = _N_OVERLAPPING_FRAMES // 2
+    if n_olap > 0:
+        output = output[:, n_olap:-n_olap, :]
+    unwrapped = output.reshape(output.shape[0] * output.shape[1], output.shape[2])
+    return unwrapped[:n_frames, :]
@@ -1,19 +1,77 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from pathlib import Path
 import logging
+import multiprocessing
+import os
+import threading
+import time
 
+import numpy as np
+
+from stemscore.transcriber.pitch_session import PitchModelSession, get_session
+from stemscore.transcriber.segments import plan_segments, stitch_segment_notes
+from stemscore.utils.activity import (
+    DEFAULT_THRESHOLD_DB,
+    ActivityProfile,
+    detect_activity,
+    frame_rms_db,
+)
+from stemscore.utils.audio_io import AudioSource, iter_audio_windows, load_audio
 from stemscore.utils.exceptions import TranscriptionError
 
 logger = logging.getLogger(__name__)
 
+# Above this active ratio, cropping regions costs more than it saves.
+_FULL_FILE_ACTIVE_RATIO = 0.9
+# Same-pitch notes this close across a window seam are treated as one note.
+_SEAM_TOLERANCE_SECONDS = 0.05
+# Segment worker pools by (workers, backend, threads), kept warm across stems.
+_SEGMENT_POOLS: dict[tuple[int, str, int], Executor] = {}
+_SEGMENT_POOLS_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PitchBatchResult:
+    """Notes and timings from a batched multi-stem transcription."""
 
-def transcribe_pitch(audio_path: Path, min_note_ms: int = 80) -> list[dict]:
+    notes: dict[Path, list[dict]]
+    model_load_seconds: float
+    inference_seconds: float
+
+
+def transcribe_pitch(
+    audio_path: AudioSource,
+    min_note_ms: int = 80,
+    skip_silence: bool = False,
+    window_seconds: float = 0.0,
+    backend: str = "tensorflow",
+    threads: int = 0,
+    exclude: Sequence[tuple[float, float]] = (),
+    workers: int = 1,
+    segment_seconds: float = 60.0,
+) -> list[dict]:
     """Transcribe melodic audio into note events using Basic Pitch.
 
     Args:
         audio_path: Path to the input audio file.
         min_note_ms: Minimum note length in milliseconds.
+        skip_silence: Only run inference on active regions of the stem.
+        window_seconds: If positive, stream the stem through overlapping
+            windows of this length instead of transcribing it in one pass.
+        backend: Inference backend ("tensorflow" or "onnx").
+        threads: Intra-op thread count for the backend; 0 keeps the default.
+        exclude: (start, end) spans in seconds to leave untranscribed, e.g.
+            repeated sections whose notes are copied from an earlier instance.
+            Transcription then runs region by region instead of streaming.
+        workers: Worker processes for one stem. Above 1 the stem is split at
+            quiet points into overlapping segments that are transcribed in
+            parallel and stitched; 0 or less uses one worker per CPU core.
+        segment_seconds: Nominal segment length when running in parallel.
 
     Returns:
         List of note event dictionaries.
@@ -25,20 +83,48 @@ def transcribe_pitch(audio_path: Path, min_note_ms: int = 80) -> list[dict]:
     if not audio_path.exists():
         raise TranscriptionError(f"Input audio not found: {audio_path}")
 
-    try:
-        from basic_pitch.inference import predict  # lazy import for heavy deps
+    workers = _resolve_workers(workers)
+    if window_seconds > 0 and not exclude and workers == 1:
+        return list(
+            iter_pitch_notes(
+                audio_path,
+                window_seconds=window_seconds,
+                min_note_ms=min_note_ms,
+                skip_silence=skip_silence,
+                backend=backend,
+                threads=threads,
+            )
+        )
 
-        result = predict(str(audio_path))
-        note_events = _extract_note_events(result)
-        filtered: list[dict] = []
-        min_note_seconds = max(min_note_ms, 0) / 1000.0
+    try:
+        if workers > 1:
+            notes = _transcribe_parallel(
+                audio_path, skip_silence, exclude, workers, segment_seconds, backend, threads
+            )
+            filtered = _filter_short_notes(notes, min_note_ms)
+            logger.info("Transcribed %s notes for %s", len(filtered), audio_path)
+            return filtered
 
-        for event in note_events:
-            note = _normalize_note_event(event)
-            if note["end"] - note["start"] < min_note_seconds:
-                continue
-            filtered.append(note)
+        session = get_session(backend, threads)
+        if skip_silence or exclude:
+            audio, sr = load_audio(audio_path)
+            if skip_silence:
+                activity = detect_activity(audio, sr)
+            else:
+                duration = audio.shape[0] / sr
+                activity = ActivityProfile(regions=((0.0, duration),), duration=duration)
+            activity = activity.without(exclude)
+            if activity.is_silent:
+                logger.info("Nothing to transcribe in %s", audio_path)
+                return []
+            if exclude or activity.active_ratio < _FULL_FILE_ACTIVE_RATIO:
+                notes = _predict_regions(session, audio, sr, activity)
+            else:
+                notes = _normalize_all(session.predict_path(audio_path))
+        else:
+            notes = _normalize_all(session.predict_path(audio_path))
 
+        filtered = _filter_short_notes(notes, min_note_ms)
         logger.info("Transcribed %s notes for %s", len(filtered), audio_path)
         return filtered
     except TranscriptionError:
@@ -48,21 +134,346 @@ def transcribe_pitch(audio_path: Path, min_note_ms: int = 80) -> list[dict]:
         raise TranscriptionError("Pitch transcription failed") from exc
 
 
-def _extract_note_events(result: object) -> list[dict]:
-    if isinstance(result, dict) and "note_events" in result:
-        note_events = result["note_events"]
-    elif isinstance(result, tuple) and len(result) >= 3:
-        note_events = result[2]
+def iter_pitch_notes(
+    audio_path: AudioSource,
+    window_seconds: float = 30.0,
+    overlap_seconds: float = 2.0,
+    min_note_ms: int = 80,
+    skip_silence: bool = False,
+    backend: str = "tensorflow",
+    threads: int = 0,
+) -> Iterator[dict]:
+    """Stream note events from a stem using overlapping inference windows.
+
+    Only one window of audio and model activations is held in memory at a
+    time. Each window owns the notes whose onsets fall between the midpoints
+    of its overlaps; a note cut by the end of a window is held open and
+    extended by its continuation in the next window. Notes are yielded in
+    onset order as soon as no later window can change them.
+
+    Args:
+        audio_path: Path to the input audio file.
+        window_seconds: Inference window length in seconds.
+        overlap_seconds: Overlap between consecutive windows in seconds.
+        min_note_ms: Minimum note length in milliseconds.
+        skip_silence: Skip inference on windows below the activity threshold.
+        backend: Inference backend ("tensorflow" or "onnx").
+        threads: Intra-op thread count for the backend; 0 keeps the default.
+
+    Yields:
+        Note event dictionaries.
+
+    Raises:
+        TranscriptionError: If transcription fails.
+    """
+    logger.info("Streaming pitch transcription for %s", audio_path)
+    if not audio_path.exists():
+        raise TranscriptionError(f"Input audio not found: {audio_path}")
+    if overlap_seconds < 0 or overlap_seconds >= window_seconds:
+        raise ValueError("Overlap must be non-negative and shorter than the window")
+
+    try:
+        session = get_session(backend, threads)
+        hop_seconds = window_seconds - overlap_seconds
+        half_overlap = overlap_seconds / 2.0
+        min_note_seconds = max(min_note_ms, 0) / 1000.0
+        open_notes: list[dict] = []
+        ready: list[dict] = []
+        total = 0
+
+        windows = iter_audio_windows(audio_path, window_seconds, hop_seconds)
+        for index, window in enumerate(windows):
+            own_lo = window.offset + half_overlap if index > 0 else float("-inf")
+            if window.is_last:
+                own_hi = next_start = float("inf")
+            else:
+                own_hi = window.offset + window_seconds - half_overlap
+                next_start = window.offset + hop_seconds
+
+            notes: list[dict] = []
+            if not (skip_silence and _is_silent(window.audio)):
+                events = session.predict_audio_batch([window.audio], window.sr)[0]
+                notes = _normalize_all(events)
+
+            current: list[dict] = []
+            for note in sorted(notes, key=lambda item: item["start"]):
+                note["start"] += window.offset
+                note["end"] += window.offset
+                if note["start"] < own_lo:
+                    _extend_open_note(open_notes, note)
+                elif note["start"] < own_hi:
+                    current.append(note)
+
+            still_open: list[dict] = []
+            for note in open_notes + current:
+                (still_open if note["end"] > next_start else ready).append(note)
+            open_notes = still_open
+
+            horizon = min((note["start"] for note in open_notes), default=float("inf"))
+            ready.sort(key=lambda item: item["start"])
+            while ready and ready[0]["start"] < horizon:
+                note = ready.pop(0)
+                if note["end"] - note["start"] >= min_note_seconds:
+                    total += 1
+                    yield note
+
+        for note in sorted(ready + open_notes, key=lambda item: item["start"]):
+            if note["end"] - note["start"] >= min_note_seconds:
+                total += 1
+                yield note
+        logger.info("Streamed %s notes for %s", total, audio_path)
+    except TranscriptionError:
+        raise
+    except Exception as exc:  # pragma: no cover - defensive wrapper
+        logger.exception("Streaming pitch transcription failed")
+        raise TranscriptionError("Streaming pitch transcription failed") from exc
+
+
+def transcribe_pitch_batch(
+    audio_paths: list[Path],
+    min_note_ms: int = 80,
+    backend: str = "tensorflow",
+    threads: int = 0,
+) -> PitchBatchResult:
+    """Transcribe several melodic stems with one batched Basic Pitch call.
+
+    The stems share the process-wide model session, so the model is loaded
+    at most once regardless of how many stems or jobs use it.
+
+    Args:
+        audio_paths: Paths to the input audio files.
+        min_note_ms: Minimum note length in milliseconds.
+        backend: Inference backend ("tensorflow" or "onnx").
+        threads: Intra-op thread count for the backend; 0 keeps the default.
+
+    Returns:
+        PitchBatchResult with notes per path and model load/inference timings.
+
+    Raises:
+        TranscriptionError: If transcription fails.
+    """
+    for audio_path in audio_paths:
+        if not audio_path.exists():
+            raise TranscriptionError(f"Input audio not found: {audio_path}")
+
+    try:
+        load_started = time.perf_counter()
+        session = get_session(backend, threads)
+        model_load_seconds = time.perf_counter() - load_started
+
+        loaded = [load_audio(audio_path) for audio_path in audio_paths]
+        sample_rates = {sr for _, sr in loaded}
+        target_sr = max(sample_rates) if sample_rates else 22050
+        audios = [_match_rate(audio, sr, target_sr) for audio, sr in loaded]
+
+        inference_started = time.perf_counter()
+        batch_events = session.predict_audio_batch(audios, target_sr)
+        inference_seconds = time.perf_counter() - inference_started
+
+        notes = {
+            audio_path: _filter_short_notes(_normalize_all(events), min_note_ms)
+            for audio_path, events in zip(audio_paths, batch_events)
+        }
+        logger.info(
+            "Batch-transcribed %s stems (model load %.2fs, inference %.2fs)",
+            len(audio_paths),
+            model_load_seconds,
+            inference_seconds,
+        )
+        return PitchBatchResult(
+            notes=notes,
+            model_load_seconds=model_load_seconds,
+            inference_seconds=inference_seconds,
+        )
+    except TranscriptionError:
+        raise
+    except Exception as exc:  # pragma: no cover - defensive wrapper
+        logger.exception("Batched pitch transcription failed")
+        raise TranscriptionError("Batched pitch transcription failed") from exc
+
+
+def _transcribe_parallel(
+    audio_path: AudioSource,
+    skip_silence: bool,
+    exclude: Sequence[tuple[float, float]],
+    workers: int,
+    segment_seconds: float,
+    backend: str,
+    threads: int,
+) -> list[dict]:
+    """Transcribe one stem as overlapping segments in worker processes."""
+    audio, sr = load_audio(audio_path)
+    duration = audio.shape[0] / sr
+    if skip_silence:
+        activity = detect_activity(audio, sr)
     else:
-        raise TranscriptionError("Unexpected Basic Pitch result format")
+        activity = ActivityProfile(regions=((0.0, duration),), duration=duration)
+    activity = activity.without(exclude)
+    if activity.is_silent:
+        logger.info("Nothing to transcribe in %s", audio_path)
+        return []
+
+    segments = plan_segments(audio, sr, segment_seconds=segment_seconds)
+    # Split the cores between workers unless a thread count was requested.
+    worker_threads = threads if threads > 0 else max((os.cpu_count() or 1) // workers, 1)
+    tasks = [
+        (
+            audio[segment.start : segment.end],
+            sr,
+            segment.start / sr,
+            activity.window(segment.start / sr, segment.end / sr),
+            backend,
+            worker_threads,
+        )
+        for segment in segments
+    ]
+    executor = _segment_executor(workers, backend, worker_threads)
+    try:
+        segment_notes = list(executor.map(_transcribe_segment, tasks))
+    except BrokenProcessPool:
+        _discard_segment_executor(executor)
+        raise
+    logger.info("Transcribed %s segments with %s workers", len(segments), workers)
+    return stitch_segment_notes(segment_notes, segments, sr)
+
+
+def _transcribe_segment(
+    task: tuple[np.ndarray, int, float, ActivityProfile, str, int],
+) -> list[dict]:
+    audio, sr, offset, activity, backend, threads = task
+    if activity.is_silent:
+        return []
+    session = get_session(backend, threads)
+    notes = _predict_regions(session, audio, sr, activity)
+    for note in notes:
+        note["start"] += offset
+        note["end"] += offset
+    return notes
+
+
+def _segment_executor(workers: int, backend: str, threads: int) -> Executor:
+    """Return the process pool for segment transcription, starting it on first use.
+
+    Pools live for the rest of the process, so each worker loads Basic Pitch
+    once and keeps it across stems and runs.
+    """
+    key = (max(workers, 1), backend, threads)
+    with _SEGMENT_POOLS_LOCK:
+        executor = _SEGMENT_POOLS.get(key)
+        if executor is None:
+            # Spawned workers avoid inheriting an initialized TensorFlow runtime.
+            executor = ProcessPoolExecutor(
+                max_workers=key[0],
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_session,
+                initargs=(backend, threads),
+            )
+            _SEGMENT_POOLS[key] = executor
+        return executor
+
+
+def _discard_segment_executor(executor: Executor) -> None:
+    with _SEGMENT_POOLS_LOCK:
+        for key, pooled in list(_SEGMENT_POOLS.items()):
+            if pooled is executor:
+                del _SEGMENT_POOLS[key]
+    executor.shutdown(wait=False)
+
+
+def shutdown_segment_pools() -> None:
+    """Stop the worker processes kept for parallel segment transcription."""
+    with _SEGMENT_POOLS_LOCK:
+        executors = list(_SEGMENT_POOLS.values())
+        _SEGMENT_POOLS.clear()
+    for executor in executors:
+        executor.shutdown()
+
+
+def _warm_session(backend: str, threads: int) -> None:
+    try:
+        get_session(backend, threads)
+    except (ImportError, TranscriptionError):
+        # The first segment raises the same error with its context.
+        logger.warning("Could not preload the %s pitch model in a worker", backend)
+
+
+def _resolve_workers(workers: int) -> int:
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _predict_regions(
+    session: PitchModelSession,
+    audio: np.ndarray,
+    sr: int,
+    activity: ActivityProfile,
+) -> list[dict]:
+    """Run Basic Pitch on each active region and shift notes back to stem time."""
+    ranges = activity.sample_ranges(sr)
+    batch_events = session.predict_audio_batch([audio[start:end] for start, end in ranges], sr)
+
+    notes: list[dict] = []
+    for (start, _), events in zip(ranges, batch_events):
+        offset = start / sr
+        for note in _normalize_all(events):
+            note["start"] += offset
+            note["end"] += offset
+            notes.append(note)
+    logger.info(
+        "Transcribed %s active regions (%.1fs of %.1fs)",
+        len(activity.regions),
+        activity.active_seconds,
+        activity.duration,
+    )
+    return notes
+
+
+def _extend_open_note(open_notes: list[dict], note: dict) -> None:
+    """Merge a note from a window's leading overlap into the note it continues."""
+    for candidate in reversed(open_notes):
+        if (
+            candidate["pitch"] == note["pitch"]
+            and candidate["end"] >= note["start"] - _SEAM_TOLERANCE_SECONDS
+        ):
+            candidate["end"] = max(candidate["end"], note["end"])
+            return
+
+
+def _is_silent(audio: np.ndarray) -> bool:
+    levels = frame_rms_db(audio)
+    return not bool((levels > DEFAULT_THRESHOLD_DB).any())
+
+
+def _match_rate(audio: np.ndarray, sr: int, target_sr: int) -> np.ndarray:
+    if sr == target_sr:
+        return audio
+    import librosa  # lazy import for heavy deps
+
+    resampled: np.ndarray = librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
+    return resampled
+
+
+def _normalize_all(events: list[object]) -> list[dict]:
+    return [_normalize_note_event(event) for event in events]
 
-    if not isinstance(note_events, list):
-        raise TranscriptionError("Basic Pitch note events must be a list")
 
-    return note_events
+def _filter_short_notes(notes: list[dict], min_note_ms: int) -> list[dict]:
+    min_note_seconds = max(min_note_ms, 0) / 1000.0
+    return [note for note in notes if note["end"] - note["start"] >= min_note_seconds]
 
 
 def _normalize_note_event(event: object) -> dict:
+    if isinstance(event, (tuple, list)) and len(event) >= 4:
+        # Native Basic Pitch events: (start_s, end_s, pitch, amplitude, pitch_bends).
+        amplitude = min(max(float(event[3]), 0.0), 1.0)
+        return {
+            "start": float(event[0]),
+            "end": float(event[1]),
+            "pitch": int(event[2]),
+            "velocity": round(amplitude * 127),
+            "confidence": amplitude,
+        }
     if not isinstance(event, dict):
         raise TranscriptionError("Note event must be a dict")
 
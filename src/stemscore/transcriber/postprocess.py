@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MELISMA_MODES = ("individual_notes", "grace_note", "merge")
+
+# Parts whose short connected runs are treated as sung melismas.
+VOCAL_PARTS = frozenset({"lead_vocal", "backing_vocal", "vocals"})
+
+
+def postprocess_notes(
+    notes: list[dict],
+    merge_gap_ms: float = 30.0,
+    min_note_ms: float = 0.0,
+    min_confidence: float = 0.0,
+    min_velocity: int = 0,
+    melisma_mode: str = "individual_notes",
+    melisma_max_ms: float = 120.0,
+    melisma_max_beats: float | None = None,
+    tempo: float | None = None,
+) -> list[dict]:
+    """Clean up raw pitch notes before quantization.
+
+    Steps, all on note arrays:
+
+    1. Drop ghost notes below the confidence or velocity threshold.
+    2. Merge same-pitch notes that overlap or are separated by at most
+       ``merge_gap_ms`` (split notes and repeated re-onsets).
+    3. Drop notes shorter than ``min_note_ms`` after merging.
+    4. Handle melismas: runs of notes shorter than ``melisma_max_ms`` that
+       lead straight into a note of another pitch are kept
+       ("individual_notes"), flagged ``grace`` ("grace_note"), or absorbed
+       into the note they lead into ("merge"). With a tempo the cutoff is
+       also capped at ``melisma_max_beats`` of a beat, so fast written runs
+       such as sixteenths stay ordinary notes.
+
+    Args:
+        notes: Note dictionaries with start, end, pitch, velocity, confidence.
+        merge_gap_ms: Largest gap bridged between same-pitch fragments.
+        min_note_ms: Minimum note length after merging.
+        min_confidence: Minimum note confidence.
+        min_velocity: Minimum MIDI velocity.
+        melisma_mode: One of MELISMA_MODES.
+        melisma_max_ms: Longest note that can be part of a melisma.
+        melisma_max_beats: Longest melisma note as a fraction of a beat;
+            applies only when ``tempo`` is given.
+        tempo: Song tempo in BPM.
+
+    Returns:
+        Processed note dictionaries sorted by onset.
+
+    Raises:
+        ValueError: If the melisma mode is unknown.
+    """
+    if melisma_mode not in MELISMA_MODES:
+        raise ValueError(f"Unknown melisma mode: {melisma_mode}")
+    if not notes:
+        return []
+
+    count = len(notes)
+    start = np.fromiter((float(note["start"]) for note in notes), dtype=float, count=count)
+    end = np.fromiter((float(note["end"]) for note in notes), dtype=float, count=count)
+    pitch = np.fromiter((int(note["pitch"]) for note in notes), dtype=np.int64, count=count)
+    velocity = np.fromiter(
+        (int(note.get("velocity", 100)) for note in notes), dtype=np.int64, count=count
+    )
+    confidence = np.fromiter(
+        (float(note.get("confidence", 1.0)) for note in notes), dtype=float, count=count
+    )
+
+    keep = (confidence >= min_confidence) & (velocity >= min_velocity)
+    start, end, pitch, velocity, confidence = (
+        column[keep] for column in (start, end, pitch, velocity, confidence)
+    )
+    start, end, pitch, velocity, confidence = _merge_fragments(
+        start, end, pitch, velocity, confidence, merge_gap_ms / 1000.0
+    )
+
+    long_enough = (end - start) >= min_note_ms / 1000.0
+    start, end, pitch, velocity, confidence = (
+        column[long_enough] for column in (start, end, pitch, velocity, confidence)
+    )
+
+    grace = np.zeros(start.size, dtype=bool)
+    if melisma_mode != "individual_notes" and start.size > 1:
+        max_length = melisma_max_ms / 1000.0
+        if melisma_max_beats is not None and tempo:
+            max_length = min(max_length, melisma_max_beats * 60.0 / tempo)
+        melisma = _melisma_mask(start, end, pitch, max_length, merge_gap_ms / 1000.0)
+        if melisma_mode == "grace_note":
+            grace = melisma
+        else:
+            start, end, pitch, velocity, confidence = _absorb_melismas(
+                start, end, pitch, velocity, confidence, melisma
+            )
+            grace = np.zeros(start.size, dtype=bool)
+
+    processed = [
+        {
+            "start": float(start[index]),
+            "end": float(end[index]),
+            "pitch": int(pitch[index]),
+            "velocity": int(velocity[index]),
+            "confidence": float(confidence[index]),
+            **({"grace": True} if grace[index] else {}),
+        }
+        for index in range(start.size)
+    ]
+    logger.info("Post-processed %s notes into %s", count, len(processed))
+    return processed
+
+
+def _merge_fragments(
+    start: np.ndarray,
+    end: np.ndarray,
+    pitch: np.ndarray,
+    velocity: np.ndarray,
+    confidence: np.ndarray,
+    max_gap: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Merge same-pitch notes that overlap or nearly touch; result is onset-sorted."""
+    if start.size == 0:
+        return start, end, pitch, velocity, confidence
+    order = np.lexsort((start, pitch))
+    start, end, pitch = start[order], end[order], pitch[order]
+    velocity, confidence = velocity[order], confidence[order]
+
+    # Running max of note ends within each pitch: offset every pitch group
+    # above the previous one so a single accumulate never crosses groups.
+    span = float(end.max() - min(start.min(), 0.0)) + max_gap + 1.0
+    group_offset = (pitch - pitch.min()) * span
+    running_end = np.maximum.accumulate(end + group_offset) - group_offset
+
+    new_group = np.ones(start.size, dtype=bool)
+    new_group[1:] = (pitch[1:] != pitch[:-1]) | (start[1:] > running_end[:-1] + max_gap)
+    heads = np.flatnonzero(new_group)
+
+    merged_start = start[heads]
+    merged_end = np.maximum.reduceat(end, heads)
+    merged_pitch = pitch[heads]
+    merged_velocity = np.maximum.reduceat(velocity, heads)
+    merged_confidence = np.maximum.reduceat(confidence, heads)
+
+    by_onset = np.lexsort((merged_pitch, merged_start))
+    return (
+        merged_start[by_onset],
+        merged_end[by_onset],
+        merged_pitch[by_onset],
+        merged_velocity[by_onset],
+        merged_confidence[by_onset],
+    )
+
+
+def _melisma_mask(
+    start: np.ndarray, end: np.ndarray, pitch: np.ndarray, max_length: float, max_gap: float
+) -> np.ndarray:
+    """Short notes that run straight into a note of a different pitch."""
+    short = (end - start) < max_length
+    leads_on = np.zeros(start.size, dtype=bool)
+    leads_on[:-1] = (start[1:] - end[:-1] <= max_gap) & (pitch[1:] != pitch[:-1])
+    mask: np.ndarray = short & leads_on
+    return mask
+
+
+def _absorb_melismas(
+    start: np.ndarray,
+    end: np.ndarray,
+    pitch: np.ndarray,
+    velocity: np.ndarray,
+    confidence: np.ndarray,
+    melisma: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Fold each run of melisma notes into the note that follows it."""
+    # Group = the run of melisma notes plus the main note closing it.
+    closes = ~melisma
+    closes[-1] = True
+    heads = np.flatnonzero(np.concatenate(([True], closes[:-1])))
+    tails = np.flatnonzero(closes)
+    return (
+        start[heads],
+        np.maximum.reduceat(end, heads),
+        pitch[tails],
+        np.maximum.reduceat(velocity, heads),
+        confidence[tails],
+    )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import itertools
+import logging
+
+import numpy as np
+
+from stemscore.transcriber.postprocess import postprocess_notes
+from stemscore.utils.activity import frame_rms_db
+
+logger = logging.getLogger(__name__)
+
+# Block size for finding quiet cut points (~93 ms at 22.05 kHz).
+_CUT_HOP = 2048
+# Level penalty (dB) per block a cut moves away from its nominal position.
+_TIE_BREAK_DB = 1e-3
+# Notes starting this close to a segment's start may be clipped continuations.
+_CONTINUATION_TOLERANCE_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class StemSegment:
+    """A slice of a stem for parallel transcription, in samples.
+
+    The segment is transcribed over [start, end) but only owns the notes
+    whose onsets fall in [own_start, own_end); the rest is overlap with its
+    neighbours.
+    """
+
+    start: int
+    end: int
+    own_start: int
+    own_end: int
+
+
+def plan_segments(
+    audio: np.ndarray,
+    sr: int,
+    segment_seconds: float = 60.0,
+    overlap_seconds: float = 2.0,
+    search_seconds: float = 5.0,
+) -> list[StemSegment]:
+    """Split a stem into overlapping segments cut at low-energy points.
+
+    Each nominal boundary (every ``segment_seconds``) moves to the quietest
+    block within ``search_seconds`` of it, so cuts tend to fall in breaths
+    and rests rather than through sustained notes.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        segment_seconds: Nominal segment length.
+        overlap_seconds: Audio shared by neighbouring segments around a cut.
+        search_seconds: How far a cut may move to find a quiet point.
+
+    Returns:
+        Segments in time order; a short stem yields a single segment.
+    """
+    n_samples = int(audio.shape[0])
+    segment_len = round(segment_seconds * sr)
+    if segment_len <= 0 or n_samples <= segment_len + round(search_seconds * sr):
+        return [StemSegment(start=0, end=n_samples, own_start=0, own_end=n_samples)]
+
+    levels = frame_rms_db(audio, _CUT_HOP)
+    nominal = np.arange(segment_len, n_samples - segment_len // 2, segment_len) // _CUT_HOP
+    search = max(round(search_seconds * sr / _CUT_HOP), 1)
+    offsets = np.arange(-search, search + 1)
+    candidates = np.clip(nominal[:, None] + offsets[None, :], 0, levels.size - 1)
+    # A slight pull towards the nominal boundary breaks ties in even material.
+    cost = levels[candidates] + _TIE_BREAK_DB * np.abs(offsets)[None, :]
+    best = candidates[np.arange(nominal.size), np.argmin(cost, axis=1)]
+    cuts = best * _CUT_HOP + _CUT_HOP // 2
+    cuts = np.unique(cuts[(cuts > 0) & (cuts < n_samples)])
+
+    half_overlap = round(overlap_seconds * sr / 2)
+    bounds = np.concatenate(([0], cuts, [n_samples]))
+    segments = [
+        StemSegment(
+            start=max(int(lo) - half_overlap, 0),
+            end=min(int(hi) + half_overlap, n_samples),
+            own_start=int(lo),
+            own_end=int(hi),
+        )
+        for lo, hi in itertools.pairwise(bounds)
+    ]
+    logger.info("Planned %s segments for %.1fs of audio", len(segments), n_samples / sr)
+    return segments
+
+
+def stitch_segment_notes(
+    segment_notes: list[list[dict]],
+    segments: list[StemSegment],
+    sr: int,
+) -> list[dict]:
+    """Combine per-segment notes (in stem time) into one note list.
+
+    A segment keeps the notes whose onsets it owns. Notes starting right at a
+    later segment's first sample are also kept because they may be the tail
+    of a note that began before the segment. Same-pitch notes that then
+    overlap, i.e. one note seen by both neighbours, are merged.
+
+    Args:
+        segment_notes: Notes for each segment, already shifted to stem time.
+        segments: The segments the notes came from.
+        sr: Sample rate used to plan the segments.
+
+    Returns:
+        Stitched notes sorted by onset.
+    """
+    kept: list[dict] = []
+    for index, (notes, segment) in enumerate(zip(segment_notes, segments)):
+        if not notes:
+            continue
+        starts = np.array([float(note["start"]) for note in notes])
+        owned = (starts >= segment.own_start / sr) & (starts < segment.own_end / sr)
+        if index > 0:
+            owned |= starts <= segment.start / sr + _CONTINUATION_TOLERANCE_SECONDS
+        kept.extend(notes[position] for position in np.flatnonzero(owned))
+    return postprocess_notes(kept, merge_gap_ms=0.0)
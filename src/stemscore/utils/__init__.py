@@ -1,22 +1,36 @@
 from __future__ import annotations
 
-from stemscore.utils.audio_io import load_audio, save_audio
+from stemscore.utils.activity import ActivityProfile, detect_activity
+from stemscore.utils.audio_io import (
+    ArchiveMember,
+    AudioSource,
+    audio_duration,
+    load_audio,
+    save_audio,
+)
 from stemscore.utils.exceptions import (
     AnalysisError,
     AssemblyError,
     AudioLoadError,
+    BundleError,
     SeparationError,
     StemScoreError,
     TranscriptionError,
 )
 
 __all__ = [
+    "ActivityProfile",
     "AnalysisError",
+    "ArchiveMember",
     "AssemblyError",
     "AudioLoadError",
+    "AudioSource",
+    "BundleError",
     "SeparationError",
     "StemScoreError",
     "TranscriptionError",
+    "audio_duration",
+    "detect_activity",
     "load_audio",
     "save_audio",
 ]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD_DB = -50.0
+DEFAULT_HOP_LENGTH = 512
+
+
+@dataclass(frozen=True)
+class ActivityProfile:
+    """Active (non-silent) regions of a stem, in seconds."""
+
+    regions: tuple[tuple[float, float], ...]
+    duration: float
+
+    @property
+    def is_silent(self) -> bool:
+        return not self.regions
+
+    @property
+    def active_seconds(self) -> float:
+        return float(sum(end - start for start, end in self.regions))
+
+    @property
+    def active_ratio(self) -> float:
+        if self.duration <= 0:
+            return 0.0
+        return min(self.active_seconds / self.duration, 1.0)
+
+    def without(self, spans: Sequence[tuple[float, float]]) -> ActivityProfile:
+        """Return the profile with the given (start, end) spans removed."""
+        regions = list(self.regions)
+        for cut_start, cut_end in spans:
+            kept: list[tuple[float, float]] = []
+            for start, end in regions:
+                if start < cut_start:
+                    kept.append((start, min(end, cut_start)))
+                if end > cut_end:
+                    kept.append((max(start, cut_end), end))
+            regions = kept
+        return ActivityProfile(
+            regions=tuple(region for region in regions if region[1] > region[0]),
+            duration=self.duration,
+        )
+
+    def window(self, start: float, end: float) -> ActivityProfile:
+        """Return the regions inside [start, end), in seconds from ``start``."""
+        regions = tuple(
+            (max(region_start, start) - start, min(region_end, end) - start)
+            for region_start, region_end in self.regions
+            if region_end > start and region_start < end
+        )
+        return ActivityProfile(regions=regions, duration=end - start)
+
+    def sample_ranges(self, sr: int) -> list[tuple[int, int]]:
+        """Return the active regions as sample index ranges."""
+        return [(round(start * sr), round(end * sr)) for start, end in self.regions]
+
+
+def frame_rms_db(audio: np.ndarray, hop_length: int = DEFAULT_HOP_LENGTH) -> np.ndarray:
+    """Compute per-block RMS level in dBFS over non-overlapping blocks.
+
+    Args:
+        audio: Audio samples (mono).
+        hop_length: Block size in samples.
+
+    Returns:
+        RMS level per block in dB relative to full scale.
+    """
+    if audio.size == 0 or hop_length <= 0:
+        return np.zeros(0, dtype=float)
+    n_blocks = int(np.ceil(audio.shape[0] / hop_length))
+    padded = np.zeros(n_blocks * hop_length, dtype=np.float32)
+    padded[: audio.shape[0]] = audio
+    energy = np.square(padded.reshape(n_blocks, hop_length), dtype=np.float64).mean(axis=1)
+    levels: np.ndarray = 10.0 * np.log10(energy + 1e-12)
+    return levels
+
+
+def detect_activity(
+    audio: np.ndarray,
+    sr: int,
+    threshold_db: float = DEFAULT_THRESHOLD_DB,
+    hop_length: int = DEFAULT_HOP_LENGTH,
+    min_silence: float = 0.5,
+    min_active: float = 0.05,
+    padding: float = 0.1,
+) -> ActivityProfile:
+    """Find active regions of a stem using an RMS level gate.
+
+    Silent gaps shorter than ``min_silence`` are bridged, and each region is
+    padded so note onsets and releases near the gate are not clipped.
+
+    Args:
+        audio: Audio samples (mono).
+        sr: Sample rate.
+        threshold_db: RMS level in dBFS above which a block counts as active.
+        hop_length: Analysis block size in samples.
+        min_silence: Shortest gap in seconds that splits two regions.
+        min_active: Shortest region in seconds that is kept.
+        padding: Seconds added before and after each region.
+
+    Returns:
+        ActivityProfile with merged active regions.
+    """
+    duration = float(audio.shape[0]) / sr if sr > 0 else 0.0
+    levels = frame_rms_db(audio, hop_length)
+    active = levels > threshold_db
+    if not active.any():
+        logger.info("No active regions above %.1f dBFS", threshold_db)
+        return ActivityProfile(regions=(), duration=duration)
+
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    block_seconds = hop_length / sr
+    start_times = np.maximum(starts * block_seconds - padding, 0.0)
+    end_times = np.minimum(ends * block_seconds + padding, duration)
+
+    gaps = start_times[1:] - end_times[:-1]
+    split = np.flatnonzero(gaps >= min_silence) + 1
+    group_starts = start_times[np.concatenate(([0], split))]
+    group_ends = end_times[np.concatenate((split - 1, [end_times.size - 1]))]
+
+    keep = (group_ends - group_starts) >= min_active
+    regions = tuple(
+        (float(start), float(end)) for start, end in zip(group_starts[keep], group_ends[keep])
+    )
+    profile = ActivityProfile(regions=regions, duration=duration)
+    logger.info(
+        "Detected %s active regions (%.1f%% active)", len(regions), profile.active_ratio * 100
+    )
+    return profile
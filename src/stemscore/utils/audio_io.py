@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from pathlib import Path
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
 import logging
+import zipfile
 
 import numpy as np
 
@@ -10,11 +15,77 @@ from stemscore.utils.exceptions import AudioLoadError
 logger = logging.getLogger(__name__)
 
 
-def load_audio(path: Path) -> tuple[np.ndarray, int]:
+@dataclass(frozen=True)
+class AudioWindow:
+    """A mono block of audio read from a longer file."""
+
+    offset: float
+    audio: np.ndarray
+    sr: int
+    is_last: bool
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """An audio file inside a zip archive, read without extracting it.
+
+    Supports the parts of the Path interface the pipeline uses on stems
+    (name, stem, suffix, exists) plus open(), which streams the member out of
+    the archive.
+    """
+
+    archive: Path
+    member: str
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.member).stem
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.member).suffix
+
+    def exists(self) -> bool:
+        try:
+            with zipfile.ZipFile(self.archive) as archive:
+                archive.getinfo(self.member)
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return False
+        return True
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """Open the member as a seekable binary stream."""
+        with zipfile.ZipFile(self.archive) as archive, archive.open(self.member) as handle:
+            yield handle  # type: ignore[misc]
+
+    def __str__(self) -> str:
+        return f"{self.archive}!{self.member}"
+
+
+# Stem audio on disk or inside an archive.
+AudioSource = Path | ArchiveMember
+
+
+@contextmanager
+def open_audio_source(source: AudioSource) -> Iterator[Path | BinaryIO]:
+    """Yield something librosa and soundfile can read for an audio source."""
+    if isinstance(source, ArchiveMember):
+        with source.open() as handle:
+            yield handle
+    else:
+        yield source
+
+
+def load_audio(path: AudioSource) -> tuple[np.ndarray, int]:
     """Load audio from disk.
 
     Args:
-        path: Path to the audio file.
+        path: Path to the audio file, or a member of a zip archive.
 
     Returns:
         A tuple of audio samples (mono) and sample rate.
@@ -30,7 +101,8 @@ def load_audio(path: Path) -> tuple[np.ndarray, int]:
 
     try:
         logger.info("Loading audio: %s", path)
-        audio, sr = librosa.load(path, sr=None, mono=True)
+        with open_audio_source(path) as source:
+            audio, sr = librosa.load(source, sr=None, mono=True)
         if sr is None:
             logger.warning("librosa returned sr=None for %s; defaulting to 22050", path)
             sr = 22050
@@ -41,6 +113,35 @@ def load_audio(path: Path) -> tuple[np.ndarray, int]:
         raise AudioLoadError(f"Failed to load audio from {path}") from exc
 
 
+def audio_duration(path: AudioSource) -> float:
+    """Read an audio file's duration from its header without decoding it.
+
+    Args:
+        path: Path to the audio file, or a member of a zip archive.
+
+    Returns:
+        Duration in seconds.
+
+    Raises:
+        AudioLoadError: If the header cannot be read.
+    """
+    import soundfile as sf  # lazy import for heavy deps
+
+    try:
+        with open_audio_source(path) as source:
+            return float(sf.info(source).duration)
+    except (RuntimeError, OSError, sf.SoundFileError) as exc:
+        if isinstance(path, ArchiveMember) or not path.exists():
+            raise AudioLoadError(f"Failed to read audio header of {path}") from exc
+    # Containers libsndfile cannot parse (e.g. m4a) go through librosa's backends.
+    try:
+        import librosa  # lazy import for heavy deps
+
+        return float(librosa.get_duration(path=str(path)))
+    except Exception as exc:
+        raise AudioLoadError(f"Failed to read audio header of {path}") from exc
+
+
 def save_audio(path: Path, audio: np.ndarray, sr: int) -> None:
     """Save audio to disk.
 
@@ -64,3 +165,64 @@ def save_audio(path: Path, audio: np.ndarray, sr: int) -> None:
     except Exception as exc:
         logger.exception("Failed to save audio: %s", path)
         raise AudioLoadError(f"Failed to save audio to {path}") from exc
+
+
+def iter_audio_windows(
+    path: AudioSource,
+    window_seconds: float,
+    hop_seconds: float,
+) -> Iterator[AudioWindow]:
+    """Read overlapping mono windows from an audio file without decoding it whole.
+
+    The file is read front to back once, so archive members stream without
+    seeking backwards.
+
+    Args:
+        path: Path to the audio file, or a member of a zip archive.
+        window_seconds: Window length in seconds.
+        hop_seconds: Distance between window starts in seconds.
+
+    Yields:
+        AudioWindow blocks in file order.
+
+    Raises:
+        AudioLoadError: If reading fails.
+    """
+    if window_seconds <= 0 or hop_seconds <= 0:
+        raise ValueError("Window and hop lengths must be positive")
+    try:
+        import soundfile as sf
+    except Exception as exc:  # pragma: no cover - defensive for missing deps
+        logger.exception("Failed to import soundfile for windowed reading: %s", path)
+        raise AudioLoadError(f"Failed to import soundfile for {path}") from exc
+
+    try:
+        with open_audio_source(path) as source, sf.SoundFile(source) as handle:
+            sr = int(handle.samplerate)
+            total = int(handle.frames)
+            window = max(round(window_seconds * sr), 1)
+            hop = max(round(hop_seconds * sr), 1)
+            start = 0
+            # Samples already read that the next window shares with this one.
+            carry = np.zeros((0, handle.channels), dtype=np.float32)
+            while True:
+                length = min(window, total - start)
+                fresh = handle.read(length - carry.shape[0], dtype="float32", always_2d=True)
+                block = np.concatenate([carry, fresh]) if carry.size else fresh
+                is_last = start + window >= total
+                yield AudioWindow(
+                    offset=start / sr, audio=block.mean(axis=1), sr=sr, is_last=is_last
+                )
+                if is_last:
+                    return
+                if hop < block.shape[0]:
+                    carry = block[hop:]
+                else:
+                    carry = carry[:0]
+                    handle.seek(start + hop)
+                start += hop
+    except AudioLoadError:
+        raise
+    except Exception as exc:
+        logger.exception("Failed to read audio windows: %s", path)
+        raise AudioLoadError(f"Failed to read audio windows from {path}") from exc
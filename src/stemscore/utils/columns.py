@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+MISSING_PREFIX = "__missing__"
+
+
+def notes_to_columns(notes: Sequence[dict]) -> dict[str, np.ndarray]:
+    """Convert note dictionaries into one array per field.
+
+    Fields that only some notes carry (e.g. ``grace``) also get a boolean
+    ``__missing__<field>`` mask over all notes; their value array holds only
+    the notes that have the field.
+
+    Args:
+        notes: Note dictionaries with scalar values.
+
+    Returns:
+        Mapping of column name to array.
+    """
+    names = sorted({name for note in notes for name in note})
+    columns: dict[str, np.ndarray] = {}
+    for name in names:
+        present = np.fromiter((name in note for note in notes), dtype=bool, count=len(notes))
+        columns[name] = np.asarray([note[name] for note in notes if name in note])
+        if not present.all():
+            columns[MISSING_PREFIX + name] = ~present
+    return columns
+
+
+def columns_to_notes(columns: Mapping[str, np.ndarray], count: int) -> list[dict]:
+    """Rebuild note dictionaries from arrays made by notes_to_columns.
+
+    Args:
+        columns: Mapping of column name to array (may be memory-mapped).
+        count: Number of notes.
+
+    Returns:
+        Note dictionaries with Python scalar values.
+    """
+    notes: list[dict] = [{} for _ in range(count)]
+    for name, values in columns.items():
+        if name.startswith(MISSING_PREFIX):
+            continue
+        missing = columns.get(MISSING_PREFIX + name)
+        rows = np.flatnonzero(~np.asarray(missing)) if missing is not None else np.arange(count)
+        for row, value in zip(rows.tolist(), np.asarray(values).tolist()):
+            notes[row][name] = value
+    return notes
@@ -23,3 +23,7 @@ class TranscriptionError(StemScoreError):
 
 class AssemblyError(StemScoreError):
     """Raised when assembly fails."""
+
+
+class BundleError(StemScoreError):
+    """Raised when a project bundle cannot be read or written."""
@@ -0,0 +1,214 @@
+"""Watch-folder ingestion: transcribe inputs as they land in a directory."""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import time
+
+from stemscore import pipeline, router
+from stemscore.transcriber import TranscriptionCache
+
+logger = logging.getLogger(__name__)
+
+LEDGER_FILENAME = "watch_ledger.json"
+# An input with this sibling file (e.g. "song.zip.ready") is complete at once.
+READY_SUFFIX = ".ready"
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_REJECTED = "rejected"
+
+
+@dataclass(frozen=True)
+class WatchItem:
+    """An input found in the watch directory."""
+
+    path: Path
+    fingerprint: tuple[int, int]
+
+
+class StatusLedger:
+    """Per-input processing status, persisted atomically as JSON.
+
+    Entries record the input's fingerprint (total size, newest mtime), so an
+    input is processed again only if it changes after finishing.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                loaded = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring malformed watch ledger: %s", path)
+            else:
+                self._entries = loaded if isinstance(loaded, dict) else {}
+
+    def is_finished(self, item: WatchItem) -> bool:
+        """Whether the item was already handled in its current form."""
+        with self._lock:
+            entry = self._entries.get(item.path.name)
+        return (
+            entry is not None
+            and entry.get("status") in {STATUS_DONE, STATUS_FAILED, STATUS_REJECTED}
+            and tuple(entry.get("fingerprint", ())) == item.fingerprint
+        )
+
+    def status(self, name: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(name)
+        return entry.get("status") if entry else None
+
+    def record(self, item: WatchItem, status: str, **details: object) -> None:
+        """Store an item's status and rewrite the ledger file atomically."""
+        with self._lock:
+            self._entries[item.path.name] = {
+                "status": status,
+                "fingerprint": list(item.fingerprint),
+                "updated": time.time(),
+                **details,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(f"{self.path.name}.tmp")
+            partial.write_text(json.dumps(self._entries, indent=2), encoding="utf-8")
+            os.replace(partial, self.path)
+
+
+def scan_inputs(watch_dir: Path, settle_seconds: float = 10.0) -> list[WatchItem]:
+    """Find complete inputs in a watch directory.
+
+    An input (file or export directory) is complete when a ``.ready`` marker
+    sits next to it, or when nothing in it has been modified for
+    ``settle_seconds``.
+
+    Args:
+        watch_dir: Directory to scan.
+        settle_seconds: Quiet period after the last write.
+
+    Returns:
+        Complete inputs sorted by name.
+    """
+    now = time.time()
+    items = []
+    for path in sorted(watch_dir.iterdir()):
+        if path.name.startswith(".") or path.name.endswith(READY_SUFFIX):
+            continue
+        size, newest = _fingerprint(path)
+        marked = path.with_name(path.name + READY_SUFFIX).exists()
+        if marked or now - newest / 1e9 >= settle_seconds:
+            items.append(WatchItem(path=path, fingerprint=(size, newest)))
+    return items
+
+
+def watch(
+    watch_dir: Path,
+    output_root: Path,
+    parts: list[str],
+    genre: str,
+    formats: list[str],
+    workers: int = 2,
+    poll_seconds: float = 5.0,
+    settle_seconds: float = 10.0,
+    cache: TranscriptionCache | None = None,
+    once: bool = False,
+    stop: threading.Event | None = None,
+) -> StatusLedger:
+    """Transcribe inputs dropped into a directory until stopped.
+
+    Inputs run through ``pipeline.run_job`` on a bounded thread pool in
+    this process, so loaded models stay warm across items. Each item is
+    committed as the job ``output_root/<input name>``; the ledger in
+    ``output_root`` makes restarts skip finished items. Failed inputs are
+    retried only after they change.
+
+    Args:
+        watch_dir: Directory to watch.
+        output_root: Directory receiving one output folder per input.
+        parts: Requested parts.
+        genre: Genre preset name.
+        formats: Output formats.
+        workers: Inputs processed at the same time.
+        poll_seconds: Delay between directory scans.
+        settle_seconds: Quiet period before an unmarked input counts as complete.
+        cache: Transcription cache shared by all items.
+        once: Process what is complete now, wait for it, and return.
+        stop: Event that ends watching after in-flight items finish.
+
+    Returns:
+        The status ledger.
+    """
+    output_root.mkdir(parents=True, exist_ok=True)
+    ledger = StatusLedger(output_root / LEDGER_FILENAME)
+    stop = stop or threading.Event()
+    in_flight: dict[str, Future[str]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        while True:
+            for name in [name for name, future in in_flight.items() if future.done()]:
+                del in_flight[name]
+            for item in scan_inputs(watch_dir, settle_seconds):
+                if item.path.name in in_flight or ledger.is_finished(item):
+                    continue
+                in_flight[item.path.name] = executor.submit(
+                    _process_item, item, output_root, parts, genre, formats, cache, ledger
+                )
+            if once or stop.wait(poll_seconds):
+                break
+    logger.info("Stopped watching %s", watch_dir)
+    return ledger
+
+
+def _process_item(
+    item: WatchItem,
+    output_root: Path,
+    parts: list[str],
+    genre: str,
+    formats: list[str],
+    cache: TranscriptionCache | None,
+    ledger: StatusLedger,
+) -> str:
+    try:
+        route = router.InputRouter().route(item.path)
+    except FileNotFoundError:
+        logger.info("Ignoring unsupported input %s", item.path)
+        ledger.record(item, STATUS_REJECTED)
+        return STATUS_REJECTED
+
+    logger.info("Processing %s (%s)", item.path, route)
+    try:
+        result = pipeline.run_job(
+            input_path=item.path,
+            output_root=output_root,
+            parts=parts,
+            genre=genre,
+            formats=formats,
+            cache=cache,
+            job_id=item.path.name,
+        )
+    except Exception as exc:
+        logger.exception("Failed to process %s", item.path)
+        ledger.record(item, STATUS_FAILED, error=str(exc))
+        return STATUS_FAILED
+    ledger.record(item, STATUS_DONE, output_dir=str(result["output_dir"]))
+    return STATUS_DONE
+
+
+def _fingerprint(path: Path) -> tuple[int, int]:
+    """Total size and newest modification time (ns) of a file or tree."""
+    if path.is_file():
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+    size, newest = 0, path.stat().st_mtime_ns
+    for child in path.rglob("*"):
+        if child.is_file():
+            stat = child.stat()
+            size += stat.st_size
+            newest = max(newest, stat.st_mtime_ns)
+    return size, newest
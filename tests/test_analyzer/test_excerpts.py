@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from stemscore import analyzer
+from stemscore.analyzer.excerpts import select_excerpts, tempo_agreement
+from stemscore.config import AnalysisConfig
+
+
+def test_select_excerpts_prefers_onsets() -> None:
+    sr = 1000
+    audio = np.full(60 * sr, 0.01, dtype=np.float32)
+    # Bursts only in the second half of the first third.
+    for start in range(12 * sr, 20 * sr, sr // 2):
+        audio[start : start + 50] = 1.0
+
+    ranges = select_excerpts(audio, sr, count=3, excerpt_seconds=5.0)
+
+    assert len(ranges) == 3
+    first_start, first_end = ranges[0]
+    assert 10 * sr <= first_start < 20 * sr
+    assert first_end - first_start == 5 * sr
+    assert ranges[1][0] >= 20 * sr
+
+
+def test_tempo_agreement_tolerates_small_drift() -> None:
+    tempo, confidence = tempo_agreement([120.0, 121.0, 90.0])
+    assert tempo == pytest.approx(120.5)
+    assert confidence == pytest.approx(2 / 3)
+
+
+def test_fast_analyze_escalates_on_disagreement(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sr = 1000
+    audio = np.random.default_rng(0).standard_normal(120 * sr).astype(np.float32)
+    monkeypatch.setattr(analyzer, "load_audio", lambda path: (audio, sr))
+    monkeypatch.setattr(analyzer, "detect_time_signature", lambda audio, sr, tempo: 4)
+    monkeypatch.setattr(
+        analyzer, "track_beats", lambda audio, sr: (120.0, np.array([0.0, 0.5]))
+    )
+
+    config = AnalysisConfig(fast_analysis=True, detect_repeats=False)
+    monkeypatch.setattr(analyzer, "detect_key", lambda audio, sr: "C major")
+    grids: list[float] = []
+
+    def fake_grid(audio: np.ndarray, sr: int, bpm: float) -> np.ndarray:
+        grids.append(bpm)
+        return np.array([0.25, 0.75])
+
+    monkeypatch.setattr(analyzer, "beat_grid", fake_grid)
+    result = analyzer.analyze(tmp_path / "mix.wav", config)
+    assert result.confidence is not None
+    assert not result.confidence.escalated
+    assert result.key == "C major"
+    assert result.beat_times == (0.25, 0.75)
+    assert grids == [120.0]
+    assert analyzer.analyze(tmp_path / "mix.wav", config, beats=False).beat_times == ()
+
+    keys = iter(["C major", "A minor", "F major", "C major"])
+    monkeypatch.setattr(analyzer, "detect_key", lambda audio, sr: next(keys))
+    result = analyzer.analyze(tmp_path / "mix.wav", config)
+    assert result.confidence is not None
+    assert result.confidence.escalated
+    assert result.confidence.key == pytest.approx(1 / 3)
+    assert result.beat_times == (0.0, 0.5)
@@ -42,3 +42,38 @@ def test_detect_key_minor(monkeypatch: pytest.MonkeyPatch) -> None:
     audio = np.zeros(22050, dtype=np.float32)
     key = detect_key(audio, 22050)
     assert key.endswith("minor")
+
+
+def test_track_key_follows_modulation(monkeypatch: pytest.MonkeyPatch) -> None:
+    from stemscore.analyzer.key_detect import track_key
+
+    major_scale = [0, 2, 4, 5, 7, 9, 11]
+    chroma = np.zeros((12, 860), dtype=np.float32)
+    chroma[major_scale, :430] = 1.0
+    chroma[0, :430] = 2.0
+    # Up a whole step to D major for the second half.
+    d_major = [(pitch + 2) % 12 for pitch in major_scale]
+    chroma[d_major, 430:] = 1.0
+    chroma[2, 430:] = 2.0
+
+    class DummyFeature:
+        @staticmethod
+        def chroma_stft(y: np.ndarray, sr: int) -> np.ndarray:
+            return chroma
+
+    class DummyLibrosa:
+        feature = DummyFeature
+
+    monkeypatch.setitem(__import__("sys").modules, "librosa", DummyLibrosa)
+
+    audio = np.zeros(22050, dtype=np.float32)
+    global_key, segments = track_key(audio, 22050, window_seconds=4.0)
+
+    assert global_key.endswith("major")
+    # A window straddling the modulation may briefly read as the shared key.
+    assert segments[0].key == "C major"
+    assert segments[-1].key == "D major"
+    assert len(segments) <= 3
+    assert segments[0].start == 0.0
+    assert abs(segments[-1].start - 430 * 512 / 22050) < 4.1
+    assert segments[-1].end == 860 * 512 / 22050
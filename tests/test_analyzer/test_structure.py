@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import sys
+from types import ModuleType
+
+import numpy as np
+import pytest
+
+from stemscore.analyzer.structure import (
+    RepeatedSection,
+    SectionMap,
+    confirm_repeats,
+    detect_sections,
+)
+
+
+def _install_fake_chroma(monkeypatch: pytest.MonkeyPatch, chroma: np.ndarray) -> None:
+    librosa = ModuleType("librosa")
+    feature = ModuleType("librosa.feature")
+    feature.chroma_stft = lambda y, sr, hop_length: chroma
+    librosa.feature = feature
+    monkeypatch.setitem(sys.modules, "librosa", librosa)
+    monkeypatch.setitem(sys.modules, "librosa.feature", feature)
+
+
+def test_detect_sections_finds_repeated_chorus(monkeypatch: pytest.MonkeyPatch) -> None:
+    sr = 4096
+    rng = np.random.default_rng(3)
+    # One chroma frame per second: verse (10 s), chorus (12 s), verse, chorus.
+    verse = rng.random((12, 10))
+    chorus = rng.random((12, 12))
+    other_verse = rng.random((12, 10))
+    chroma = np.concatenate([verse, chorus, other_verse, chorus], axis=1)
+    _install_fake_chroma(monkeypatch, chroma)
+
+    section_map = detect_sections(np.zeros(chroma.shape[1] * sr), sr, min_seconds=8.0)
+
+    assert len(section_map.repeats) == 1
+    repeat = section_map.repeats[0]
+    assert repeat.source_start == pytest.approx(10.0, abs=2.0)
+    assert repeat.start == pytest.approx(32.0, abs=2.0)
+    assert repeat.offset == pytest.approx(22.0)
+
+
+def test_replicate_notes_copies_source_onto_repeat() -> None:
+    section_map = SectionMap(
+        duration=40.0,
+        repeats=(RepeatedSection(start=30.0, end=35.0, source_start=10.0, similarity=0.95),),
+    )
+    notes = [
+        {"start": 1.0, "end": 2.0, "pitch": 60},
+        {"start": 11.0, "end": 12.0, "pitch": 64},
+        {"start": 14.5, "end": 16.0, "pitch": 67},
+    ]
+
+    replicated = section_map.replicate_notes(notes)
+
+    assert [note["start"] for note in replicated] == [1.0, 11.0, 14.5, 31.0, 34.5]
+    assert replicated[-1]["end"] == 35.0
+    assert replicated[-1]["pitch"] == 67
+
+
+def test_confirm_repeats_drops_spans_the_stem_does_not_repeat(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sr = 4096
+    rng = np.random.default_rng(5)
+    # One CQT frame per second: the stem repeats its chorus but not its verse.
+    verse, chorus = rng.random((84, 10)), rng.random((84, 10))
+    spectrum = np.concatenate([verse, chorus, rng.random((84, 10)), chorus], axis=1)
+    librosa = ModuleType("librosa")
+    librosa.cqt = lambda y, sr, hop_length, n_bins: spectrum
+    monkeypatch.setitem(sys.modules, "librosa", librosa)
+    candidates = SectionMap(
+        duration=40.0,
+        repeats=(
+            RepeatedSection(start=20.0, end=30.0, source_start=0.0, similarity=0.95),
+            RepeatedSection(start=30.0, end=40.0, source_start=10.0, similarity=0.95),
+        ),
+        threshold=0.99,
+    )
+
+    confirmed = confirm_repeats(np.zeros(40 * sr), sr, candidates)
+
+    assert confirmed.repeats == candidates.repeats[1:]
+    assert confirmed.threshold == 0.99
@@ -28,3 +28,53 @@ def test_detect_tempo_uses_librosa(monkeypatch: pytest.MonkeyPatch) -> None:
 
     tempo = detect_tempo(audio, sr)
     assert tempo == pytest.approx(123.4)
+
+
+def test_track_beats_returns_beat_times(monkeypatch: pytest.MonkeyPatch) -> None:
+    from stemscore.analyzer.tempo import track_beats
+
+    class DummyBeat:
+        @staticmethod
+        def beat_track(y: np.ndarray, sr: int) -> tuple[np.ndarray, np.ndarray]:
+            return np.array([120.0]), np.array([0, 43, 86])
+
+    class DummyLibrosa:
+        beat = DummyBeat
+
+        @staticmethod
+        def frames_to_time(frames: np.ndarray, sr: int) -> np.ndarray:
+            return frames * 512 / sr
+
+    monkeypatch.setitem(__import__("sys").modules, "librosa", DummyLibrosa)
+
+    tempo, beats = track_beats(np.zeros(22050, dtype=np.float32), 22050)
+    assert tempo == pytest.approx(120.0)
+    assert beats == pytest.approx([0.0, 0.9985, 1.997], abs=1e-3)
+
+
+def _click_track(bpm: float, sr: int = 22050, seconds: float = 20.0) -> np.ndarray:
+    audio = np.zeros(int(sr * seconds), dtype=np.float32)
+    click = np.hanning(200) * np.sin(2 * np.pi * 1000 * np.arange(200) / sr)
+    for beat in np.arange(0.0, seconds - 0.1, 60.0 / bpm):
+        start = int(beat * sr)
+        audio[start : start + 200] += click
+    return audio
+
+
+def test_estimate_tempo_on_click_track() -> None:
+    from stemscore.analyzer.tempo import estimate_tempo
+
+    estimate = estimate_tempo(_click_track(128.0), 22050)
+
+    assert estimate.bpm == pytest.approx(128.0, rel=0.01)
+    assert estimate.confidence > 0.8
+    assert np.diff(estimate.beat_times) == pytest.approx(60.0 / 128.0, abs=0.03)
+
+
+def test_estimate_tempo_octave_correction_uses_prior() -> None:
+    from stemscore.analyzer.tempo import estimate_tempo
+
+    audio = _click_track(140.0)
+
+    assert estimate_tempo(audio, 22050, prior_bpm=140.0).bpm == pytest.approx(140.0, rel=0.01)
+    assert estimate_tempo(audio, 22050, prior_bpm=70.0).bpm == pytest.approx(70.0, rel=0.01)
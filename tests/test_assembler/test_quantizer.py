@@ -16,3 +16,22 @@ def test_quantize_snaps_to_grid() -> None:
     assert note["duration_ticks"] == 240
     assert note["start"] == 0.125
     assert note["end"] == 0.375
+
+
+def test_quantize_follows_tempo_map() -> None:
+    from stemscore.assembler.tempo_map import TempoMap
+
+    # The performance slows to 100 BPM after beat 2; notes sit on the beats.
+    beats = [0.0, 0.5, 1.0, 1.6, 2.2, 2.8]
+    tempo_map = TempoMap.from_beat_times(beats)
+    notes = [
+        {"start": 1.61, "end": 2.19, "pitch": 60},
+        {"start": 2.5, "end": 2.8, "pitch": 62},
+    ]
+
+    quantized = quantize_notes(notes, tempo=120.0, level=16, tempo_map=tempo_map)
+
+    assert [note["tick"] for note in quantized] == [3 * 480, 4 * 480 + 240]
+    assert [note["duration_ticks"] for note in quantized] == [480, 240]
+    assert quantized[0]["start"] == 1.6
+    assert quantized[1]["end"] == 2.8
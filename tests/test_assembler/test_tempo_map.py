@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from stemscore.assembler.tempo_map import TempoMap
+
+
+def test_tempo_map_round_trips_and_extrapolates() -> None:
+    # Accelerating from 120 to 150 BPM, first beat detected at 0.3 s.
+    beats = 0.3 + np.concatenate([[0.0], np.cumsum([0.5, 0.5, 0.4, 0.4])])
+    tempo_map = TempoMap.from_beat_times(beats.tolist())
+    assert tempo_map is not None
+
+    # One beat of lead-in is extrapolated before the first detected beat.
+    assert tempo_map.seconds_to_beats(np.array([0.3, 1.3, 1.5])) == pytest.approx([1.0, 3.0, 3.5])
+    assert tempo_map.seconds_to_beats(np.array([2.5])) == pytest.approx([6.0])
+    positions = np.array([0.5, 2.25, 4.0])
+    assert tempo_map.seconds_to_beats(tempo_map.beats_to_seconds(positions)) == pytest.approx(
+        positions
+    )
+
+
+def test_tempo_changes_follow_local_tempo() -> None:
+    periods = [0.5] * 8 + [0.4] * 8
+    beats = np.concatenate([[0.0], np.cumsum(periods)])
+    tempo_map = TempoMap.from_beat_times(beats.tolist())
+    assert tempo_map is not None
+
+    changes = tempo_map.tempo_changes()
+
+    assert changes[0] == (0.0, 120.0)
+    assert changes[-1][1] == 150.0
+    assert 6.0 <= changes[-1][0] <= 9.0
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+
+import pytest
+
+from stemscore.budget import LIGHT_SEPARATION_MODEL, CostModel, fit_to_deadline, plan_execution
+from stemscore.config import GenrePreset
+
+PARTS = ["lead_vocal", "bass", "drums", "chords"]
+
+
+def test_generous_deadline_keeps_full_quality() -> None:
+    preset = GenrePreset()
+
+    plan = fit_to_deadline(preset, "route_b", 180.0, PARTS, deadline_seconds=3600.0)
+
+    assert plan.degradations == ()
+    assert plan.preset == preset
+    assert plan.meets_deadline
+    assert set(plan.stage_seconds) == {"analysis", "separation", "transcription", "assembly"}
+
+
+def test_degrades_in_order_until_deadline_fits() -> None:
+    model = CostModel.default()
+    full = sum(model.estimate(GenrePreset(), "route_b", 180.0, PARTS).values())
+
+    plan = fit_to_deadline(GenrePreset(), "route_b", 180.0, PARTS, deadline_seconds=full * 0.5)
+
+    assert plan.degradations == ("excerpt_analysis", "beat_chords", "light_separation")
+    assert plan.preset.analysis.fast_analysis
+    assert plan.preset.transcription.chord_sync == "beat"
+    assert plan.preset.separation.stage1_model == LIGHT_SEPARATION_MODEL
+    assert plan.meets_deadline
+
+
+def test_unreachable_deadline_skips_inapplicable_degradations() -> None:
+    plan = fit_to_deadline(GenrePreset(), "route_a", 180.0, ["lead_vocal"], deadline_seconds=1.0)
+
+    assert plan.degradations == ("excerpt_analysis",)
+    assert not plan.meets_deadline
+
+
+def test_calibration_overrides_defaults(tmp_path: Path) -> None:
+    path = tmp_path / "calibration.json"
+    path.write_text(
+        json.dumps(
+            {
+                "realtime_factors": {"transcription.pitch": 1.0},
+                "memory_mb": {"transcription.pitch": {"base": 500.0, "per_second": 2.0}},
+            }
+        )
+    )
+
+    model = CostModel.load(path)
+    stages = model.estimate(GenrePreset(), "route_a", 10.0, ["bass"])
+
+    assert stages["transcription"] == pytest.approx(10.0)
+    assert "separation" not in stages
+    assert model.peak_memory(GenrePreset(), "route_a", 10.0, ["bass"])[
+        "transcription"
+    ] == pytest.approx(520.0)
+    path.write_text("[]")
+    with pytest.raises(ValueError):
+        CostModel.load(path)
+
+
+def test_plan_execution_reports_stages_and_peak_memory() -> None:
+    model = CostModel.default()
+
+    plan = plan_execution(
+        GenrePreset(), "route_a", 60.0, ["lead_vocal", "drums"], model, analysis_known=True
+    )
+
+    assert [stage.name for stage in plan.stages] == ["analysis", "transcription", "assembly"]
+    assert plan.stages[0].tiers == () and plan.stages[0].seconds == 0.0
+    assert plan.stages[1].tiers == ("transcription.pitch", "transcription.drums")
+    assert plan.peak_memory_mb == max(stage.peak_memory_mb for stage in plan.stages)
+    payload = plan.to_dict()
+    assert payload["estimated_seconds"] == pytest.approx(plan.estimated_seconds)
+    json.dumps(payload)
+
+
+def test_known_analysis_still_runs_when_beats_are_needed() -> None:
+    model = CostModel.default()
+    preset = GenrePreset()
+    beat_preset = preset.model_copy(
+        update={"transcription": preset.transcription.model_copy(update={"chord_sync": "beat"})}
+    )
+
+    frame_tiers = model.stage_tiers(preset, "route_a", ["chords"], analysis_known=True)
+    beat_tiers = model.stage_tiers(beat_preset, "route_a", ["chords"], analysis_known=True)
+
+    assert frame_tiers["analysis"] == []
+    assert beat_tiers["analysis"] == ["analysis.full"]
+
+
+def test_pitch_memory_scales_with_workers() -> None:
+    model = CostModel(
+        realtime_factors={},
+        memory_mb={"transcription.pitch": (400.0, 1.0), "transcription.drums": (900.0, 0.0)},
+    )
+    preset = GenrePreset()
+    parallel = preset.model_copy(
+        update={"transcription": preset.transcription.model_copy(update={"pitch_workers": 3})}
+    )
+    parts = ["lead_vocal", "drums"]
+
+    single = model.peak_memory(preset, "route_a", 100.0, parts)["transcription"]
+    scaled = model.peak_memory(parallel, "route_a", 100.0, parts)["transcription"]
+
+    assert single == pytest.approx(900.0)
+    assert scaled == pytest.approx(3 * 400.0 + 100.0)
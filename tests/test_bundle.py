@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from stemscore.assembler.snapshot import AssemblySnapshot
+from stemscore.bundle import ProjectBundle, save_bundle
+from stemscore.utils.exceptions import BundleError
+
+
+def test_bundle_round_trip(tmp_path: Path) -> None:
+    stem = tmp_path / "bass.wav"
+    audio = (0.5 * np.sin(np.linspace(0, 200, 22050))).astype(np.float32)
+    sf.write(stem, audio, 22050, subtype="PCM_16")
+    snapshot = AssemblySnapshot(
+        parts={
+            "bass": [{"start": 0.0, "end": 0.5, "pitch": 40, "velocity": 90}],
+            "lead_vocal": [
+                {"start": 0.1, "end": 0.2, "pitch": 62, "grace": True},
+                {"start": 0.2, "end": 0.9, "pitch": 64},
+            ],
+        },
+        tempo=120.0,
+        key="E minor",
+        time_signature=4,
+        beat_times=(0.0, 0.5),
+    )
+
+    save_bundle(tmp_path / "job.stemscore", snapshot, stems={"bass": stem})
+    bundle = ProjectBundle.open(tmp_path / "job.stemscore")
+
+    assert bundle.snapshot() == snapshot
+    columns = bundle.note_columns("lead_vocal")
+    assert isinstance(columns["pitch"], np.memmap)
+    stem_path = bundle.stem_path("bass")
+    assert stem_path is not None and stem_path.suffix == ".flac"
+    decoded, sr = sf.read(stem_path, dtype="float32")
+    assert sr == 22050
+    assert np.allclose(decoded, audio, atol=1e-4)
+    assert bundle.stem_path("lead_vocal") is None
+
+
+def test_open_rejects_non_bundle(tmp_path: Path) -> None:
+    with pytest.raises(BundleError):
+        ProjectBundle.open(tmp_path)
+
+
+def test_bundle_keeps_float_stems_above_full_scale(tmp_path: Path) -> None:
+    stem = tmp_path / "mix.wav"
+    audio = (1.6 * np.sin(np.linspace(0, 200, 22050))).astype(np.float32)
+    sf.write(stem, audio, 22050, subtype="FLOAT")
+    bundle = ProjectBundle.create(tmp_path / "job.stemscore")
+
+    bundle.write_stem("backing_harmony", stem)
+
+    stem_path = bundle.stem_path("backing_harmony")
+    assert stem_path is not None and stem_path.suffix == ".wav"
+    decoded, _ = sf.read(stem_path, dtype="float32")
+    assert np.allclose(decoded, audio)
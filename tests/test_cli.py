@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from stemscore import cli
+
+
+def test_transcribe_writes_a_job_directory_by_default(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    calls: list[tuple] = []
+
+    def fake_run_job(input_path, output_root, parts, genre, formats, **kwargs):
+        calls.append((input_path, output_root, parts, kwargs["deadline_seconds"]))
+        return {
+            "tempo": 120.0,
+            "key": "C",
+            "time_signature": 4,
+            "output_files": {"midi": output_root / "job-1" / "score.mid"},
+            "degradations": ["excerpt_analysis"],
+            "job_id": "job-1",
+            "output_dir": output_root / "job-1",
+        }
+
+    monkeypatch.setattr(cli.pipeline, "run_job", fake_run_job)
+    song = tmp_path / "song.wav"
+    song.touch()
+
+    result = CliRunner().invoke(
+        cli.app,
+        [
+            "transcribe",
+            str(song),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--parts",
+            "bass",
+            "--no-cache",
+            "--deadline",
+            "30",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert calls == [(song, tmp_path / "out", ["bass"], 30.0)]
+    assert "excerpt_analysis" in result.output
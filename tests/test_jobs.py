@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+import hashlib
+
+from stemscore.jobs import MANIFEST_FILENAME, JobDirectory, new_job_id, read_manifest
+
+
+def test_commit_writes_manifest_and_renames(tmp_path: Path) -> None:
+    job = JobDirectory.begin(tmp_path, "job-1")
+    (job.staging / "stems").mkdir()
+    (job.staging / "stems" / "bass.wav").write_bytes(b"RIFF")
+    (job.staging / "score.mid").write_bytes(b"MThd")
+
+    final = job.commit({"route": "route_b"})
+
+    assert final == tmp_path / "job-1"
+    assert not job.staging.exists()
+    assert job.final_path(job.staging / "score.mid") == final / "score.mid"
+    manifest = read_manifest(final)
+    assert manifest["job_id"] == "job-1"
+    assert manifest["route"] == "route_b"
+    assert [entry["path"] for entry in manifest["files"]] == ["score.mid", "stems/bass.wav"]
+    assert manifest["files"][0]["sha256"] == hashlib.sha256(b"MThd").hexdigest()
+    assert (final / MANIFEST_FILENAME).exists()
+
+
+def test_discard_and_unique_ids(tmp_path: Path) -> None:
+    job = JobDirectory.begin(tmp_path)
+    (job.staging / "score.mid").write_bytes(b"MThd")
+
+    job.discard()
+
+    assert list(tmp_path.iterdir()) == []
+    first, second = new_job_id(tmp_path / "My Song!.wav"), new_job_id(tmp_path / "My Song!.wav")
+    assert first != second
+    assert "-My-Song-" in first
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from stemscore import analyzer, assembler, pipeline, transcriber
 
 
@@ -11,7 +13,7 @@ def test_run_pipeline_route_b(monkeypatch, tmp_path: Path) -> None:
 
     analysis_result = analyzer.AnalysisResult(tempo=120.0, key="C", time_signature=4)
     monkeypatch.setattr(pipeline.router.InputRouter, "route", lambda self, path: "route_b")
-    monkeypatch.setattr(pipeline.analyzer, "analyze", lambda path: analysis_result)
+    monkeypatch.setattr(pipeline.analyzer, "analyze", lambda path, config=None, **kwargs: analysis_result)
     monkeypatch.setattr(
         pipeline.separator,
         "separate",
@@ -20,7 +22,7 @@ def test_run_pipeline_route_b(monkeypatch, tmp_path: Path) -> None:
     monkeypatch.setattr(
         pipeline.transcriber,
         "transcribe_part",
-        lambda path, part, config: transcriber.TranscriptionResult(
+        lambda path, part, config, **kwargs: transcriber.TranscriptionResult(
             notes=[{"start": 0.0, "end": 1.0, "pitch": 60}],
             part_name=part,
             method="mock",
@@ -29,7 +31,7 @@ def test_run_pipeline_route_b(monkeypatch, tmp_path: Path) -> None:
     monkeypatch.setattr(
         pipeline.assembler,
         "assemble",
-        lambda parts, tempo, key, time_signature, output_dir, formats, level, swing: assembler.AssemblyResult(
+        lambda parts, tempo, key, time_signature, output_dir, formats, level, swing, **kwargs: assembler.AssemblyResult(
             output_files={"midi": tmp_path / "score.mid"},
             num_parts=len(parts),
             total_notes=1,
@@ -49,19 +51,60 @@ def test_run_pipeline_route_b(monkeypatch, tmp_path: Path) -> None:
     assert result["output_files"]["midi"] == tmp_path / "score.mid"
 
 
+def test_run_pipeline_bundles_stems_only_on_request(monkeypatch, tmp_path: Path) -> None:
+    import numpy as np
+    import soundfile as sf
+
+    from stemscore.bundle import DEFAULT_BUNDLE_NAME, ProjectBundle
+
+    input_path = tmp_path / "mix.wav"
+    input_path.touch()
+    vocals = tmp_path / "vocals.wav"
+    sf.write(vocals, np.zeros(800, dtype=np.float32), 8000, subtype="PCM_16")
+    analysis_result = analyzer.AnalysisResult(tempo=120.0, key="C", time_signature=4)
+    monkeypatch.setattr(pipeline.router.InputRouter, "route", lambda self, path: "route_b")
+    monkeypatch.setattr(pipeline.analyzer, "analyze", lambda path, config=None, **kwargs: analysis_result)
+    monkeypatch.setattr(
+        pipeline.separator, "separate", lambda path, output_dir, model: {"vocals": vocals}
+    )
+    monkeypatch.setattr(
+        pipeline.transcriber,
+        "transcribe_part",
+        lambda path, part, config, **kwargs: transcriber.TranscriptionResult(
+            notes=[{"start": 0.0, "end": 1.0, "pitch": 60}], part_name=part, method="mock"
+        ),
+    )
+    monkeypatch.setattr(
+        pipeline.assembler,
+        "assemble",
+        lambda parts, tempo, key, time_signature, output_dir, formats, level, swing, **kwargs: assembler.AssemblyResult(
+            output_files={}, num_parts=len(parts), total_notes=1
+        ),
+    )
+
+    for bundle_stems in (False, True):
+        output_dir = tmp_path / f"out-{bundle_stems}"
+        pipeline.run_pipeline(
+            input_path, output_dir, ["lead_vocal"], "pop", ["midi"], bundle_stems=bundle_stems
+        )
+        bundle = ProjectBundle.open(output_dir / DEFAULT_BUNDLE_NAME)
+        assert bundle.parts == ["lead_vocal"]
+        assert (bundle.stem_path("lead_vocal") is not None) == bundle_stems
+
+
 def test_run_pipeline_route_a(monkeypatch, tmp_path: Path) -> None:
     analysis_result = analyzer.AnalysisResult(tempo=98.0, key="G", time_signature=3)
     monkeypatch.setattr(pipeline.router.InputRouter, "route", lambda self, path: "route_a")
-    monkeypatch.setattr(pipeline.analyzer, "analyze", lambda path: analysis_result)
+    monkeypatch.setattr(pipeline.analyzer, "analyze", lambda path, config=None, **known: analysis_result)
     monkeypatch.setattr(
         pipeline,
         "import_suno",
-        lambda input_dir: {"lead_vocal": tmp_path / "lead.wav"},
+        lambda input_dir, **kwargs: {"lead_vocal": tmp_path / "lead.wav"},
     )
     monkeypatch.setattr(
         pipeline.transcriber,
         "transcribe_part",
-        lambda path, part, config: transcriber.TranscriptionResult(
+        lambda path, part, config, **kwargs: transcriber.TranscriptionResult(
             notes=[{"start": 0.0, "end": 1.0, "pitch": 60}],
             part_name=part,
             method="mock",
@@ -70,7 +113,7 @@ def test_run_pipeline_route_a(monkeypatch, tmp_path: Path) -> None:
     monkeypatch.setattr(
         pipeline.assembler,
         "assemble",
-        lambda parts, tempo, key, time_signature, output_dir, formats, level, swing: assembler.AssemblyResult(
+        lambda parts, tempo, key, time_signature, output_dir, formats, level, swing, **kwargs: assembler.AssemblyResult(
             output_files={"midi": tmp_path / "score.mid"},
             num_parts=len(parts),
             total_notes=1,
@@ -88,3 +131,148 @@ def test_run_pipeline_route_a(monkeypatch, tmp_path: Path) -> None:
     assert result["route"] == "route_a"
     assert result["tempo"] == 98.0
     assert result["output_files"]["midi"] == tmp_path / "score.mid"
+
+
+def test_reassemble_uses_saved_notes(monkeypatch, tmp_path: Path) -> None:
+    from stemscore.bundle import DEFAULT_BUNDLE_NAME, save_bundle
+
+    notes = {"bass": [{"start": 0.0, "end": 1.0, "pitch": 40}]}
+    save_bundle(
+        tmp_path / DEFAULT_BUNDLE_NAME,
+        assembler.AssemblySnapshot(
+            parts=notes, tempo=110.0, key="E minor", time_signature=4, genre="jazz"
+        ),
+    )
+    calls: list[dict] = []
+
+    def fake_assemble(parts, tempo, key, time_signature, output_dir, formats, level, swing, **kwargs):
+        calls.append({"parts": parts, "tempo": tempo, "level": level, "swing": swing})
+        return assembler.AssemblyResult(
+            output_files={"pdf": tmp_path / "score.pdf"}, num_parts=1, total_notes=1
+        )
+
+    monkeypatch.setattr(pipeline.assembler, "assemble", fake_assemble)
+    monkeypatch.setattr(
+        pipeline.transcriber, "transcribe_part", lambda *args, **kwargs: pytest.fail("transcribed")
+    )
+
+    result = pipeline.reassemble(tmp_path, ["pdf"], level=16)
+
+    assert calls == [{"parts": notes, "tempo": 110.0, "level": 16, "swing": True}]
+    assert result["output_files"] == {"pdf": tmp_path / "score.pdf"}
+
+
+def test_run_job_commits_into_job_directory(monkeypatch, tmp_path: Path) -> None:
+    def fake_run_pipeline(input_path, output_dir, parts, genre, formats, **kwargs) -> dict:
+        (output_dir / "score.mid").write_bytes(b"MThd")
+        return {
+            "route": "route_b",
+            "tempo": 120.0,
+            "key": "C major",
+            "time_signature": 4,
+            "output_files": {"midi": output_dir / "score.mid"},
+        }
+
+    monkeypatch.setattr(pipeline, "run_pipeline", fake_run_pipeline)
+    output_root = tmp_path / "output"
+
+    first = pipeline.run_job(tmp_path / "mix.wav", output_root, ["bass"], "pop", ["midi"])
+    second = pipeline.run_job(tmp_path / "mix.wav", output_root, ["bass"], "pop", ["midi"])
+
+    assert first["output_dir"] != second["output_dir"]
+    assert first["output_files"]["midi"] == first["output_dir"] / "score.mid"
+    assert first["output_files"]["midi"].read_bytes() == b"MThd"
+    assert sorted(path.name for path in output_root.iterdir()) == sorted(
+        [first["job_id"], second["job_id"]]
+    )
+
+
+def test_dry_run_plans_without_running(monkeypatch, tmp_path: Path) -> None:
+    import numpy as np
+    import soundfile as sf
+
+    input_path = tmp_path / "mix.wav"
+    sf.write(input_path, np.zeros(22050 * 3, dtype=np.float32), 22050)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("dry run must not run stages")
+
+    monkeypatch.setattr(pipeline.analyzer, "analyze", fail)
+    monkeypatch.setattr(pipeline.separator, "separate", fail)
+
+    plan = pipeline.run_pipeline(
+        input_path=input_path,
+        output_dir=tmp_path / "out",
+        parts=["bass", "drums"],
+        genre="pop",
+        formats=["midi"],
+        cost_model=pipeline.budget.CostModel.default(),
+        dry_run=True,
+    )
+
+    assert plan["route"] == "route_b"
+    assert plan["duration"] == pytest.approx(3.0)
+    assert [stage["name"] for stage in plan["stages"]] == [
+        "analysis",
+        "separation",
+        "transcription",
+        "assembly",
+    ]
+    assert plan["stages"][2]["tiers"] == ["transcription.drums", "transcription.pitch"]
+    assert plan["peak_memory_mb"] > 0
+    assert not (tmp_path / "out").exists()
+
+
+def test_plan_pipeline_uses_validated_suno_stems(tmp_path: Path) -> None:
+    import numpy as np
+    import soundfile as sf
+
+    sr = 8000
+    stems_dir = tmp_path / "export" / "stems"
+    stems_dir.mkdir(parents=True)
+    tone = 0.2 * np.sin(np.linspace(0, 400, sr)).astype(np.float32)
+    sf.write(stems_dir / "vocals.wav", np.zeros(sr * 4, dtype=np.float32), sr)
+    sf.write(stems_dir / "guitar.wav", tone, sr)
+    sf.write(stems_dir / "keys.wav", np.tile(tone, 2), sr)
+
+    plan = pipeline.plan_pipeline(
+        tmp_path / "export", [], "pop", cost_model=pipeline.budget.CostModel.default()
+    )
+
+    # The silent vocal is dropped, so analysis runs on the longer harmony stem.
+    assert plan.stages[1].tiers == ("transcription.pitch",)
+    assert plan.duration == pytest.approx(2.0)
+    assert not (tmp_path / "export" / "stems" / "backing_harmony.wav").exists()
+
+
+def test_reassemble_recommits_job_manifest(monkeypatch, tmp_path: Path) -> None:
+    from stemscore import jobs
+    from stemscore.bundle import DEFAULT_BUNDLE_NAME, save_bundle
+
+    job = jobs.JobDirectory.begin(tmp_path / "output", "job-1")
+    save_bundle(
+        job.staging / DEFAULT_BUNDLE_NAME,
+        assembler.AssemblySnapshot(
+            parts={"bass": [{"start": 0.0, "end": 1.0, "pitch": 40}]},
+            tempo=110.0,
+            key="E minor",
+            time_signature=4,
+        ),
+    )
+    job_dir = job.commit({"genre": "pop"})
+
+    def fake_assemble(parts, tempo, key, time_signature, output_dir, formats, level, swing, **kwargs):
+        (output_dir / "score.pdf").write_bytes(b"%PDF")
+        return assembler.AssemblyResult(
+            output_files={"pdf": output_dir / "score.pdf"}, num_parts=1, total_notes=1
+        )
+
+    monkeypatch.setattr(pipeline.assembler, "assemble", fake_assemble)
+
+    result = pipeline.reassemble(job_dir, ["pdf"])
+
+    manifest = jobs.read_manifest(job_dir)
+    assert result["output_files"] == {"pdf": job_dir / "score.pdf"}
+    assert manifest["genre"] == "pop"
+    assert "score.pdf" in {entry["path"] for entry in manifest["files"]}
+    assert not job.staging.exists()
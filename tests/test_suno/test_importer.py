@@ -28,3 +28,77 @@ def test_import_suno_maps_filenames(tmp_path: Path) -> None:
 def test_import_suno_missing_stems_dir(tmp_path: Path) -> None:
     with pytest.raises(FileNotFoundError):
         import_suno(tmp_path)
+
+
+def test_import_suno_zip_without_extracting(tmp_path: Path) -> None:
+    import zipfile
+
+    import numpy as np
+    import soundfile as sf
+
+    from stemscore.router import InputRouter
+    from stemscore.suno.importer import read_suno_metadata
+    from stemscore.utils.audio_io import ArchiveMember
+
+    wav = tmp_path / "tone.wav"
+    sf.write(wav, np.full(800, 0.25, dtype=np.float32), 8000)
+    archive = tmp_path / "export.zip"
+    with zipfile.ZipFile(archive, "w") as handle:
+        handle.writestr("song/metadata.json", '{"tempo": 96}')
+        for name in ("vocals", "bass", "drums", "keys"):
+            handle.write(wav, f"song/stems/{name}.wav")
+
+    stems = import_suno(archive)
+
+    assert InputRouter().route(archive) == "route_a"
+    assert stems["bass"] == ArchiveMember(archive=archive, member="song/stems/bass.wav")
+    assert set(stems) == {"lead_vocal", "bass", "drums", "backing_harmony"}
+    with stems["lead_vocal"].open() as handle:
+        audio, sr = sf.read(handle)
+    assert sr == 8000 and audio.shape == (800,)
+    assert read_suno_metadata(archive).tempo == 96.0
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["export.zip", "tone.wav"]
+
+
+def test_import_suno_validates_and_mixes_stems(tmp_path: Path) -> None:
+    import numpy as np
+    import soundfile as sf
+
+    sr = 8000
+    stems_dir = tmp_path / "export" / "stems"
+    stems_dir.mkdir(parents=True)
+    tone = 0.2 * np.sin(np.linspace(0, 400, sr)).astype(np.float32)
+    sf.write(stems_dir / "vocals.wav", tone, sr)
+    sf.write(stems_dir / "guitar.wav", tone, sr)
+    sf.write(stems_dir / "keys.wav", np.stack([tone[: sr // 2]] * 2, axis=1), sr)
+    sf.write(stems_dir / "bass.wav", np.zeros(sr, dtype=np.float32), sr)
+    (stems_dir / "drums.wav").write_bytes(b"RIFF\x00\x00")
+
+    stems = import_suno(tmp_path / "export", work_dir=tmp_path / "work", workers=2)
+
+    assert set(stems) == {"lead_vocal", "backing_harmony"}
+    assert stems["lead_vocal"] == stems_dir / "vocals.wav"
+    mixed, mixed_sr = sf.read(stems["backing_harmony"])
+    assert stems["backing_harmony"] == tmp_path / "work" / "backing_harmony.wav"
+    assert mixed_sr == sr and mixed.shape == (sr, 2)
+    assert np.allclose(mixed[: sr // 2, 0], 2 * tone[: sr // 2], atol=1e-3)
+    assert np.allclose(mixed[sr // 2 :, 1], tone[sr // 2 :], atol=1e-3)
+
+
+def test_mix_stems_scales_mixes_above_full_scale(tmp_path: Path) -> None:
+    import numpy as np
+    import soundfile as sf
+
+    from stemscore.suno.validation import mix_stems, probe_stems
+
+    sr = 8000
+    tone = 0.8 * np.sin(np.linspace(0, 400, sr * 2)).astype(np.float32)
+    paths = [tmp_path / "guitar.wav", tmp_path / "keys.wav"]
+    for path in paths:
+        sf.write(path, tone, sr, subtype="FLOAT")
+
+    mixed_path = mix_stems(probe_stems(paths), tmp_path / "mix.wav")
+
+    mixed, _ = sf.read(mixed_path, dtype="float32")
+    assert np.abs(mixed).max() == pytest.approx(1.0, abs=1e-4)
+    assert np.allclose(mixed, tone / np.abs(tone).max(), atol=1e-4)
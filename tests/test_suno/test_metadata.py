@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from stemscore import analyzer
+from stemscore.config import AnalysisConfig
+from stemscore.suno.metadata import SunoMetadata
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        (
+            {"tempo": "92.5", "key": "Bbm", "time_signature": "6/8"},
+            SunoMetadata(tempo=92.5, key="A# minor", time_signature=6),
+        ),
+        ({"bpm": 120, "key": "F# major", "meter": 3}, SunoMetadata(120.0, "F# major", 3)),
+        ({"key": "A Minor"}, SunoMetadata(key="A minor")),
+        ({"key": "C Major"}, SunoMetadata(key="C major")),
+        ({"key": "Eb MIN"}, SunoMetadata(key="D# minor")),
+        ({"key": "D Maj"}, SunoMetadata(key="D major")),
+        ({"key": "DM"}, SunoMetadata(key="D major")),
+        ({"key": "Dm"}, SunoMetadata(key="D minor")),
+        ({"tempo": -1, "key": "H minor", "time_signature": "x/4"}, SunoMetadata()),
+        (["not", "an", "object"], SunoMetadata()),
+    ],
+)
+def test_metadata_from_payload(payload: object, expected: SunoMetadata) -> None:
+    assert SunoMetadata.from_payload(payload) == expected
+
+
+def test_analyze_skips_known_attributes(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def fail(*args: object, **kwargs: object) -> None:
+        pytest.fail("detector should not run")
+
+    monkeypatch.setattr(analyzer, "load_audio", fail)
+    result = analyzer.analyze(
+        tmp_path / "vocals.wav", tempo=96.0, key="G major", time_signature=3, beats=False
+    )
+    assert (result.tempo, result.key, result.time_signature) == (96.0, "G major", 3)
+
+    monkeypatch.setattr(analyzer, "load_audio", lambda path: (np.zeros(100), 100))
+    monkeypatch.setattr(analyzer, "detect_key", fail)
+    monkeypatch.setattr(analyzer, "track_beats", fail)
+    monkeypatch.setattr(analyzer, "detect_time_signature", lambda audio, sr, tempo: 4)
+    config = AnalysisConfig(detect_repeats=False)
+    result = analyzer.analyze(tmp_path / "vocals.wav", config, tempo=96.0, key="G major")
+    assert (result.tempo, result.key, result.time_signature) == (96.0, "G major", 4)
+    assert result.beat_times == ()
+
+
+def test_analyze_places_beat_grid_at_known_tempo(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    def fail(*args: object, **kwargs: object) -> None:
+        pytest.fail("detector should not run")
+
+    sr = 22050
+    audio = np.zeros(sr * 8, dtype=np.float32)
+    # Clicks every half second from 0.25 s: 120 BPM off the file start.
+    for onset in np.arange(0.25, 8.0, 0.5):
+        audio[int(onset * sr) : int(onset * sr) + 200] = 1.0
+    monkeypatch.setattr(analyzer, "load_audio", lambda path: (audio, sr))
+    monkeypatch.setattr(analyzer, "track_beats", fail)
+    monkeypatch.setattr(analyzer, "estimate_tempo", fail)
+
+    result = analyzer.analyze(
+        tmp_path / "vocals.wav",
+        AnalysisConfig(detect_repeats=False),
+        tempo=120.0,
+        key="G major",
+        time_signature=4,
+    )
+
+    beats = np.asarray(result.beat_times)
+    assert result.tempo == 120.0
+    assert beats.size >= 14
+    assert np.allclose(np.diff(beats), 0.5, atol=0.02)
+    assert np.abs(beats - 0.25 - np.rint((beats - 0.25) / 0.5) * 0.5).max() < 0.03
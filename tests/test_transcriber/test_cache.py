@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from stemscore import transcriber
+from stemscore.config import TranscriptionConfig
+from stemscore.transcriber.cache import TranscriptionCache
+
+
+def test_cache_round_trips_mixed_note_fields(tmp_path: Path) -> None:
+    cache = TranscriptionCache(tmp_path / "cache")
+    notes = [
+        {"start": 0.5, "end": 1.0, "pitch": 60, "velocity": 90, "confidence": 0.8},
+        {"start": 1.0, "end": 1.1, "pitch": 62, "velocity": 70, "confidence": 0.6, "grace": True},
+        {"start": 2.0, "end": 3.0, "chord": "C:maj"},
+    ]
+
+    assert cache.get("abc") is None
+    cache.put("abc", notes)
+
+    assert cache.get("abc") == notes
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+
+
+def test_cache_key_ignores_execution_settings(tmp_path: Path) -> None:
+    stem = tmp_path / "vocal.wav"
+    stem.write_bytes(b"audio")
+    copy = tmp_path / "variant.wav"
+    copy.write_bytes(b"audio")
+    cache = TranscriptionCache(tmp_path / "cache")
+    base = TranscriptionConfig()
+
+    key = cache.key(stem, "lead_vocal", "basic_pitch", base)
+
+    parallel = base.model_copy(update={"pitch_workers": 4})
+    wider_gap = base.model_copy(update={"merge_gap_ms": 50})
+    assert cache.key(copy, "lead_vocal", "basic_pitch", parallel) == key
+    assert cache.key(stem, "lead_vocal", "basic_pitch", wider_gap) != key
+    assert cache.key(stem, "bass", "basic_pitch", base) != key
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = TranscriptionCache(tmp_path / "cache", max_bytes=10**9)
+    notes = [{"start": float(index), "pitch": 60} for index in range(50)]
+    for index, key in enumerate(["old", "used", "new"]):
+        cache.put(key, notes)
+        os.utime(cache.directory / f"{key}.npz", ns=(index * 10**9, index * 10**9))
+    cache.get("old")
+
+    cache.max_bytes = 2 * (cache.directory / "new.npz").stat().st_size
+    cache.put("newest", notes)
+
+    assert sorted(path.stem for path in cache.directory.glob("*.npz")) == ["newest", "old"]
+    assert cache.stats.evictions == 2
+
+
+def test_transcribe_part_reuses_cached_notes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stem = tmp_path / "drums.wav"
+    stem.write_bytes(b"audio")
+    calls: list[Path] = []
+
+    def fake_drums(path: Path, num_classes: int, skip_silence: bool) -> list[dict]:
+        calls.append(path)
+        return [{"start": 0.25, "pitch": 36, "velocity": 100}]
+
+    monkeypatch.setattr(transcriber, "transcribe_drums", fake_drums)
+    cache = TranscriptionCache(tmp_path / "cache")
+    config = TranscriptionConfig()
+
+    first = transcriber.transcribe_part(stem, "drums", config, cache=cache)
+    second = transcriber.transcribe_part(stem, "drums", config, cache=cache)
+
+    assert calls == [stem]
+    assert second == first
@@ -48,3 +48,116 @@ def test_recognize_chords_outputs_segments(tmp_path: Path, monkeypatch: pytest.M
     assert len(events) == 2
     assert events[0]["chord"] == "Cmaj"
     assert events[1]["chord"] == "Amin"
+
+
+def test_recognize_chords_beat_synchronous(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    audio_path = tmp_path / "harmony.wav"
+    audio_path.write_bytes(b"fake")
+
+    chroma = np.zeros((12, 8))
+    chroma[[0, 4, 7], :4] = 1.0
+    chroma[[9, 0, 4], 4:] = 1.0
+    # A passing tone that would flip a single frame to another chord.
+    chroma[[2, 5, 9], 2] = 1.5
+
+    _install_fake_librosa(monkeypatch, chroma)
+    monkeypatch.setattr(
+        sys.modules["librosa"],
+        "frames_to_time",
+        lambda frames, sr, hop_length=512: np.asarray(frames, dtype=float) * 0.5,
+    )
+    monkeypatch.setattr(
+        "stemscore.transcriber.chord_recognizer.load_audio",
+        lambda path: (np.zeros(10), 22050),
+    )
+
+    events = recognize_chords(audio_path, beat_times=[0.0, 2.0])
+
+    assert [event["chord"] for event in events] == ["Cmaj", "Amin"]
+    assert events[1]["start"] == 2.0
+    assert events[1]["end"] == 4.0
+
+
+def test_recognize_chords_viterbi_suppresses_flicker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    audio_path = tmp_path / "harmony.wav"
+    audio_path.write_bytes(b"fake")
+
+    chroma = np.zeros((12, 8))
+    chroma[[0, 4, 7], :4] = 1.0
+    chroma[[9, 0, 4], 4:] = 1.0
+    chroma[[2, 5, 9], 2] = 1.5
+
+    _install_fake_librosa(monkeypatch, chroma)
+    monkeypatch.setattr(
+        sys.modules["librosa"],
+        "frames_to_time",
+        lambda frames, sr, hop_length=512: np.asarray(frames, dtype=float) * 0.5,
+    )
+    monkeypatch.setattr(
+        "stemscore.transcriber.chord_recognizer.load_audio",
+        lambda path: (np.zeros(10), 22050),
+    )
+
+    framewise = recognize_chords(audio_path)
+    smoothed = recognize_chords(audio_path, decoder="viterbi", transition_penalty=0.5)
+
+    assert len(framewise) == 4
+    assert [event["chord"] for event in smoothed] == ["Cmaj", "Amin"]
+    assert smoothed[1]["start"] == 2.0
+
+
+def test_recognize_chords_skips_silent_stem(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    audio_path = tmp_path / "harmony.wav"
+    audio_path.write_bytes(b"fake")
+
+    _install_fake_librosa(monkeypatch, np.zeros((12, 3)))
+
+    def _fail(y: np.ndarray, sr: int) -> np.ndarray:
+        raise AssertionError("silent stems should not be analyzed")
+
+    monkeypatch.setattr(sys.modules["librosa.feature"], "chroma_cqt", _fail)
+    monkeypatch.setattr(
+        "stemscore.transcriber.chord_recognizer.load_audio",
+        lambda path: (np.zeros(22050, dtype=np.float32), 22050),
+    )
+
+    assert recognize_chords(audio_path, skip_silence=True) == []
+
+
+def test_recognize_chords_offsets_active_regions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from stemscore.utils.activity import detect_activity
+
+    audio_path = tmp_path / "harmony.wav"
+    audio_path.write_bytes(b"fake")
+    sr = 22050
+    audio = np.zeros(sr * 10, dtype=np.float32)
+    audio[sr * 6 : sr * 8] = 0.5
+    chroma = np.zeros((12, 3))
+    chroma[[0, 4, 7], :] = 1.0
+    lengths: list[int] = []
+
+    _install_fake_librosa(monkeypatch, chroma)
+
+    def chroma_cqt(y: np.ndarray, sr: int) -> np.ndarray:
+        lengths.append(y.shape[0])
+        return chroma
+
+    monkeypatch.setattr(sys.modules["librosa.feature"], "chroma_cqt", chroma_cqt)
+    monkeypatch.setattr(
+        "stemscore.transcriber.chord_recognizer.load_audio", lambda path: (audio, sr)
+    )
+
+    events = recognize_chords(audio_path, skip_silence=True)
+
+    ((start, end),) = detect_activity(audio, sr).sample_ranges(sr)
+    assert lengths == [end - start]
+    assert len(events) == 1
+    assert events[0]["chord"] == "Cmaj"
+    assert events[0]["start"] == pytest.approx(start / sr)
+    assert events[0]["end"] == pytest.approx(start / sr + 3.0)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+
+from stemscore.transcriber.drum_classifier import (
+    HOP_LENGTH,
+    classify_onsets,
+    gm_note_classes,
+    onset_features,
+)
+
+SR = 22050
+
+
+def _kick() -> np.ndarray:
+    t = np.arange(int(0.3 * SR)) / SR
+    return (np.sin(2 * np.pi * 55 * t) * np.exp(-t * 12)).astype(np.float32)
+
+
+def _closed_hat() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    noise = rng.standard_normal(int(0.3 * SR))
+    bright = np.diff(np.diff(noise, prepend=0.0), prepend=0.0)
+    t = np.arange(noise.size) / SR
+    return (0.3 * bright * np.exp(-t * 120)).astype(np.float32)
+
+
+def _hits_at(audio_events: list[np.ndarray], num_classes: int = 9) -> dict[int, set[int]]:
+    spacing = SR // 2
+    audio = np.zeros(spacing * len(audio_events) + SR, dtype=np.float32)
+    frames = []
+    for idx, event in enumerate(audio_events):
+        start = spacing * (idx + 1)
+        audio[start : start + event.size] += event
+        frames.append(start // HOP_LENGTH)
+    features = onset_features(audio, SR, np.array(frames))
+    onset_idx, notes = classify_onsets(features, num_classes)
+    hits: dict[int, set[int]] = {idx: set() for idx in range(len(audio_events))}
+    for idx, note in zip(onset_idx.tolist(), notes.tolist()):
+        hits[idx].add(note)
+    return hits
+
+
+def test_classify_kick_and_hat_separately() -> None:
+    hits = _hits_at([_kick(), _closed_hat()])
+
+    assert 36 in hits[0]
+    assert 42 in hits[1]
+    assert 36 not in hits[1]
+
+
+def test_classify_simultaneous_hits() -> None:
+    hits = _hits_at([_kick() + _closed_hat()])
+
+    assert {36, 42} <= hits[0]
+
+
+def test_gm_note_classes_kit_sizes() -> None:
+    assert gm_note_classes(9) == [36, 38, 42, 46, 41, 45, 49, 51, 57]
+    assert gm_note_classes(13)[9:] == [37, 44, 48, 53]
@@ -54,3 +54,80 @@ def test_transcribe_drums_maps_to_gm(tmp_path: Path, monkeypatch: pytest.MonkeyP
     assert len(events) == 2
     assert events[0]["pitch"] in {36, 38, 42}
     assert events[1]["pitch"] in {36, 38, 42}
+
+
+def test_transcribe_drums_skips_full_length_centroid(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    audio_path = tmp_path / "drums.wav"
+    audio_path.write_bytes(b"fake")
+
+    _install_fake_librosa(monkeypatch)
+
+    def _fail(y: np.ndarray, sr: int) -> np.ndarray:
+        raise AssertionError("centroid should only be computed at onset frames")
+
+    monkeypatch.setattr(sys.modules["librosa.feature"], "spectral_centroid", _fail)
+    sr = 22050
+    tone = 0.5 * np.sin(2 * np.pi * 4000 * np.arange(sr) / sr).astype(np.float32)
+    monkeypatch.setattr(
+        "stemscore.transcriber.drum_transcriber.load_audio",
+        lambda path: (tone, sr),
+    )
+
+    events = transcribe_drums(audio_path, num_classes=9)
+
+    assert [event["velocity"] for event in events] == [16, 127]
+    # A 4 kHz tone lands in the upper (cymbal) classes of the centroid map.
+    assert all(event["pitch"] == 51 for event in events)
+
+
+def test_transcribe_drums_skips_silent_stem(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    audio_path = tmp_path / "drums.wav"
+    audio_path.write_bytes(b"fake")
+
+    _install_fake_librosa(monkeypatch)
+
+    def _fail(y: np.ndarray, sr: int) -> np.ndarray:
+        raise AssertionError("silent stems should not be analyzed")
+
+    monkeypatch.setattr(sys.modules["librosa.onset"], "onset_strength", _fail)
+    monkeypatch.setattr(
+        "stemscore.transcriber.drum_transcriber.load_audio",
+        lambda path: (np.zeros(22050, dtype=np.float32), 22050),
+    )
+
+    assert transcribe_drums(audio_path, skip_silence=True) == []
+
+
+def test_transcribe_drums_offsets_active_regions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from stemscore.utils.activity import detect_activity
+
+    audio_path = tmp_path / "drums.wav"
+    audio_path.write_bytes(b"fake")
+    sr = 22050
+    audio = np.zeros(sr * 10, dtype=np.float32)
+    audio[sr * 6 : sr * 8] = 0.5
+    lengths: list[int] = []
+
+    _install_fake_librosa(monkeypatch)
+    fake_strength = sys.modules["librosa.onset"].onset_strength
+
+    def onset_strength(y: np.ndarray, sr: int) -> np.ndarray:
+        lengths.append(y.shape[0])
+        return fake_strength(y, sr)
+
+    monkeypatch.setattr(sys.modules["librosa.onset"], "onset_strength", onset_strength)
+    monkeypatch.setattr(
+        "stemscore.transcriber.drum_transcriber.load_audio", lambda path: (audio, sr)
+    )
+
+    events = transcribe_drums(audio_path, num_classes=3, skip_silence=True)
+
+    ((start, end),) = detect_activity(audio, sr).sample_ranges(sr)
+    assert lengths == [end - start]
+    assert [event["start"] for event in events] == pytest.approx([start / sr, start / sr + 0.5])
@@ -4,9 +4,16 @@ from pathlib import Path
 import sys
 from types import ModuleType
 
+import numpy as np
 import pytest
 
-from stemscore.transcriber.pitch_transcriber import transcribe_pitch
+from stemscore.transcriber import pitch_session
+from stemscore.transcriber.pitch_transcriber import transcribe_pitch, transcribe_pitch_batch
+
+
+@pytest.fixture(autouse=True)
+def _fresh_sessions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pitch_session, "_SESSIONS", {})
 
 
 def _install_fake_basic_pitch(monkeypatch: pytest.MonkeyPatch, result: object) -> None:
@@ -38,3 +45,313 @@ def test_transcribe_pitch_note_event_structure(tmp_path: Path, monkeypatch: pyte
     assert len(result) == 2
     for event in result:
         assert set(event.keys()) == {"start", "end", "pitch", "velocity", "confidence"}
+
+
+def test_transcribe_pitch_skips_silent_stem(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    audio_path = tmp_path / "silent.wav"
+    audio_path.write_bytes(b"fake")
+
+    def _fail(path: str) -> object:
+        raise AssertionError("Basic Pitch should not run on a silent stem")
+
+    _install_fake_basic_pitch(monkeypatch, None)
+    monkeypatch.setattr(sys.modules["basic_pitch.inference"], "predict", _fail)
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_transcriber.load_audio",
+        lambda path: (np.zeros(22050, dtype=np.float32), 22050),
+    )
+
+    assert transcribe_pitch(audio_path, skip_silence=True) == []
+
+
+def test_transcribe_pitch_offsets_active_regions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    audio_path = tmp_path / "vocal.wav"
+    audio_path.write_bytes(b"fake")
+    sr = 22050
+    audio = np.zeros(sr * 10, dtype=np.float32)
+    audio[sr * 6 : sr * 8] = 0.5
+
+    note_events = [{"start": 0.2, "end": 0.7, "pitch": 64}]
+    _install_fake_basic_pitch(monkeypatch, {"note_events": note_events})
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_transcriber.load_audio", lambda path: (audio, sr)
+    )
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_session.save_audio", lambda path, data, rate: None
+    )
+
+    result = transcribe_pitch(audio_path, skip_silence=True)
+
+    assert len(result) == 1
+    assert result[0]["start"] == pytest.approx(5.9 + 0.2, abs=0.05)
+
+
+def test_transcribe_pitch_skips_excluded_spans(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    audio_path = tmp_path / "vocal.wav"
+    audio_path.write_bytes(b"fake")
+    sr = 22050
+    lengths: list[int] = []
+
+    _install_fake_basic_pitch(monkeypatch, {"note_events": [{"start": 0.5, "end": 1.0, "pitch": 60}]})
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_transcriber.load_audio",
+        lambda path: (np.full(sr * 10, 0.5, dtype=np.float32), sr),
+    )
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_session.save_audio",
+        lambda path, data, rate: lengths.append(data.shape[0]),
+    )
+
+    result = transcribe_pitch(audio_path, exclude=[(4.0, 8.0)])
+
+    assert lengths == [sr * 4, sr * 2]
+    assert [note["start"] for note in result] == [0.5, 8.5]
+
+
+def _install_fake_basic_pitch_model(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    counts = {"loads": 0, "predict_calls": 0, "batch_rows": 0}
+    inference = ModuleType("basic_pitch.inference")
+    constants = ModuleType("basic_pitch.constants")
+    note_creation = ModuleType("basic_pitch.note_creation")
+
+    class Model:
+        def __init__(self, path: str) -> None:
+            counts["loads"] += 1
+
+        def predict(self, batch: np.ndarray) -> dict[str, np.ndarray]:
+            counts["predict_calls"] += 1
+            counts["batch_rows"] += batch.shape[0]
+            frames = np.zeros((batch.shape[0], 172, 88), dtype=np.float32)
+            return {"note": frames, "onset": frames}
+
+    def predict(path: str, model: object) -> object:
+        return {"note_events": [{"start": 0.0, "end": 0.5, "pitch": 60}]}
+
+    def model_output_to_notes(output: dict, **kwargs: object) -> tuple[None, list]:
+        return None, [(0.0, 0.5, 60, 0.5, None)]
+
+    inference.Model = Model
+    inference.predict = predict
+    constants.ANNOT_N_FRAMES = 172
+    constants.AUDIO_N_SAMPLES = 43844
+    constants.AUDIO_SAMPLE_RATE = 22050
+    constants.FFT_HOP = 256
+    note_creation.model_output_to_notes = model_output_to_notes
+
+    basic_pitch = ModuleType("basic_pitch")
+    basic_pitch.ICASSP_2022_MODEL_PATH = "model"
+    basic_pitch.inference = inference
+    for name, module in {
+        "basic_pitch": basic_pitch,
+        "basic_pitch.inference": inference,
+        "basic_pitch.constants": constants,
+        "basic_pitch.note_creation": note_creation,
+    }.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return counts
+
+
+def test_transcribe_pitch_reuses_model_session(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    counts = _install_fake_basic_pitch_model(monkeypatch)
+    for name in ("lead.wav", "bass.wav"):
+        (tmp_path / name).write_bytes(b"fake")
+        transcribe_pitch(tmp_path / name)
+
+    assert counts["loads"] == 1
+
+
+def test_transcribe_pitch_batch_single_inference_call(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    counts = _install_fake_basic_pitch_model(monkeypatch)
+    paths = [tmp_path / "lead.wav", tmp_path / "backing.wav", tmp_path / "bass.wav"]
+    for path in paths:
+        path.write_bytes(b"fake")
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_transcriber.load_audio",
+        lambda path: (np.full(22050 * 3, 0.1, dtype=np.float32), 22050),
+    )
+
+    result = transcribe_pitch_batch(paths)
+
+    assert counts["predict_calls"] == 1
+    assert counts["batch_rows"] == 6
+    assert set(result.notes) == set(paths)
+    assert result.notes[paths[0]][0]["velocity"] == 64
+    assert result.model_load_seconds >= 0.0
+
+
+def test_iter_pitch_notes_stitches_seam(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from stemscore.utils.audio_io import AudioWindow
+
+    audio_path = tmp_path / "long.wav"
+    audio_path.write_bytes(b"fake")
+    sr = 100
+    windows = [
+        AudioWindow(offset=0.0, audio=np.full(1000, 0.5, dtype=np.float32), sr=sr, is_last=False),
+        AudioWindow(offset=8.0, audio=np.full(1000, 0.5, dtype=np.float32), sr=sr, is_last=True),
+    ]
+    # Window-relative events: a held note cut at the first window's end and
+    # its continuation at the start of the second window.
+    window_events = iter(
+        [
+            [(1.0, 1.5, 60, 0.8, None), (7.0, 10.0, 67, 0.8, None)],
+            [(0.0, 3.0, 67, 0.8, None), (1.5, 2.0, 72, 0.8, None)],
+        ]
+    )
+
+    class FakeSession:
+        def predict_audio_batch(self, audios: list, rate: int) -> list:
+            return [next(window_events)]
+
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_transcriber.iter_audio_windows",
+        lambda path, window, hop: iter(windows),
+    )
+    monkeypatch.setattr(
+        "stemscore.transcriber.pitch_transcriber.get_session",
+        lambda backend, threads: FakeSession(),
+    )
+
+    from stemscore.transcriber.pitch_transcriber import iter_pitch_notes
+
+    notes = list(iter_pitch_notes(audio_path, window_seconds=10.0, overlap_seconds=2.0))
+
+    assert [note["pitch"] for note in notes] == [60, 67, 72]
+    assert notes[1]["start"] == pytest.approx(7.0)
+    assert notes[1]["end"] == pytest.approx(11.0)
+    assert notes[2]["start"] == pytest.approx(9.5)
+
+
+def test_get_session_onnx_backend_sets_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    created: dict[str, object] = {}
+    ort = ModuleType("onnxruntime")
+
+    class SessionOptions:
+        intra_op_num_threads = 0
+        inter_op_num_threads = 0
+
+    class FakeOutput:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+    class InferenceSession:
+        def __init__(self, path: str, sess_options: object, providers: list[str]) -> None:
+            created["path"] = path
+            created["options"] = sess_options
+
+        def get_inputs(self) -> list[FakeOutput]:
+            return [FakeOutput("input")]
+
+        def get_outputs(self) -> list[FakeOutput]:
+            return [FakeOutput(f"StatefulPartitionedCall:{idx}") for idx in range(3)]
+
+        def run(self, names: list[str], feeds: dict) -> list[np.ndarray]:
+            return [np.full(1, idx) for idx, _ in enumerate(names)]
+
+    ort.SessionOptions = SessionOptions
+    ort.InferenceSession = InferenceSession
+    ort.ExecutionMode = type("ExecutionMode", (), {"ORT_SEQUENTIAL": 0})
+    ort.GraphOptimizationLevel = type("GraphOptimizationLevel", (), {"ORT_ENABLE_ALL": 99})
+    basic_pitch = ModuleType("basic_pitch")
+    basic_pitch.ICASSP_2022_MODEL_PATH = "/models/icassp_2022/nmp"
+    monkeypatch.setitem(sys.modules, "onnxruntime", ort)
+    monkeypatch.setitem(sys.modules, "basic_pitch", basic_pitch)
+
+    session = pitch_session.get_session("onnx", threads=4)
+
+    assert isinstance(session.model, pitch_session.OnnxPitchModel)
+    assert created["path"] == str(Path("/models/icassp_2022/nmp.onnx"))
+    assert created["options"].intra_op_num_threads == 4
+    outputs = session.model.predict(np.zeros((1, 10, 1)))
+    assert set(outputs) == {"note", "onset", "contour"}
+    assert pitch_session.get_session("onnx", threads=4) is session
+
+
+def test_transcribe_pitch_parallel_segments(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from stemscore.transcriber import pitch_transcriber
+
+    audio_path = tmp_path / "vocal.wav"
+    audio_path.write_bytes(b"fake")
+    sr = 22050
+    events = [{"start": 0.5, "end": 1.0, "pitch": 60}, {"start": 1.5, "end": 2.0, "pitch": 62}]
+
+    _install_fake_basic_pitch(monkeypatch, {"note_events": events})
+    monkeypatch.setattr(
+        pitch_transcriber,
+        "load_audio",
+        lambda path: (np.full(sr * 35, 0.5, dtype=np.float32), sr),
+    )
+    monkeypatch.setattr(pitch_session, "save_audio", lambda path, data, rate: None)
+    monkeypatch.setattr(
+        pitch_transcriber,
+        "_segment_executor",
+        lambda workers, backend, threads: ThreadPoolExecutor(workers),
+    )
+
+    result = transcribe_pitch(audio_path, workers=2, segment_seconds=10.0)
+
+    # Each segment repeats the fake events; ones inside a neighbour's overlap are dropped.
+    assert [note["pitch"] for note in result] == [60, 62, 62, 62]
+    assert result[0]["start"] == pytest.approx(0.5)
+    assert result[2]["start"] == pytest.approx(10.5, abs=0.1)
+
+
+def test_segment_executor_is_reused_across_stems() -> None:
+    from stemscore.transcriber import pitch_transcriber
+
+    first = pitch_transcriber._segment_executor(2, "onnx", 1)
+    try:
+        assert pitch_transcriber._segment_executor(2, "onnx", 1) is first
+        assert pitch_transcriber._segment_executor(3, "onnx", 1) is not first
+    finally:
+        pitch_transcriber.shutdown_segment_pools()
+    assert pitch_transcriber._segment_executor(2, "onnx", 1) is not first
+    pitch_transcriber.shutdown_segment_pools()
+
+
+def test_predict_audio_batch_keeps_notes_in_final_second(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from stemscore.transcriber.pitch_session import PitchModelSession
+
+    _install_fake_basic_pitch_model(monkeypatch)
+    sr = 22050
+    frame_seconds = 43844 / 172 / sr
+
+    class EnergyModel:
+        def predict(self, batch: np.ndarray) -> dict[str, np.ndarray]:
+            # One activation per model frame: the mean level of its samples.
+            frames = np.stack(
+                [np.abs(chunk).mean(axis=1) for chunk in np.array_split(batch[:, :, 0], 172, 1)],
+                axis=1,
+            )
+            return {"note": frames[:, :, None], "onset": frames[:, :, None]}
+
+    def model_output_to_notes(output: dict, **kwargs: object) -> tuple[None, list]:
+        active = np.flatnonzero(output["note"][:, 0] > 0.1)
+        if not active.size:
+            return None, []
+        start, end = active[0] * frame_seconds, (active[-1] + 1) * frame_seconds
+        return None, [(start, end, 60, 0.5, None)]
+
+    monkeypatch.setattr(
+        sys.modules["basic_pitch.note_creation"], "model_output_to_notes", model_output_to_notes
+    )
+    audio = np.zeros(sr * 180, dtype=np.float32)
+    audio[-sr // 2 :] = 0.5
+
+    (events,) = PitchModelSession(model=EnergyModel()).predict_audio_batch([audio], sr)
+
+    assert len(events) == 1
+    assert 179.0 < events[0][0] < 180.0
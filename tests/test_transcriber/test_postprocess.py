@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+from stemscore.transcriber.postprocess import postprocess_notes
+
+
+def _note(start: float, end: float, pitch: int, confidence: float = 0.8) -> dict:
+    return {
+        "start": start,
+        "end": end,
+        "pitch": pitch,
+        "velocity": round(confidence * 127),
+        "confidence": confidence,
+    }
+
+
+def test_postprocess_merges_fragments_and_drops_ghosts() -> None:
+    notes = [
+        _note(0.0, 0.40, 60),
+        _note(0.42, 0.80, 60),  # split continuation
+        _note(0.50, 0.60, 60, confidence=0.9),  # re-onset inside the held note
+        _note(0.30, 0.50, 67, confidence=0.05),  # ghost
+        _note(1.00, 1.02, 64),  # too short
+        _note(1.20, 1.60, 60),  # separate repeated note
+    ]
+
+    processed = postprocess_notes(notes, merge_gap_ms=30, min_note_ms=60, min_confidence=0.1)
+
+    assert [(note["start"], note["end"], note["pitch"]) for note in processed] == [
+        (0.0, 0.8, 60),
+        (1.2, 1.6, 60),
+    ]
+    assert processed[0]["confidence"] == pytest.approx(0.9)
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        (
+            "individual_notes",
+            [(0.0, 0.08, 62, False), (0.08, 0.16, 64, False), (0.16, 0.8, 65, False)],
+        ),
+        (
+            "grace_note",
+            [(0.0, 0.08, 62, True), (0.08, 0.16, 64, True), (0.16, 0.8, 65, False)],
+        ),
+        ("merge", [(0.0, 0.8, 65, False)]),
+    ],
+)
+def test_postprocess_melisma_modes(mode: str, expected: list[tuple]) -> None:
+    notes = [_note(0.0, 0.08, 62), _note(0.08, 0.16, 64), _note(0.16, 0.8, 65)]
+
+    processed = postprocess_notes(notes, melisma_mode=mode, melisma_max_ms=120)
+
+    assert [
+        (note["start"], note["end"], note["pitch"], note.get("grace", False))
+        for note in processed
+    ] == expected
+
+
+def test_postprocess_keeps_fast_runs_as_notes_at_tempo() -> None:
+    # Sixteenths at 140 BPM last about 107 ms, under the absolute cutoff.
+    sixteenth = 60.0 / 140 / 4
+    notes = [_note(0.0, 0.05, 59)]  # a real grace note leading into the run
+    notes += [
+        _note(0.05 + index * sixteenth, 0.05 + (index + 1) * sixteenth, 60 + index)
+        for index in range(4)
+    ]
+
+    processed = postprocess_notes(
+        notes, melisma_mode="grace_note", melisma_max_ms=120, melisma_max_beats=0.2, tempo=140
+    )
+    without_tempo = postprocess_notes(notes, melisma_mode="grace_note", melisma_max_ms=120)
+
+    assert [note.get("grace", False) for note in processed] == [True, False, False, False, False]
+    assert [note.get("grace", False) for note in without_tempo] == [True, True, True, True, False]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+
+from stemscore.transcriber.segments import StemSegment, plan_segments, stitch_segment_notes
+
+
+def test_plan_segments_cuts_at_quiet_point() -> None:
+    sr = 1000
+    audio = np.full(150 * sr, 0.5, dtype=np.float32)
+    audio[62 * sr : 63 * sr] = 0.0
+
+    segments = plan_segments(audio, sr, segment_seconds=60.0, overlap_seconds=2.0)
+
+    assert len(segments) == 2
+    first, second = segments
+    assert 62 * sr <= first.own_end <= 63 * sr
+    assert second.own_start == first.own_end
+    assert first.end - second.start == 2 * sr
+    assert (first.start, second.end) == (0, 150 * sr)
+
+
+def test_stitch_segment_notes_merges_seam_notes() -> None:
+    sr = 1000
+    segments = [
+        StemSegment(start=0, end=11 * sr, own_start=0, own_end=10 * sr),
+        StemSegment(start=9 * sr, end=20 * sr, own_start=10 * sr, own_end=20 * sr),
+    ]
+    held = {"pitch": 60, "velocity": 90, "confidence": 0.8}
+    first = [
+        {"start": 8.0, "end": 11.0, **held},
+        {"start": 10.5, "end": 10.9, "pitch": 64, "velocity": 80, "confidence": 0.7},
+    ]
+    second = [
+        {"start": 9.0, "end": 12.0, **held},
+        {"start": 10.5, "end": 11.0, "pitch": 64, "velocity": 80, "confidence": 0.7},
+    ]
+
+    notes = stitch_segment_notes([first, second], segments, sr)
+
+    assert [(note["start"], note["end"], note["pitch"]) for note in notes] == [
+        (8.0, 12.0, 60),
+        (10.5, 11.0, 64),
+    ]
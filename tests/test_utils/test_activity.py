@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from stemscore.utils.activity import detect_activity
+
+
+def test_detect_activity_finds_regions() -> None:
+    sr = 22050
+    audio = np.zeros(sr * 6, dtype=np.float32)
+    audio[sr : sr * 2] = 0.5
+    audio[sr * 4 : sr * 5] = 0.5
+
+    profile = detect_activity(audio, sr, padding=0.0)
+
+    assert len(profile.regions) == 2
+    assert profile.regions[0][0] == pytest.approx(1.0, abs=0.05)
+    assert profile.regions[0][1] == pytest.approx(2.0, abs=0.05)
+    assert profile.regions[1][0] == pytest.approx(4.0, abs=0.05)
+    assert profile.active_ratio == pytest.approx(1 / 3, abs=0.02)
+
+
+def test_detect_activity_bridges_short_gaps() -> None:
+    sr = 22050
+    audio = np.full(sr * 3, 0.5, dtype=np.float32)
+    audio[sr : sr + sr // 10] = 0.0
+
+    profile = detect_activity(audio, sr, min_silence=0.5)
+
+    assert len(profile.regions) == 1
+
+
+def test_detect_activity_silent_stem() -> None:
+    profile = detect_activity(np.zeros(22050, dtype=np.float32), 22050)
+
+    assert profile.is_silent
+    assert profile.active_ratio == 0.0
@@ -71,3 +71,57 @@ def test_save_audio_error(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> No
 
     with pytest.raises(AudioLoadError):
         save_audio(tmp_path / "out.wav", np.zeros(10, dtype=np.float32), 22050)
+
+
+def test_iter_audio_windows_overlaps(tmp_path: Path) -> None:
+    import soundfile as sf
+
+    from stemscore.utils.audio_io import iter_audio_windows
+
+    sr = 1000
+    path = tmp_path / "long.wav"
+    sf.write(path, np.linspace(-0.5, 0.5, sr * 5 + 200, dtype=np.float32), sr)
+
+    windows = list(iter_audio_windows(path, window_seconds=2.0, hop_seconds=1.5))
+
+    assert [window.offset for window in windows] == [0.0, 1.5, 3.0, 4.5]
+    assert windows[0].audio.shape == (2000,)
+    assert windows[-1].is_last
+    assert windows[-1].audio.shape == (700,)
+
+
+def test_iter_audio_windows_streams_archive_member(tmp_path: Path) -> None:
+    import zipfile
+
+    import soundfile as sf
+
+    from stemscore.utils.audio_io import ArchiveMember, iter_audio_windows
+
+    sr = 1000
+    path = tmp_path / "long.wav"
+    sf.write(path, np.linspace(-0.5, 0.5, sr * 5 + 200, dtype=np.float32), sr)
+    archive = tmp_path / "export.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as handle:
+        handle.write(path, "song/stems/long.wav")
+
+    member = ArchiveMember(archive=archive, member="song/stems/long.wav")
+    from_archive = list(iter_audio_windows(member, window_seconds=2.0, hop_seconds=1.5))
+    from_file = list(iter_audio_windows(path, window_seconds=2.0, hop_seconds=1.5))
+
+    assert member.exists() and member.stem == "long"
+    assert [window.offset for window in from_archive] == [0.0, 1.5, 3.0, 4.5]
+    for archived, extracted in zip(from_archive, from_file):
+        assert np.array_equal(archived.audio, extracted.audio)
+
+
+def test_audio_duration_reads_header(tmp_path: Path) -> None:
+    import soundfile as sf
+
+    from stemscore.utils.audio_io import audio_duration
+
+    path = tmp_path / "tone.wav"
+    sf.write(path, np.zeros(2500, dtype=np.float32), 1000)
+
+    assert audio_duration(path) == pytest.approx(2.5)
+    with pytest.raises(AudioLoadError):
+        audio_duration(tmp_path / "missing.wav")
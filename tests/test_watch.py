@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from stemscore import watch
+
+
+def _fake_pipeline(calls: list[Path]):
+    def run_pipeline(input_path: Path, output_dir: Path, **kwargs) -> dict:
+        calls.append(input_path)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "score.mid").write_bytes(b"MThd")
+        return {
+            "route": "route_b",
+            "tempo": 120.0,
+            "key": "C major",
+            "time_signature": 4,
+            "output_files": {"midi": output_dir / "score.mid"},
+        }
+
+    return run_pipeline
+
+
+def test_watch_once_processes_and_skips_finished(monkeypatch, tmp_path: Path) -> None:
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    sf.write(inbox / "song.wav", np.zeros(2205, dtype=np.float32), 22050)
+    (inbox / "notes.txt").write_text("not audio", encoding="utf-8")
+    calls: list[Path] = []
+    monkeypatch.setattr(watch.pipeline, "run_pipeline", _fake_pipeline(calls))
+    output_root = tmp_path / "out"
+
+    ledger = watch.watch(
+        inbox, output_root, ["bass"], "pop", ["midi"], settle_seconds=0, once=True
+    )
+
+    assert ledger.status("song.wav") == watch.STATUS_DONE
+    assert ledger.status("notes.txt") == watch.STATUS_REJECTED
+    assert (output_root / "song.wav" / "score.mid").exists()
+    assert not list(output_root.glob(".*.partial"))
+
+    reloaded = watch.watch(
+        inbox, output_root, ["bass"], "pop", ["midi"], settle_seconds=0, once=True
+    )
+    assert reloaded.status("song.wav") == watch.STATUS_DONE
+    assert calls == [inbox / "song.wav"]
+
+
+def test_scan_inputs_waits_for_settle_or_marker(tmp_path: Path) -> None:
+    (tmp_path / "a.wav").write_bytes(b"RIFF")
+    (tmp_path / "b.wav").write_bytes(b"RIFF")
+    (tmp_path / "b.wav.ready").touch()
+
+    items = watch.scan_inputs(tmp_path, settle_seconds=3600)
+
+    assert [item.path.name for item in items] == ["b.wav"]
+
+
+def test_watch_records_failures(monkeypatch, tmp_path: Path) -> None:
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    sf.write(inbox / "song.wav", np.zeros(2205, dtype=np.float32), 22050)
+
+    def failing(input_path: Path, output_dir: Path, **kwargs) -> dict:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        raise RuntimeError("separator crashed")
+
+    monkeypatch.setattr(watch.pipeline, "run_pipeline", failing)
+    output_root = tmp_path / "out"
+
+    ledger = watch.watch(
+        inbox, output_root, ["bass"], "pop", ["midi"], settle_seconds=0, once=True
+    )
+
+    assert ledger.status("song.wav") == watch.STATUS_FAILED
+    assert not (output_root / "song.wav").exists()
+    assert not list(output_root.glob(".*.partial"))